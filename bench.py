@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Pipeline overhead benchmarks against the offline fake server.
+
+Each case runs real pipeline code against `pipelines.fake_server`, started in
+a subprocess so its CPU time is not counted. Per case it records:
+- wall time (median over `--repeat`);
+- requests per route, as counted by the server;
+- client CPU seconds, i.e. the repo's Python overhead: prompt building,
+  parsing, threads, bookkeeping;
+- CPU milliseconds per request.
+
+`--save NAME` stores the results as a baseline in `runs/bench/NAME.json`.
+`--compare NAME` prints each case's change against that baseline.
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import fnmatch
+import json
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable
+from urllib.request import Request, urlopen
+
+from openai import OpenAI
+
+import main
+from odyssey_eval.corpus import load_pool
+from odyssey_eval.pipeline import run_passage
+from odyssey_eval.profiles import PROFILES
+import translation_feedback_mechanisms
+from translation_feedback_mechanisms import compute_smoothness_feedback_from_perplexity
+
+BENCH_DIR = Path("runs/bench")
+PIPELINES = ("sequential", "debate", "cognitive_user", "cognitive_dualloop")
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[OpenAI, str], None]
+    settings: dict[str, Any] = field(default_factory=dict)
+
+
+def pipeline_case(
+    pipeline: str,
+    paragraphs: int,
+    iterations: int,
+    *,
+    workers: int = 1,
+    feedback_model: str | None = None,
+    feedback_mode: str = "blocking",
+) -> Case:
+    def run(client: OpenAI, base_url: str) -> None:
+        main.run_pipeline(
+            client=client,
+            model=main.DEFAULT_MODEL,
+            greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:paragraphs],
+            iterations=iterations,
+            verbose=False,
+            color_mode="never",
+            user_preference=main.DEFAULT_USER_PREFERENCE,
+            sequential_feedback_model=feedback_model,
+            pipeline=pipeline,
+            paragraph_workers=workers,
+            call_json_fn=main.call_json,
+            compute_feedback_fn=compute_smoothness_feedback_from_perplexity,
+            feedback_mode=feedback_mode,
+        )
+
+    name = f"{pipeline}/w{workers}" + ("/ppl" if feedback_model else "")
+    if feedback_mode != "blocking":
+        name += f"-{feedback_mode}"
+    settings = {"paragraphs": paragraphs, "iterations": iterations, "paragraph_workers": workers}
+    if feedback_model:
+        settings["feedback_model"] = feedback_model
+        settings["feedback_mode"] = feedback_mode
+    return Case(name, run, settings)
+
+
+def odyssey_case(pool: list[dict[str, Any]], iterations: int, *, workers: int) -> Case:
+    profile = PROFILES["butler"]["values_profile"]
+
+    def run(client: OpenAI, base_url: str) -> None:
+        with ThreadPoolExecutor(max_workers=workers) as pool_executor:
+            list(
+                pool_executor.map(
+                    lambda passage: run_passage(
+                        client=client, greek=passage["greek"], values_profile=profile, iterations=iterations
+                    ),
+                    pool,
+                )
+            )
+
+    return Case(f"odyssey/w{workers}", run, {"passages": len(pool), "iterations": iterations, "workers": workers})
+
+
+def perplexity_case(texts: int, *, model: str, workers: int) -> Case:
+    samples = [f"{text} ({number})" for number, text in enumerate(main.DEFAULT_PERRIN_PARAGRAPHS * texts)][:texts]
+
+    def run(client: OpenAI, base_url: str) -> None:
+        with ThreadPoolExecutor(max_workers=workers) as pool_executor:
+            results = list(
+                pool_executor.map(
+                    lambda text: compute_smoothness_feedback_from_perplexity(client=client, model=model, text=text),
+                    samples,
+                )
+            )
+        failed = [result["reason"] for result in results if not result.get("available")]
+        if failed:
+            raise RuntimeError(f"perplexity unavailable: {failed[0]}")
+
+    kind = "llamacpp" if model == "local_model" else "echo"
+    return Case(f"perplexity-{kind}/w{workers}", run, {"texts": texts, "model": model, "workers": workers})
+
+
+def build_cases(quick: bool) -> list[Case]:
+    paragraphs = 2 if quick else 3
+    cases: list[Case] = []
+    for pipeline in PIPELINES:
+        iterations = 1 if quick else main.default_iterations(pipeline)
+        cases.append(pipeline_case(pipeline, paragraphs, iterations))
+        cases.append(pipeline_case(pipeline, paragraphs, iterations, workers=paragraphs))
+    cases.append(pipeline_case("sequential", paragraphs, 1 if quick else 3, feedback_model="local_model"))
+    cases.append(
+        pipeline_case("sequential", paragraphs, 1 if quick else 3, feedback_model="local_model", feedback_mode="async")
+    )
+    passages = load_pool()[:4]
+    for workers in (1, 4):
+        cases.append(odyssey_case(passages, 1 if quick else 2, workers=workers))
+    for workers in (1, 4):
+        cases.append(perplexity_case(8, model="local_model", workers=workers))
+    cases.append(perplexity_case(8, model="some/echo-model", workers=4))
+    return cases
+
+
+def _http_json(url: str, method: str = "GET") -> dict[str, Any]:
+    request = Request(
+        url,
+        data=b"{}" if method == "POST" else None,
+        method=method,
+        headers={"Content-Type": "application/json"},
+    )
+    with urlopen(request, timeout=10) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def start_fake_server(server_args: list[str]) -> tuple[subprocess.Popen[str], str]:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "pipelines.fake_server", "--port", "0", *server_args],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout is not None
+    line = process.stdout.readline()
+    if not line.startswith("Fake server on "):
+        process.kill()
+        raise RuntimeError(f"fake server did not start: {line!r}")
+    return process, line.split()[3]
+
+
+def run_case(case: Case, url: str, repeat: int) -> dict[str, Any]:
+    client = OpenAI(api_key="fake", base_url=f"{url}/v1", max_retries=0)
+    walls: list[float] = []
+    cpus: list[float] = []
+    requests: dict[str, int] = {}
+    errors = 0
+    for _ in range(repeat):
+        _http_json(f"{url}/fake/reset", "POST")
+        # Otherwise only the first llama.cpp case would pay for model discovery.
+        translation_feedback_mechanisms._LLAMACPP_INFO_CACHE.clear()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        case.run(client, f"{url}/v1")
+        cpus.append(time.process_time() - cpu)
+        walls.append(time.perf_counter() - wall)
+        stats = _http_json(f"{url}/fake/stats")
+        requests, errors = stats["requests"], stats["errors"]
+    calls = sum(requests.values())
+    cpu_seconds = statistics.median(cpus)
+    return {
+        "settings": case.settings,
+        "wall_seconds": round(statistics.median(walls), 3),
+        "cpu_seconds": round(cpu_seconds, 3),
+        "requests": calls,
+        "routes": requests,
+        "errors": errors,
+        "cpu_ms_per_request": round(cpu_seconds * 1000 / calls, 3) if calls else None,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _change(new: float | None, old: float | None) -> str:
+    if not new or not old:
+        return ""
+    return f"{(new - old) / old * 100:+.0f}%"
+
+
+def render_results(results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]] | None) -> str:
+    columns = ["case", "wall s", "requests", "cpu s", "cpu ms/req", "errors"]
+    if baseline is not None:
+        columns += ["wall vs base", "cpu vs base", "requests base"]
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    for name, row in results.items():
+        cells = [name, row["wall_seconds"], row["requests"], row["cpu_seconds"], row["cpu_ms_per_request"], row["errors"]]
+        if baseline is not None:
+            old = baseline.get(name)
+            cells += (
+                [
+                    _change(row["wall_seconds"], old["wall_seconds"]),
+                    _change(row["cpu_seconds"], old["cpu_seconds"]),
+                    old["requests"],
+                ]
+                if old
+                else ["new", "", ""]
+            )
+        lines.append("| " + " | ".join("" if value is None else str(value) for value in cells) + " |")
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline overhead against the offline fake server.")
+    parser.add_argument("--cases", default="*", help="Comma-separated glob patterns of case names (default all).")
+    parser.add_argument("--list", action="store_true", help="List case names and exit.")
+    parser.add_argument("--quick", action="store_true", help="Fewer paragraphs and iterations.")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the median is reported.")
+    parser.add_argument("--chat-ms", default="300:100:lognormal", help="Fake chat latency MEAN[:JITTER[:DIST]] in ms.")
+    parser.add_argument("--llamacpp-ms", default="5:2", help="Fake latency of each llama.cpp request.")
+    parser.add_argument("--completions-ms", default="150:50", help="Fake echo-logprob latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of fake requests that fail.")
+    parser.add_argument("--save", default="", help="Save results as baseline runs/bench/NAME.json.")
+    parser.add_argument("--compare", default="", help="Compare with baseline runs/bench/NAME.json.")
+    return parser.parse_args()
+
+
+def run_cli() -> int:
+    args = parse_args()
+    patterns = [pattern.strip() for pattern in args.cases.split(",") if pattern.strip()]
+    cases = [case for case in build_cases(args.quick) if any(fnmatch.fnmatch(case.name, p) for p in patterns)]
+    if args.list:
+        print("\n".join(case.name for case in cases))
+        return 0
+    if not cases:
+        print(f"No cases match {args.cases!r}; see --list.", file=sys.stderr)
+        return 2
+    baseline = None
+    if args.compare:
+        baseline_path = BENCH_DIR / f"{args.compare}.json"
+        if not baseline_path.exists():
+            print(f"No baseline at {baseline_path}", file=sys.stderr)
+            return 2
+        saved = json.loads(baseline_path.read_text(encoding="utf-8"))
+        baseline = saved["results"]
+
+    server_args = [
+        "--chat-ms", args.chat_ms,
+        "--llamacpp-ms", args.llamacpp_ms,
+        "--completions-ms", args.completions_ms,
+        "--error-rate", str(args.error_rate),
+    ]
+    if args.compare and (saved.get("server") != server_args or saved.get("quick") != args.quick):
+        print(
+            f"Warning: baseline {args.compare} used different settings "
+            f"(quick={saved.get('quick')}, server {' '.join(saved.get('server', []))}).",
+            file=sys.stderr,
+        )
+    process, url = start_fake_server(server_args)
+    # The llama.cpp scorer reads its server from the environment.
+    os.environ["LLAMACPP_BASE_URL"] = url
+    results: dict[str, dict[str, Any]] = {}
+    try:
+        # Load the client's lazily imported modules before anything is timed.
+        main.call_json(OpenAI(api_key="fake", base_url=f"{url}/v1", max_retries=0), main.DEFAULT_MODEL, "warm-up", "{}")
+        for case in cases:
+            print(f"[bench] {case.name} ...", file=sys.stderr, flush=True)
+            results[case.name] = run_case(case, url, max(1, args.repeat))
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(render_results(results, baseline))
+    if args.save:
+        BENCH_DIR.mkdir(parents=True, exist_ok=True)
+        path = BENCH_DIR / f"{args.save}.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "created_at_utc": datetime.now(timezone.utc).isoformat(),
+                    "commit": _git_commit(),
+                    "python": sys.version.split()[0],
+                    "quick": args.quick,
+                    "repeat": args.repeat,
+                    "server": server_args,
+                    "results": results,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        print(f"Saved baseline {path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_cli())
@@ -2,27 +2,52 @@
 from __future__ import annotations
 
 import argparse
+from dataclasses import asdict
 import json
 import os
 import re
+import sqlite3
 import sys
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Sequence
 
 from openai import OpenAI
+from pipelines.artifacts import StageArtifacts
+from pipelines.catalog import record_run
+from pipelines.checkpoint import CheckpointStore
+from pipelines.chunking import chunk_greek, run_chunked, stitch_translations
 from pipelines.cognitive_dualloop import run_dualloop_cognitive_pipeline
 from pipelines.cognitive_user import run_user_cognitive_pipeline
-from pipelines.debate import run_debate_pipeline
-from pipelines.sequential import run_sequential_pipeline
+from pipelines.convergence import ConvergencePolicy
+from pipelines.debate import TOPOLOGIES, run_debate_pipeline
+from pipelines.common import reference_translations_for_index
+from pipelines.debate_state import DEFAULT_SECTION_BUDGET
+from pipelines.events import Event, EventBus, publish
+from pipelines.feedback import (
+    DEFAULT_FEEDBACK_BUDGET,
+    FEEDBACK_MECHANISMS,
+    FeedbackOrchestrator,
+    parse_feedback_names,
+    parse_feedback_timeouts,
+)
+from pipelines.memo import ParagraphMemo
+from pipelines.report_stream import ReportSink
+from pipelines.results import ResultSpill, as_dict
+from pipelines.sequential import FEEDBACK_MODES, run_sequential_pipeline
+from pipelines.sources import ParagraphFile, ReplacedParagraph
+from pipelines.tracing import Tracer, span
 from translation_feedback_mechanisms import compute_smoothness_feedback_from_perplexity
 
 DEFAULT_MODEL = "x-ai/grok-4.1-fast"
 DEFAULT_ITERATIONS = 2
 DEFAULT_SEQUENTIAL_ITERATIONS = 3
 DEFAULT_PIPELINE = "debate"
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+# Overridable so a run can target `python -m pipelines.fake_server` instead.
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 DEFAULT_USER_PREFERENCE = "No additional user preference provided."
+# Their loops only produce text, so only the edit-distance criterion applies.
+UNSCORED_PIPELINES = ("cognitive_user", "cognitive_dualloop")
 GOALS_GUIDANCE = (
     "- faithfulness: how strictly similar to the source language is it?\n"
     "- readability: how well does it flow, does it minimize convoluted sentences, "
@@ -119,6 +144,12 @@ AGENT_COLORS = {
     "faithful": "\033[91m",
     "readable": "\033[92m",
     "modern": "\033[96m",
+    "imagery": "\033[33m",
+    "argument": "\033[31m",
+    "concise": "\033[32m",
+    "audience": "\033[36m",
+    "cadence": "\033[35m",
+    "critic": "\033[97m",
 }
 STAGE_COLORS = {
     "reference": "\033[93m",
@@ -203,22 +234,24 @@ def call_json(
     last_error: Exception | None = None
     for attempt in range(1, retries + 1):
         try:
-            resp = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=temperature,
-                timeout=120,
-                extra_body={"reasoning": {"enabled": True}},
-            )
+            with span("chat completion", "http", model=model, attempt=attempt):
+                resp = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    temperature=temperature,
+                    timeout=120,
+                    extra_body={"reasoning": {"enabled": True}},
+                )
             content = resp.choices[0].message.content or ""
             return parse_json_object(content)
         except Exception as exc:  # noqa: BLE001
             last_error = exc
             if attempt < retries:
-                time.sleep(1.5 * attempt)
+                with span("retry sleep", "retry", attempt=attempt):
+                    time.sleep(1.5 * attempt)
             else:
                 break
     assert last_error is not None
@@ -228,116 +261,463 @@ def call_json(
 def run_pipeline(
     client: OpenAI,
     model: str,
-    greek_paragraphs: list[str],
+    greek_paragraphs: Sequence[str],
     iterations: int,
     verbose: bool,
     color_mode: str,
     user_preference: str,
     sequential_feedback_model: str | None,
     pipeline: str,
+    paragraph_workers: int = 1,
+    call_json_fn: Callable[..., dict[str, Any]] = call_json,
+    compute_feedback_fn: Callable[..., dict[str, Any]] = compute_smoothness_feedback_from_perplexity,
+    convergence: ConvergencePolicy | None = None,
+    candidates: int = 1,
+    judge_top_k: int = 1,
+    selection: str = "prompt",
+    quorum_size: int = 3,
+    topology: str = "all_to_all",
+    critique_peers: int = 2,
+    debate_state: str = "full",
+    state_budget: int = DEFAULT_SECTION_BUDGET,
+    debate_schedule: str = "rounds",
+    paragraph_numbers: list[int] | None = None,
+    paragraph_memo: ParagraphMemo | None = None,
+    phrase_mode: str = "single",
+    analysis_mode: str = "fresh",
+    draft_mode: str = "single",
+    chunk_chars: int = 0,
+    chunk_overlap: int = 1,
+    dryden_paragraphs: Sequence[str] = DEFAULT_DRYDEN_CLOUGH_PARAGRAPHS,
+    perrin_paragraphs: Sequence[str] = DEFAULT_PERRIN_PARAGRAPHS,
+    on_paragraph_done: Callable[[dict[str, Any]], None] | None = None,
+    result_spill: ResultSpill | None = None,
+    feedback: Sequence[str] = (),
+    feedback_timeouts: dict[str, float] | None = None,
+    feedback_budget: int = DEFAULT_FEEDBACK_BUDGET,
+    feedback_mode: str = "blocking",
 ) -> dict[str, Any]:
-    if pipeline == "debate":
-        return run_debate_pipeline(
+    numbers = list(paragraph_numbers or range(1, len(greek_paragraphs) + 1))
+    for number in numbers:
+        if not 1 <= number <= len(greek_paragraphs):
+            raise ValueError(f"Paragraph {number} is out of range 1-{len(greek_paragraphs)}")
+    if (
+        pipeline in UNSCORED_PIPELINES
+        and convergence is not None
+        and (convergence.patience is not None or convergence.target_score is not None)
+    ):
+        raise ValueError(
+            f"{pipeline} produces no per-iteration scores; --converge-patience and "
+            "--converge-target-score apply to debate and sequential only (use --converge-edit-threshold)"
+        )
+    feedback_names = list(feedback)
+    if pipeline == "sequential" and sequential_feedback_model and "perplexity" not in feedback_names:
+        # --sequential-feedback-model on its own keeps meaning "perplexity for the judge".
+        feedback_names.insert(0, "perplexity")
+    if "perplexity" in feedback_names and not sequential_feedback_model:
+        raise ValueError("Perplexity feedback needs a model; pass --sequential-feedback-model")
+
+    # Only settings the chosen pipeline reads go into the memo key, so an
+    # unrelated flag does not invalidate cached paragraphs.
+    settings_by_pipeline: dict[str, dict[str, Any]] = {
+        "debate": {
+            "quorum_size": quorum_size,
+            "topology": topology,
+            "critique_peers": critique_peers,
+            "debate_state": debate_state,
+            "state_budget": state_budget,
+            "debate_schedule": debate_schedule,
+        },
+        "sequential": {
+            "candidates": candidates,
+            "judge_top_k": judge_top_k,
+            "selection": selection,
+            "feedback_model": sequential_feedback_model,
+        },
+        "cognitive_user": {"selection": selection, "phrase_mode": phrase_mode},
+        "cognitive_dualloop": {
+            "selection": selection,
+            "analysis_mode": analysis_mode,
+            "draft_mode": draft_mode,
+        },
+    }
+    memo_keys: dict[int, str] = {}
+    reused: dict[int, list[dict[str, Any]]] = {}
+    if paragraph_memo is not None:
+        settings = {
+            **settings_by_pipeline.get(pipeline, {}),
+            "convergence": asdict(convergence) if convergence is not None else None,
+            "goals_guidance": GOALS_GUIDANCE,
+        }
+        if feedback_names:
+            # The budget and timeouts shape the merged feedback block that the
+            # judge and selector prompts receive.
+            settings["feedback"] = feedback_names
+            settings["feedback_model"] = sequential_feedback_model
+            settings["feedback_budget"] = feedback_budget
+            settings["feedback_timeouts"] = dict(sorted((feedback_timeouts or {}).items()))
+        if pipeline == "sequential" and feedback_names and feedback_mode != "blocking":
+            settings["feedback_mode"] = feedback_mode
+        for number in numbers:
+            paragraph_settings = settings
+            # A paragraph that fits in one chunk runs as if unchunked, so it
+            # shares the unchunked memo entry.
+            if chunk_chars and len(chunk_greek(greek_paragraphs[number - 1], max_chars=chunk_chars)) > 1:
+                paragraph_settings = {
+                    **settings,
+                    "chunking": {"max_chars": chunk_chars, "overlap": chunk_overlap},
+                }
+            memo_keys[number] = paragraph_memo.key(
+                greek=greek_paragraphs[number - 1],
+                reference_translations=reference_translations_for_index(
+                    dryden_paragraphs, perrin_paragraphs, number
+                ),
+                user_preference=normalize_user_preference(user_preference),
+                pipeline=pipeline,
+                model=model,
+                iterations=iterations,
+                settings=paragraph_settings,
+            )
+            cached = paragraph_memo.load(memo_keys[number])
+            if cached is not None:
+                # A chunked paragraph is stored as the list of its chunk results.
+                reused[number] = [
+                    {**part, "paragraph_index": number, "reused": True}
+                    for part in cached.get("chunks", [cached])
+                ]
+                if result_spill is not None:
+                    reused[number] = [result_spill.compact(part) for part in reused[number]]
+        if verbose and reused:
+            publish(Event("log", f"[memo] reusing unchanged paragraphs: {', '.join(map(str, sorted(reused)))}"))
+        if on_paragraph_done is not None:
+            for parts in reused.values():
+                for part in parts:
+                    on_paragraph_done(part)
+
+    if "perplexity" in feedback_names:
+        preflight = compute_feedback_fn(
             client=client,
-            model=model,
-            greek_paragraphs=greek_paragraphs,
-            iterations=iterations,
-            verbose=verbose,
-            color_mode=color_mode,
-            user_preference=user_preference,
-            call_json_fn=call_json,
-            normalize_user_preference_fn=normalize_user_preference,
-            should_use_color_fn=should_use_color,
-            colorize_fn=colorize,
-            stage_colors=STAGE_COLORS,
-            agent_colors=AGENT_COLORS,
-            goals_guidance=GOALS_GUIDANCE,
-            dryden_paragraphs=DEFAULT_DRYDEN_CLOUGH_PARAGRAPHS,
-            perrin_paragraphs=DEFAULT_PERRIN_PARAGRAPHS,
+            model=sequential_feedback_model,
+            text="Perplexity preflight check sentence.",
+            timeout=45,
         )
-    if pipeline == "sequential":
-        if sequential_feedback_model:
-            preflight = compute_smoothness_feedback_from_perplexity(
-                client=client,
-                model=sequential_feedback_model,
-                text="Perplexity preflight check sentence.",
-                timeout=45,
+        if not preflight.get("available"):
+            reason = str(preflight.get("reason", "unavailable")).strip()
+            raise ValueError(
+                "Perplexity feedback preflight failed for "
+                f"model '{sequential_feedback_model}': {reason}"
             )
-            if not preflight.get("available"):
-                reason = str(preflight.get("reason", "unavailable")).strip()
-                raise ValueError(
-                    "Perplexity feedback preflight failed for "
-                    f"model '{sequential_feedback_model}': {reason}"
-                )
-            if verbose:
-                ppl = preflight.get("perplexity")
-                tok = preflight.get("token_count")
-                resolved = str(preflight.get("resolved_model", "")).strip()
-                ppl_str = f"{float(ppl):.3f}" if isinstance(ppl, (int, float)) else "n/a"
-                tok_str = str(tok) if isinstance(tok, int) else "n/a"
-                resolved_note = f", resolved_model={resolved}" if resolved else ""
-                print(
+        if verbose:
+            ppl = preflight.get("perplexity")
+            tok = preflight.get("token_count")
+            resolved = str(preflight.get("resolved_model", "")).strip()
+            ppl_str = f"{float(ppl):.3f}" if isinstance(ppl, (int, float)) else "n/a"
+            tok_str = str(tok) if isinstance(tok, int) else "n/a"
+            resolved_note = f", resolved_model={resolved}" if resolved else ""
+            publish(
+                Event(
+                    "log",
                     "[preflight] perplexity feedback ready: "
                     f"model={sequential_feedback_model}{resolved_note}, "
                     f"perplexity={ppl_str}, token_count={tok_str}",
-                    file=sys.stderr,
                 )
-        return run_sequential_pipeline(
+            )
+
+    def run_selected(
+        selected: list[int],
+        source_paragraphs: Sequence[str] = greek_paragraphs,
+        workers: int = paragraph_workers,
+        on_done: Callable[[dict[str, Any]], None] | None = on_paragraph_done,
+    ) -> dict[str, Any]:
+        if pipeline == "debate":
+            return run_debate_pipeline(
+                client=client,
+                model=model,
+                greek_paragraphs=source_paragraphs,
+                paragraph_numbers=selected,
+                on_paragraph_done=on_done,
+                result_spill=result_spill,
+                iterations=iterations,
+                verbose=verbose,
+                color_mode=color_mode,
+                user_preference=user_preference,
+                call_json_fn=call_json_fn,
+                normalize_user_preference_fn=normalize_user_preference,
+                should_use_color_fn=should_use_color,
+                colorize_fn=colorize,
+                stage_colors=STAGE_COLORS,
+                agent_colors=AGENT_COLORS,
+                goals_guidance=GOALS_GUIDANCE,
+                dryden_paragraphs=dryden_paragraphs,
+                perrin_paragraphs=perrin_paragraphs,
+                paragraph_workers=workers,
+                convergence=convergence,
+                quorum_size=quorum_size,
+                topology=topology,
+                critique_peers=critique_peers,
+                debate_state=debate_state,
+                state_budget=state_budget,
+                debate_schedule=debate_schedule,
+                feedback=orchestrator,
+            )
+        if pipeline == "sequential":
+            return run_sequential_pipeline(
+                client=client,
+                model=model,
+                greek_paragraphs=source_paragraphs,
+                paragraph_numbers=selected,
+                on_paragraph_done=on_done,
+                result_spill=result_spill,
+                iterations=iterations,
+                verbose=verbose,
+                color_mode=color_mode,
+                user_preference=user_preference,
+                call_json_fn=call_json_fn,
+                normalize_user_preference_fn=normalize_user_preference,
+                should_use_color_fn=should_use_color,
+                colorize_fn=colorize,
+                stage_colors=STAGE_COLORS,
+                agent_colors=AGENT_COLORS,
+                goals_guidance=GOALS_GUIDANCE,
+                dryden_paragraphs=dryden_paragraphs,
+                perrin_paragraphs=perrin_paragraphs,
+                feedback=orchestrator,
+                feedback_mode=feedback_mode,
+                paragraph_workers=workers,
+                convergence=convergence,
+                candidates=candidates,
+                judge_top_k=judge_top_k,
+                selection=selection,
+            )
+        if pipeline == "cognitive_user":
+            return run_user_cognitive_pipeline(
+                client=client,
+                model=model,
+                greek_paragraphs=source_paragraphs,
+                paragraph_numbers=selected,
+                on_paragraph_done=on_done,
+                result_spill=result_spill,
+                iterations=iterations,
+                verbose=verbose,
+                color_mode=color_mode,
+                user_preference=user_preference,
+                call_json_fn=call_json_fn,
+                normalize_user_preference_fn=normalize_user_preference,
+                should_use_color_fn=should_use_color,
+                colorize_fn=colorize,
+                stage_colors=STAGE_COLORS,
+                goals_guidance=GOALS_GUIDANCE,
+                dryden_paragraphs=dryden_paragraphs,
+                perrin_paragraphs=perrin_paragraphs,
+                paragraph_workers=workers,
+                convergence=convergence,
+                selection=selection,
+                phrase_mode=phrase_mode,
+                feedback=orchestrator,
+            )
+        if pipeline == "cognitive_dualloop":
+            return run_dualloop_cognitive_pipeline(
+                client=client,
+                model=model,
+                greek_paragraphs=source_paragraphs,
+                paragraph_numbers=selected,
+                on_paragraph_done=on_done,
+                result_spill=result_spill,
+                iterations=iterations,
+                verbose=verbose,
+                color_mode=color_mode,
+                user_preference=user_preference,
+                call_json_fn=call_json_fn,
+                normalize_user_preference_fn=normalize_user_preference,
+                should_use_color_fn=should_use_color,
+                colorize_fn=colorize,
+                stage_colors=STAGE_COLORS,
+                goals_guidance=GOALS_GUIDANCE,
+                dryden_paragraphs=dryden_paragraphs,
+                perrin_paragraphs=perrin_paragraphs,
+                paragraph_workers=workers,
+                convergence=convergence,
+                selection=selection,
+                analysis_mode=analysis_mode,
+                draft_mode=draft_mode,
+                feedback=orchestrator,
+            )
+        raise ValueError(f"Unsupported pipeline: {pipeline}")
+
+    orchestrator = (
+        FeedbackOrchestrator(
+            feedback_names,
             client=client,
             model=model,
-            greek_paragraphs=greek_paragraphs,
-            iterations=iterations,
-            verbose=verbose,
-            color_mode=color_mode,
-            user_preference=user_preference,
-            call_json_fn=call_json,
-            normalize_user_preference_fn=normalize_user_preference,
-            should_use_color_fn=should_use_color,
-            colorize_fn=colorize,
-            stage_colors=STAGE_COLORS,
-            agent_colors=AGENT_COLORS,
-            goals_guidance=GOALS_GUIDANCE,
-            dryden_paragraphs=DEFAULT_DRYDEN_CLOUGH_PARAGRAPHS,
-            perrin_paragraphs=DEFAULT_PERRIN_PARAGRAPHS,
-            feedback_model=sequential_feedback_model,
+            perplexity_model=sequential_feedback_model,
+            compute_perplexity_fn=compute_feedback_fn,
+            timeouts=feedback_timeouts,
+            budget_chars=feedback_budget,
         )
-    if pipeline == "cognitive_user":
-        return run_user_cognitive_pipeline(
-            client=client,
-            model=model,
-            greek_paragraphs=greek_paragraphs,
-            iterations=iterations,
-            verbose=verbose,
-            color_mode=color_mode,
-            user_preference=user_preference,
-            call_json_fn=call_json,
-            normalize_user_preference_fn=normalize_user_preference,
-            should_use_color_fn=should_use_color,
-            colorize_fn=colorize,
-            stage_colors=STAGE_COLORS,
-            goals_guidance=GOALS_GUIDANCE,
-            dryden_paragraphs=DEFAULT_DRYDEN_CLOUGH_PARAGRAPHS,
-            perrin_paragraphs=DEFAULT_PERRIN_PARAGRAPHS,
-        )
-    if pipeline == "cognitive_dualloop":
-        return run_dualloop_cognitive_pipeline(
-            client=client,
-            model=model,
-            greek_paragraphs=greek_paragraphs,
-            iterations=iterations,
-            verbose=verbose,
-            color_mode=color_mode,
-            user_preference=user_preference,
-            call_json_fn=call_json,
-            normalize_user_preference_fn=normalize_user_preference,
-            should_use_color_fn=should_use_color,
-            colorize_fn=colorize,
-            stage_colors=STAGE_COLORS,
-            goals_guidance=GOALS_GUIDANCE,
-            dryden_paragraphs=DEFAULT_DRYDEN_CLOUGH_PARAGRAPHS,
-            perrin_paragraphs=DEFAULT_PERRIN_PARAGRAPHS,
+        if feedback_names
+        else None
+    )
+    pending = [number for number in numbers if number not in reused]
+    # Store each paragraph as it completes, so an interrupted run keeps the
+    # paragraphs it finished.
+    finished_chunks: dict[int, list[dict[str, Any]]] = {}
+
+    def store_paragraph(paragraph: dict[str, Any]) -> None:
+        if on_paragraph_done is not None:
+            on_paragraph_done(paragraph)
+        if paragraph_memo is None:
+            return
+        number = paragraph["paragraph_index"]
+        chunk = paragraph.get("chunk")
+        if chunk is None:
+            paragraph_memo.store(memo_keys[number], as_dict(paragraph))
+            return
+        # Chunks of one paragraph run in order on one thread; the paragraph
+        # is complete with its last chunk.
+        chunks = finished_chunks.setdefault(number, [])
+        chunks.append(as_dict(paragraph))
+        if chunk["number"] == chunk["count"]:
+            paragraph_memo.store(memo_keys[number], {"paragraph_index": number, "chunks": chunks})
+
+    try:
+        if not chunk_chars:
+            result = run_selected(pending, on_done=store_paragraph)
+        else:
+
+            def run_chunk(idx: int, chunk: str) -> dict[str, Any]:
+                source = ReplacedParagraph(greek_paragraphs, idx, chunk)
+                return run_selected([idx], source, workers=1, on_done=None)["paragraphs"][0]
+
+            result = run_selected([])
+            result["paragraphs"] = run_chunked(
+                greek_paragraphs,
+                pending,
+                run_chunk,
+                max_chars=chunk_chars,
+                overlap=chunk_overlap,
+                workers=paragraph_workers,
+                on_paragraph_done=store_paragraph,
+            )
+            result["chunking"] = {"max_chars": chunk_chars, "overlap": chunk_overlap}
+    finally:
+        if orchestrator is not None:
+            orchestrator.close()
+    if reused or chunk_chars:
+        paragraphs = sorted(
+            result["paragraphs"] + [part for parts in reused.values() for part in parts],
+            key=lambda paragraph: paragraph["paragraph_index"],
         )
-    raise ValueError(f"Unsupported pipeline: {pipeline}")
+        result["paragraphs"] = paragraphs
+        result["paragraph_count"] = len({p["paragraph_index"] for p in paragraphs})
+        result["final_translation"] = stitch_translations(paragraphs)
+    result["reused_paragraphs"] = sorted(reused)
+    return result
+
+
+def phrase_timing_note(paragraph: dict[str, Any]) -> str:
+    timing = paragraph.get("phrase_timing")
+    if not timing:
+        return ""
+    return (
+        f"Translate wall time ({timing['mode']} phrase mode): "
+        f"{timing['translate_seconds']}s over {timing['iterations']} iteration(s)."
+    )
+
+
+def dualloop_usage_note(paragraph: dict[str, Any]) -> str:
+    usage = paragraph.get("dualloop_usage")
+    if not usage or not usage["output_tokens_est"]:
+        return ""
+    tokens = usage["output_tokens_est"]
+    note = (
+        f"Output tokens (est) per iteration ({usage['analysis_mode']} analysis, "
+        f"{usage.get('draft_mode', 'single')} drafts): {', '.join(map(str, tokens))}"
+    )
+    if len(tokens) > 1 and tokens[0]:
+        later = sum(tokens[1:]) / len(tokens[1:])
+        note += f"; later iterations average {(later - tokens[0]) / tokens[0]:+.0%} vs iteration 1"
+    seconds = usage.get("translate_seconds")
+    if seconds:
+        note += f". Translate wall time per iteration: {', '.join(f'{value}s' for value in seconds)}"
+    return note + "."
+
+
+def feedback_timing_note(paragraph: dict[str, Any]) -> str:
+    timing = paragraph.get("feedback_timing")
+    if not timing:
+        return ""
+    results = [
+        (row["iteration"], name, used_in) for row in timing["arrivals"] for name, used_in in row["used_in"].items()
+    ]
+    late = [f"{name} (iteration {iteration})" for iteration, name, used_in in results if used_in is None]
+    note = (
+        f"Feedback ({timing['mode']} mode): paragraph wall time {timing['wall_seconds']}s, "
+        f"{timing['blocked_seconds']}s blocked on feedback; "
+        f"{len(results) - len(late)}/{len(results)} results arrived in time"
+    )
+    return note + (f", late: {', '.join(late)}." if late else ".")
+
+
+def paragraph_heading(paragraph: dict[str, Any]) -> str:
+    heading = f"Paragraph {paragraph['paragraph_index']}"
+    chunk = paragraph.get("chunk")
+    if chunk and chunk["count"] > 1:
+        heading += f", part {chunk['number']}/{chunk['count']}"
+    return heading + (" (reused)" if paragraph.get("reused") else "")
+
+
+def convergence_note(paragraph: dict[str, Any]) -> str:
+    convergence = paragraph.get("convergence", {})
+    reason = str(convergence.get("stop_reason", "")).strip()
+    if not reason:
+        return ""
+    return (
+        f"_Stopped after {convergence.get('iterations_run')} iteration(s), "
+        f"saving {convergence.get('iterations_saved')}: {reason}._"
+    )
+
+
+def usage_line(label: str, usage: dict[str, int]) -> str:
+    return (
+        f"- {label}: `{usage.get('calls', 0)}` calls, "
+        f"~`{usage.get('prompt_tokens_est', 0)}` prompt tokens, "
+        f"~`{usage.get('completion_tokens_est', 0)}` completion tokens"
+    )
+
+
+def prompt_size_line(label: str, size: dict[str, int]) -> str:
+    full = size.get("full_tokens_est", 0)
+    compact = size.get("compact_tokens_est", 0)
+    change = f" ({(compact - full) / full:+.0%})" if full else ""
+    return f"- {label}: ~`{compact}` prompt tokens vs ~`{full}` with full state{change}"
+
+
+def debate_cost_lines(paragraph: dict[str, Any]) -> list[str]:
+    lines: list[str] = []
+    usage = paragraph.get("usage", {})
+    if "initial" in usage:
+        lines.append(usage_line("Initial translations", usage["initial"]))
+    for round_summary in paragraph.get("debate_round_summaries", []):
+        round_usage = round_summary.get("usage")
+        if not round_usage:
+            continue
+        merged = {
+            key: round_usage["critique"][key] + round_usage["revision"][key]
+            for key in round_usage["critique"]
+        }
+        lines.append(usage_line(f"Round {round_summary['iteration']}", merged))
+        if "prompt_size" in round_summary:
+            lines.append(
+                prompt_size_line(f"Round {round_summary['iteration']} revision prompts", round_summary["prompt_size"])
+            )
+    timing = paragraph.get("debate_timing")
+    if timing:
+        lines.append(f"- Debate wall time (`{timing['schedule']}`): `{timing['wall_seconds']}`s")
+    if "synthesis" in usage:
+        lines.append(usage_line("Final synthesis", usage["synthesis"]))
+    if "synthesis_prompt_size" in paragraph:
+        lines.append(prompt_size_line("Final synthesis prompt", paragraph["synthesis_prompt_size"]))
+    return lines
 
 
 def render_markdown_report(result: dict[str, Any]) -> str:
@@ -347,9 +727,41 @@ def render_markdown_report(result: dict[str, Any]) -> str:
     lines.append(f"- Pipeline: `{result.get('pipeline', 'debate')}`")
     lines.append(f"- Model: `{result['model']}`")
     lines.append(f"- Translators/Debaters: `{result['agent_count']}`")
+    if result.get("critique_topology"):
+        lines.append(f"- Critique topology: `{result['critique_topology']}`")
     lines.append(f"- Iterations: `{result['iterations']}`")
     lines.append(f"- User preference prompt: `{result['user_preference']}`")
     lines.append(f"- Generated (UTC): `{result['created_at_utc']}`")
+    if result.get("reused_paragraphs"):
+        lines.append(
+            "- Reused paragraphs (unchanged since an earlier run): "
+            f"`{', '.join(map(str, result['reused_paragraphs']))}`"
+        )
+    chunking = result.get("chunking")
+    if chunking:
+        lines.append(
+            f"- Chunking: up to `{chunking['max_chars']}` Greek characters per chunk, "
+            f"`{chunking['overlap']}` sentence(s) of context each side"
+        )
+    checkpoint = result.get("checkpoint")
+    if checkpoint:
+        lines.append(f"- Run id: `{checkpoint['run_id']}`")
+        if checkpoint["replayed_calls"]:
+            lines.append(
+                f"- Resumed: `{checkpoint['replayed_calls']}` calls replayed from checkpoints, "
+                f"`{checkpoint['new_calls']}` new"
+            )
+    saved = sum(
+        int(p.get("convergence", {}).get("iterations_saved", 0)) for p in result["paragraphs"]
+    )
+    if saved:
+        lines.append(f"- Iterations saved by convergence: `{saved}`")
+    ranked = [p["ranking"] for p in result["paragraphs"] if "ranking" in p]
+    if ranked:
+        lines.append(
+            f"- Ranking calls: `{sum(r['calls'] for r in ranked)}` "
+            f"(comparisons reused from cache: `{sum(r['cached_comparisons'] for r in ranked)}`)"
+        )
     lines.append("")
     lines.append("## Final Translation")
     lines.append("")
@@ -361,35 +773,97 @@ def render_markdown_report(result: dict[str, Any]) -> str:
         lines.append("## Greek Source")
         lines.append("")
         for paragraph in result["paragraphs"]:
-            idx = paragraph["paragraph_index"]
-            lines.append(f"### Paragraph {idx}")
-            lines.append("")
-            lines.append(paragraph["greek"])
+            lines.append(f"### {paragraph_heading(paragraph)}")
             lines.append("")
+            lines.extend(render_paragraph_lines(paragraph, single_agent=True))
         return "\n".join(lines).strip() + "\n"
 
     for paragraph in result["paragraphs"]:
-        idx = paragraph["paragraph_index"]
-        lines.append(f"## Paragraph {idx}")
-        lines.append("")
-        lines.append("### Greek")
+        lines.append(f"## {paragraph_heading(paragraph)}")
         lines.append("")
+        lines.extend(render_paragraph_lines(paragraph, single_agent=False))
+
+    return "\n".join(lines).strip() + "\n"
+
+
+def render_paragraph_lines(paragraph: dict[str, Any], *, single_agent: bool) -> list[str]:
+    """One paragraph's report section below its heading."""
+    lines: list[str] = []
+    if single_agent:
         lines.append(paragraph["greek"])
         lines.append("")
-        lines.append("### Final Synthesis")
-        lines.append("")
-        lines.append(paragraph["final_synthesis"].get("final_translation", ""))
+        convergence = convergence_note(paragraph)
+        if convergence:
+            lines.append(convergence)
+            lines.append("")
+        for note in (phrase_timing_note(paragraph), dualloop_usage_note(paragraph), feedback_timing_note(paragraph)):
+            if note:
+                lines.append(note)
+                lines.append("")
+        return lines
+
+    convergence = convergence_note(paragraph)
+    if convergence:
+        lines.append(convergence)
         lines.append("")
-        lines.append("### Agent Final Versions")
+    lines.append("### Greek")
+    lines.append("")
+    lines.append(paragraph["greek"])
+    lines.append("")
+    lines.append("### Final Synthesis")
+    lines.append("")
+    lines.append(paragraph["final_synthesis"].get("final_translation", ""))
+    lines.append("")
+    lines.append("### Agent Final Versions")
+    lines.append("")
+    for key, text in paragraph["final_agent_versions"].items():
+        lines.append(f"- `{key}`: {text}")
+    lines.append("")
+    cost = debate_cost_lines(paragraph)
+    if cost:
+        lines.append("### Debate Cost (estimated tokens)")
         lines.append("")
-        for key, text in paragraph["final_agent_versions"].items():
-            lines.append(f"- `{key}`: {text}")
+        lines.extend(cost)
         lines.append("")
+    return lines
+
+
+def stream_report_header(
+    *,
+    pipeline: str,
+    model: str,
+    iterations: int,
+    user_preference: str,
+    run_id: str,
+) -> str:
+    """Header of the in-progress report; the finished report replaces it."""
+    lines = [
+        "# Translation Report (in progress)",
+        "",
+        f"- Pipeline: `{pipeline}`",
+        f"- Model: `{model}`",
+        f"- Iterations: `{iterations}`",
+        f"- User preference prompt: `{user_preference}`",
+        f"- Run id: `{run_id}`",
+        "",
+        "Paragraph sections are appended as they finish.",
+        "",
+        "",
+    ]
+    return "\n".join(lines)
 
-    return "\n".join(lines).strip() + "\n"
 
+def render_streamed_section(paragraph: dict[str, Any], *, single_agent: bool) -> str:
+    """Section appended to the in-progress report as soon as a paragraph finishes."""
+    lines = [f"## {paragraph_heading(paragraph)}", ""]
+    if single_agent:
+        lines.extend(["### Translation", "", paragraph["final_synthesis"].get("final_translation", ""), ""])
+        lines.extend(["### Greek", ""])
+    lines.extend(render_paragraph_lines(paragraph, single_agent=single_agent))
+    return "\n".join(lines).strip() + "\n\n"
 
-def parse_args() -> argparse.Namespace:
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
             "Run a modular Greek translation workflow with swappable pipelines."
@@ -449,20 +923,328 @@ def parse_args() -> argparse.Namespace:
             "If unavailable, the run fails before translation starts."
         ),
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--feedback",
+        default="",
+        help=(
+            "Comma-separated external feedback mechanisms, run concurrently for every pipeline: "
+            f"{', '.join(FEEDBACK_MECHANISMS)}. 'perplexity' needs --sequential-feedback-model."
+        ),
+    )
+    parser.add_argument(
+        "--feedback-timeouts",
+        default="",
+        help="Per-mechanism deadlines in seconds, e.g. 'perplexity=30,back_translation=60'.",
+    )
+    parser.add_argument(
+        "--feedback-mode",
+        choices=FEEDBACK_MODES,
+        default="blocking",
+        help=(
+            "Sequential only. 'blocking' waits for feedback before each judge call. "
+            "'async' scores in the background while the judge runs and folds results "
+            "into the next translate prompt or the final selection once they arrive."
+        ),
+    )
+    parser.add_argument(
+        "--feedback-budget",
+        type=int,
+        default=DEFAULT_FEEDBACK_BUDGET,
+        help="Character budget for the merged feedback block in each prompt.",
+    )
+    parser.add_argument(
+        "--quorum-size",
+        type=int,
+        default=3,
+        help=(
+            "Debate only: number of translator agents. Priorities beyond the first three "
+            "are imagery, argument, concision, audience and cadence; larger quorums repeat them."
+        ),
+    )
+    parser.add_argument(
+        "--topology",
+        choices=list(TOPOLOGIES),
+        default="all_to_all",
+        help=(
+            "Debate only: who critiques whom each round. all_to_all (every agent reviews "
+            "every translation), ring (each reviews its neighbour), random_k (each reviews "
+            "--critique-peers random peers) or critic (one dedicated critic reviews all)."
+        ),
+    )
+    parser.add_argument(
+        "--critique-peers",
+        type=int,
+        default=2,
+        help="Debate only: peers each agent reviews per round with --topology random_k.",
+    )
+    parser.add_argument(
+        "--debate-state",
+        choices=["full", "compact"],
+        default="full",
+        help=(
+            "Debate only: 'compact' sends revision and synthesis prompts a rolling state "
+            "(latest scores, deduplicated concerns, rolling summary) as unindented JSON "
+            "instead of full debate dumps."
+        ),
+    )
+    parser.add_argument(
+        "--state-budget",
+        type=int,
+        default=DEFAULT_SECTION_BUDGET,
+        help="Debate only: estimated-token budget per compact state section.",
+    )
+    parser.add_argument(
+        "--debate-schedule",
+        choices=["rounds", "barrier_free"],
+        default="rounds",
+        help=(
+            "Debate only: 'rounds' waits for all critiques, then all revisions, each round. "
+            "'barrier_free' lets each agent revise as soon as the critiques of its own "
+            "translation are in, and logs every versioned exchange."
+        ),
+    )
+    parser.add_argument(
+        "--paragraph-workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of paragraphs translated concurrently. "
+            "Output order and verbose logs stay in paragraph order."
+        ),
+    )
+    parser.add_argument(
+        "--converge-edit-threshold",
+        type=float,
+        default=None,
+        help=(
+            "Stop a paragraph's loop once consecutive translations (or, in debate, "
+            "all agents' translations) differ by less than this normalized word edit distance."
+        ),
+    )
+    parser.add_argument(
+        "--converge-patience",
+        type=int,
+        default=None,
+        help=(
+            "Stop a paragraph's loop after this many rounds without a score improvement "
+            "(debate and sequential only)."
+        ),
+    )
+    parser.add_argument(
+        "--converge-target-score",
+        type=float,
+        default=None,
+        help="Stop a paragraph's loop once its mean score reaches this value, e.g. 9.5 (debate and sequential only).",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=1,
+        help=(
+            "Sequential only: translations generated concurrently per iteration "
+            "at spread temperatures, pre-ranked locally before judging."
+        ),
+    )
+    parser.add_argument(
+        "--judge-top-k",
+        type=int,
+        default=1,
+        help="Sequential only: how many pre-ranked candidates get a judge call.",
+    )
+    parser.add_argument(
+        "--selection",
+        choices=["prompt", "ranking"],
+        default="prompt",
+        help=(
+            "How iteration results are chosen (sequential and cognitive pipelines). "
+            "'ranking' compares candidates listwise, or by a knockout of listwise pods "
+            "for large sets, instead of judging each and running a selection prompt."
+        ),
+    )
+    parser.add_argument(
+        "--phrase-mode",
+        choices=["single", "decomposed"],
+        default="single",
+        help=(
+            "cognitive_user only: 'decomposed' segments the Greek into phrases once, analyses "
+            "each phrase in its own concurrent call, then composes the paragraph in one call, "
+            "instead of one long call that walks every phrase."
+        ),
+    )
+    parser.add_argument(
+        "--dualloop-analysis",
+        choices=["fresh", "frozen"],
+        default="fresh",
+        help=(
+            "cognitive_dualloop only: 'frozen' keeps iteration 1's scene model, claim map, "
+            "restatement and constraint ledger as fixed context, so later iterations only "
+            "write drafts and the final paragraph."
+        ),
+    )
+    parser.add_argument(
+        "--dualloop-drafts",
+        choices=["single", "parallel"],
+        default="single",
+        help=(
+            "cognitive_dualloop only: 'parallel' writes the source-close, plain-natural and "
+            "balanced drafts as three concurrent calls over a shared analysis, then merges "
+            "them in one short call."
+        ),
+    )
+    parser.add_argument(
+        "--input",
+        default="",
+        help=(
+            "Greek source to translate instead of the built-in Theseus 1.1-1.3: a UTF-8 text file "
+            "with blank-line-separated paragraphs, or JSONL with one string or {\"greek\": ...} "
+            "object per line. Paragraphs are read lazily, one at a time."
+        ),
+    )
+    parser.add_argument(
+        "--references",
+        default="",
+        help=(
+            "JSONL of reference translations aligned with --input, one "
+            "{\"dryden_clough\": ..., \"perrin\": ...} object per paragraph (either key may be absent)."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-chars",
+        type=int,
+        default=0,
+        help=(
+            "Split each Greek paragraph longer than this many characters into sentence-aligned "
+            "chunks, run them in order and stitch the translations (default: 0 = off)."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=1,
+        help="Neighbouring Greek sentences shown as context on each side of a chunk (default: 1).",
+    )
+    parser.add_argument(
+        "--no-reuse",
+        action="store_true",
+        help=(
+            "Recompute every paragraph instead of reusing results cached in runs/paragraph_cache "
+            "for unchanged paragraphs and settings."
+        ),
+    )
+    parser.add_argument(
+        "--events-jsonl",
+        default="",
+        metavar="PATH",
+        help=(
+            "Also write every progress event (log lines, stage start/end, translations, scores) "
+            "to PATH as JSON lines."
+        ),
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help=(
+            "Record timing spans for paragraphs, stages, HTTP calls, retries and pool waits; write "
+            "runs/traces/<run_id>.trace.json (Chrome trace format) and a <run_id>.html timeline."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        default="",
+        metavar="RUN_ID",
+        help=(
+            "Resume an interrupted run from runs/checkpoints/RUN_ID.jsonl. The run's original "
+            "arguments are reused; completed calls are replayed and only missing work runs."
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def default_iterations(pipeline: str) -> int:
+    if pipeline in {"sequential", "cognitive_user", "cognitive_dualloop"}:
+        return DEFAULT_SEQUENTIAL_ITERATIONS
+    return DEFAULT_ITERATIONS
 
 
 def main() -> int:
     args = parse_args()
+    checkpoints: CheckpointStore | None = None
+    if args.resume:
+        checkpoints = CheckpointStore(args.resume)
+        if not checkpoints.header:
+            print(f"No checkpoint found for run '{args.resume}' at {checkpoints.path}", file=sys.stderr)
+            return 2
+        # Replay only matches if every prompt is rebuilt exactly, so the
+        # recorded arguments win over anything passed alongside --resume.
+        args = parse_args(checkpoints.argv)
     iterations = args.iterations
     if iterations is None:
-        if args.pipeline in {"sequential", "cognitive_user", "cognitive_dualloop"}:
-            iterations = DEFAULT_SEQUENTIAL_ITERATIONS
-        else:
-            iterations = DEFAULT_ITERATIONS
+        iterations = default_iterations(args.pipeline)
     if iterations < 1:
         print("--iterations must be >= 1", file=sys.stderr)
         return 2
+    if args.paragraph_workers < 1:
+        print("--paragraph-workers must be >= 1", file=sys.stderr)
+        return 2
+    if args.quorum_size < 1 or args.critique_peers < 1:
+        print("--quorum-size and --critique-peers must be >= 1", file=sys.stderr)
+        return 2
+    if args.state_budget < 1:
+        print("--state-budget must be >= 1", file=sys.stderr)
+        return 2
+    if args.candidates < 1 or args.judge_top_k < 1:
+        print("--candidates and --judge-top-k must be >= 1", file=sys.stderr)
+        return 2
+    if args.chunk_chars < 0 or args.chunk_overlap < 0:
+        print("--chunk-chars and --chunk-overlap must be >= 0", file=sys.stderr)
+        return 2
+    if args.pipeline in UNSCORED_PIPELINES and (
+        args.converge_patience is not None or args.converge_target_score is not None
+    ):
+        print(
+            "--converge-patience and --converge-target-score need per-iteration scores; "
+            f"{args.pipeline} supports only --converge-edit-threshold",
+            file=sys.stderr,
+        )
+        return 2
+
+    try:
+        feedback = parse_feedback_names(args.feedback)
+        feedback_timeouts = parse_feedback_timeouts(args.feedback_timeouts)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    if "perplexity" in feedback and not args.sequential_feedback_model.strip():
+        print("--feedback perplexity requires --sequential-feedback-model", file=sys.stderr)
+        return 2
+    if args.feedback_budget < 1:
+        print("--feedback-budget must be >= 1", file=sys.stderr)
+        return 2
+
+    if args.references and not args.input:
+        print("--references requires --input", file=sys.stderr)
+        return 2
+    greek_paragraphs: Sequence[str] = DEFAULT_GREEK_PARAGRAPHS
+    dryden_paragraphs: Sequence[str] = DEFAULT_DRYDEN_CLOUGH_PARAGRAPHS
+    perrin_paragraphs: Sequence[str] = DEFAULT_PERRIN_PARAGRAPHS
+    if args.input:
+        try:
+            greek_paragraphs = ParagraphFile(Path(args.input))
+            references = ParagraphFile(Path(args.references)) if args.references else None
+        except OSError as exc:
+            print(f"Cannot read input: {exc}", file=sys.stderr)
+            return 2
+        if not greek_paragraphs:
+            print(f"No paragraphs found in {args.input}", file=sys.stderr)
+            return 2
+        dryden_paragraphs = references.column("dryden_clough") if references else []
+        perrin_paragraphs = references.column("perrin") if references else []
+
+    convergence = ConvergencePolicy(
+        edit_threshold=args.converge_edit_threshold,
+        patience=args.converge_patience,
+        target_score=args.converge_target_score,
+    )
 
     api_key = get_api_key(Path(".env"))
     if not api_key:
@@ -474,31 +1256,127 @@ def main() -> int:
         base_url=OPENROUTER_BASE_URL,
     )
 
+    resuming = checkpoints is not None
+    if checkpoints is None:
+        checkpoints = CheckpointStore.create(sys.argv[1:])
+    print(
+        f"[checkpoint] run id {checkpoints.run_id}; "
+        f"resume with: python main.py --resume {checkpoints.run_id}",
+        file=sys.stderr,
+    )
+
+    call_json_fn: Callable[..., dict[str, Any]] = call_json
+    compute_feedback_fn: Callable[..., dict[str, Any]] = compute_smoothness_feedback_from_perplexity
+    # A resumed run keeps the artifacts its interrupted run already wrote.
+    artifacts = StageArtifacts(checkpoints.run_id, append=resuming)
+    events = EventBus(jsonl_path=Path(args.events_jsonl) if args.events_jsonl else None)
+    tracer = Tracer(checkpoints.run_id) if args.trace else None
+    if tracer is not None:
+        call_json_fn = tracer.wrap(call_json_fn)
+    call_json_fn = events.wrap(artifacts.wrap(checkpoints.wrap(call_json_fn)))
+
+    prefix = Path(args.output_prefix)
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    md_path = prefix.with_suffix(".md")
+    single_agent = args.pipeline != "debate"
+    sink = ReportSink(
+        md_path,
+        stream_report_header(
+            pipeline=args.pipeline,
+            model=args.model,
+            iterations=iterations,
+            user_preference=normalize_user_preference(args.preference),
+            run_id=checkpoints.run_id,
+        ),
+        list(range(1, len(greek_paragraphs) + 1)),
+        lambda paragraph: render_streamed_section(paragraph, single_agent=single_agent),
+    )
+
+    started = time.time()
+    events.start()
+    if tracer is not None:
+        tracer.start()
     try:
         result = run_pipeline(
             client=client,
             model=args.model,
-            greek_paragraphs=DEFAULT_GREEK_PARAGRAPHS,
+            greek_paragraphs=greek_paragraphs,
             iterations=iterations,
             verbose=args.verbose,
             color_mode=args.color,
             user_preference=args.preference,
             sequential_feedback_model=(args.sequential_feedback_model or "").strip() or None,
             pipeline=args.pipeline,
+            paragraph_workers=args.paragraph_workers,
+            call_json_fn=call_json_fn,
+            compute_feedback_fn=compute_feedback_fn,
+            convergence=convergence if convergence.enabled else None,
+            candidates=args.candidates,
+            judge_top_k=args.judge_top_k,
+            selection=args.selection,
+            quorum_size=args.quorum_size,
+            topology=args.topology,
+            critique_peers=args.critique_peers,
+            debate_state=args.debate_state,
+            state_budget=args.state_budget,
+            debate_schedule=args.debate_schedule,
+            paragraph_memo=None if args.no_reuse else ParagraphMemo(),
+            phrase_mode=args.phrase_mode,
+            analysis_mode=args.dualloop_analysis,
+            draft_mode=args.dualloop_drafts,
+            chunk_chars=args.chunk_chars,
+            chunk_overlap=args.chunk_overlap,
+            dryden_paragraphs=dryden_paragraphs,
+            perrin_paragraphs=perrin_paragraphs,
+            on_paragraph_done=sink.add,
+            result_spill=ResultSpill(checkpoints.run_id),
+            feedback=feedback,
+            feedback_timeouts=feedback_timeouts,
+            feedback_budget=args.feedback_budget,
+            feedback_mode=args.feedback_mode,
         )
     except ValueError as exc:
         print(str(exc), file=sys.stderr)
         return 2
+    except KeyboardInterrupt:
+        print(f"Run cancelled. Resume with: python main.py --resume {checkpoints.run_id}", file=sys.stderr)
+        return 130
+    finally:
+        sink.close()
+        artifacts.flush()
+        events.close()
+        if tracer is not None:
+            tracer.close()
+            tracer.write()
+            print(f"Wrote {tracer.trace_path} and {tracer.html_path}", file=sys.stderr)
 
-    prefix = Path(args.output_prefix)
-    prefix.parent.mkdir(parents=True, exist_ok=True)
-    md_path = prefix.with_suffix(".md")
-
-    md_path.write_text(render_markdown_report(result), encoding="utf-8")
+    result["checkpoint"] = checkpoints.stats()
+    if checkpoints.replayed:
+        print(
+            f"[checkpoint] replayed {checkpoints.replayed} calls; "
+            f"resumed at {checkpoints.first_live_scope or 'report rendering'}",
+            file=sys.stderr,
+        )
 
-    print(result["final_translation"])
-    print()
+    sink.finish(render_markdown_report(result))
     print(f"Wrote {md_path}")
+    print(f"Wrote {artifacts.path}")
+    try:
+        record_run(
+            run_id=checkpoints.run_id,
+            script="main",
+            pipeline=args.pipeline,
+            model=args.model,
+            user_preference=normalize_user_preference(args.preference),
+            iterations=iterations,
+            started=started,
+            wall_seconds=time.time() - started,
+            report_path=md_path,
+            artifacts_path=artifacts.path,
+            paragraphs=result["paragraphs"],
+        )
+    except sqlite3.Error as exc:
+        print(f"[catalog] run not recorded: {exc}", file=sys.stderr)
     return 0
 
 
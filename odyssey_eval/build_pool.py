@@ -26,7 +26,7 @@ sys.path.insert(0, str(ROOT))
 
 from openai import OpenAI
 
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 DEFAULT_MODEL = "x-ai/grok-4.1-fast"
 
 # Project Gutenberg plain-text URLs
@@ -4,7 +4,7 @@ from __future__ import annotations
 import json
 import re
 import time
-from typing import Any
+from typing import Any, Callable
 
 from openai import OpenAI
 
@@ -81,8 +81,13 @@ def compare(
     pipeline_output: str,
     model: str = COMPARE_MODEL,
     retries: int = 3,
+    call_json_fn: Callable[..., dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
-    """Call the comparison agent and return score + rationale."""
+    """Call the comparison agent and return score + rationale.
+
+    `call_json_fn` (same signature as `pipeline.call_json`) lets the caller
+    checkpoint and record the request like any other stage call.
+    """
     user_prompt = _USER_TEMPLATE.format(
         values_profile=values_profile.strip(),
         known_passage=known_passage.strip(),
@@ -91,18 +96,21 @@ def compare(
     last_err: Exception | None = None
     for attempt in range(1, retries + 1):
         try:
-            resp = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": _SYSTEM},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.2,
-                timeout=120,
-                extra_body={"reasoning": {"enabled": True}},
-            )
-            content = resp.choices[0].message.content or ""
-            result = _parse_json(content)
+            if call_json_fn is not None:
+                result = call_json_fn(client, model, _SYSTEM, user_prompt, temperature=0.2, retries=1)
+            else:
+                resp = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": _SYSTEM},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    temperature=0.2,
+                    timeout=120,
+                    extra_body={"reasoning": {"enabled": True}},
+                )
+                content = resp.choices[0].message.content or ""
+                result = _parse_json(content)
             # Ensure score is an int in range
             score = result.get("score")
             if not isinstance(score, (int, float)):
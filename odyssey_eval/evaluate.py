@@ -7,16 +7,21 @@ For each translator:
   - Randomly selects N passages from the pool
   - Runs the sequential pipeline on each with that translator's values
   - Scores each against the known translation via the comparison agent
-  - Logs results to runs/odyssey_eval_<run_id>.json + .md
+  - Logs every stage call and passage score to runs/artifacts/<run_id>.jsonl.gz
+    and writes the summary to runs/odyssey_eval_<run_id>.md
+
+Every completed call and passage is checkpointed under runs/checkpoints/;
+an interrupted run continues with --resume <run_id>.
 """
 from __future__ import annotations
 
 import argparse
-import json
+from datetime import datetime, timezone
 import os
 import random
+import sqlite3
 import sys
-from datetime import datetime, timezone
+import time
 from pathlib import Path
 
 ROOT = Path(__file__).parent.parent
@@ -26,10 +31,13 @@ from openai import OpenAI
 
 from odyssey_eval.compare import compare
 from odyssey_eval.corpus import load_pool, passage_label, sample_passages
-from odyssey_eval.pipeline import run_passage
+from odyssey_eval.pipeline import call_json, run_passage
 from odyssey_eval.profiles import PROFILES
+from pipelines.artifacts import StageArtifacts
+from pipelines.catalog import record_run
+from pipelines.checkpoint import CheckpointStore, update_scope
 
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 DEFAULT_MODEL = "x-ai/grok-4.1-fast"
 
 
@@ -55,6 +63,8 @@ def evaluate_translator(
     verbose: bool,
     used_indices: set[int],
     rng: random.Random,
+    checkpoints: CheckpointStore,
+    artifacts: StageArtifacts,
 ) -> dict:
     profile = PROFILES[translator_key]
     translator_name = profile["name"]
@@ -81,12 +91,22 @@ def evaluate_translator(
     passage_results = []
     scores = []
 
+    call_json_fn = artifacts.wrap(checkpoints.wrap(call_json))
     for pool_idx, passage in selected:
         label = passage_label(passage)
         known_text = passage[translator_key]
         greek = passage["greek"]
 
         print(f"\n  Passage {label}", flush=True)
+        scope = {"translator": translator_key, "passage": label}
+        update_scope(**scope)
+        key, restored = checkpoints.replay(scope, "passage_result")
+        if restored is not None:
+            # Its stage calls and score are already in the artifacts.
+            print(f"  Restored from checkpoint: {restored['score']}/10", flush=True)
+            scores.append(restored["score"])
+            passage_results.append(restored)
+            continue
         if verbose:
             print(f"  Greek: {greek[:100]}...", flush=True)
 
@@ -98,15 +118,18 @@ def evaluate_translator(
             model=model,
             iterations=pipeline_iterations,
             verbose=verbose,
+            call_json_fn=call_json_fn,
         )
         final_translation = pipeline_out["final_translation"]
 
         print(f"  Comparing against {translator_name}...", flush=True)
+        update_scope(stage="compare")
         comparison = compare(
             client=client,
             values_profile=values_profile,
             known_passage=known_text,
             pipeline_output=final_translation,
+            call_json_fn=call_json_fn,
         )
         score = comparison.get("score", 0)
         scores.append(score)
@@ -117,20 +140,21 @@ def evaluate_translator(
             print(f"  Key gaps: {comparison.get('key_gaps', [])}", flush=True)
             print(f"  Key matches: {comparison.get('key_matches', [])}", flush=True)
 
-        passage_results.append(
-            {
-                "passage_label": label,
-                "book": passage["book"],
-                "start_line": passage["start_line"],
-                "end_line": passage["end_line"],
-                "greek": greek,
-                "known_translation": known_text,
-                "pipeline_output": final_translation,
-                "comparison": comparison,
-                "score": score,
-                "pipeline_detail": pipeline_out,
-            }
-        )
+        passage_result = {
+            "passage_label": label,
+            "book": passage["book"],
+            "start_line": passage["start_line"],
+            "end_line": passage["end_line"],
+            "greek": greek,
+            "known_translation": known_text,
+            "pipeline_output": final_translation,
+            "comparison": comparison,
+            "score": score,
+            "pipeline_detail": pipeline_out,
+        }
+        checkpoints.record(key, scope, passage_result)
+        artifacts.flush()
+        passage_results.append(passage_result)
 
     avg_score = sum(scores) / len(scores) if scores else 0.0
     worst = min(passage_results, key=lambda r: r["score"])
@@ -219,6 +243,12 @@ def main() -> None:
     parser.add_argument("--model", default=DEFAULT_MODEL, help="LLM model for pipeline and comparison")
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
     parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility")
+    parser.add_argument(
+        "--resume",
+        default="",
+        metavar="RUN_ID",
+        help="Resume an interrupted run with its original arguments and passages",
+    )
     args = parser.parse_args()
 
     _load_dotenv(ROOT / ".env")
@@ -227,6 +257,25 @@ def main() -> None:
         sys.exit("Missing OPENROUTER_API_KEY")
 
     client = OpenAI(api_key=api_key, base_url=OPENROUTER_BASE_URL)
+
+    resuming = bool(args.resume)
+    if resuming:
+        checkpoints = CheckpointStore(args.resume, directory=ROOT / "runs" / "checkpoints")
+        if not checkpoints.header:
+            sys.exit(f"No checkpoint found for run '{args.resume}' at {checkpoints.path}")
+        args = parser.parse_args(checkpoints.argv)
+    else:
+        argv = sys.argv[1:]
+        if args.seed is None:
+            # Pin the passage sample so a resumed run draws the same passages.
+            args.seed = random.randrange(2**32)
+            argv += ["--seed", str(args.seed)]
+        checkpoints = CheckpointStore.create(argv, directory=ROOT / "runs" / "checkpoints")
+    print(
+        f"Run id: {checkpoints.run_id} (resume with --resume {checkpoints.run_id})",
+        flush=True,
+    )
+
     pool = load_pool()
     print(f"Loaded passage pool: {len(pool)} passages", flush=True)
 
@@ -237,8 +286,17 @@ def main() -> None:
     )
 
     rng = random.Random(args.seed)
-    run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    run_id = checkpoints.run_id
+    # One block per passage, written once the passage is done: a resumed run
+    # keeps the finished passages' records and replays only the cut-off one.
+    artifacts = StageArtifacts(
+        run_id,
+        directory=ROOT / "runs" / "artifacts",
+        block_records=None,
+        append=resuming,
+    )
 
+    started = time.time()
     all_results = []
     for translator_key in translators:
         # Each translator samples independently — passages may overlap across
@@ -253,6 +311,8 @@ def main() -> None:
             verbose=args.verbose,
             used_indices=set(),  # fresh per translator
             rng=rng,
+            checkpoints=checkpoints,
+            artifacts=artifacts,
         )
         all_results.append(result)
 
@@ -260,26 +320,41 @@ def main() -> None:
     runs_dir = ROOT / "runs"
     runs_dir.mkdir(exist_ok=True)
 
-    json_path = runs_dir / f"odyssey_eval_{run_id}.json"
     md_path = runs_dir / f"odyssey_eval_{run_id}.md"
-
-    full_output = {
-        "run_id": run_id,
-        "model": args.model,
-        "pipeline_iterations": args.iterations,
-        "n_passages_per_translator": args.passages,
-        "translators_evaluated": translators,
-        "results": all_results,
-    }
-    json_path.write_text(json.dumps(full_output, ensure_ascii=False, indent=2), encoding="utf-8")
     md_path.write_text(
         write_markdown(all_results, run_id, args.model, args.iterations), encoding="utf-8"
     )
 
     print(f"\nResults written to:", flush=True)
-    print(f"  {json_path}", flush=True)
+    print(f"  {artifacts.path}", flush=True)
     print(f"  {md_path}", flush=True)
 
+    try:
+        record_run(
+            run_id=run_id,
+            script="odyssey_eval",
+            pipeline="odyssey",
+            model=args.model,
+            iterations=args.iterations,
+            started=started,
+            wall_seconds=time.time() - started,
+            report_path=md_path,
+            artifacts_path=artifacts.path,
+            passages=[
+                {
+                    "translator": r["translator"],
+                    "passage": p["passage_label"],
+                    "score": p["score"],
+                    "translation": p["pipeline_output"],
+                }
+                for r in all_results
+                for p in r["passages"]
+            ],
+            path=runs_dir / "catalog.sqlite",
+        )
+    except sqlite3.Error as exc:
+        print(f"[catalog] run not recorded: {exc}", flush=True)
+
 
 if __name__ == "__main__":
     main()
@@ -7,17 +7,22 @@ from __future__ import annotations
 
 import json
 import os
+import sqlite3
 import sys
+import time
 from pathlib import Path
 
 ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT))
 
 from openai import OpenAI
-from odyssey_eval.pipeline import run_passage
+from odyssey_eval.pipeline import call_json, run_passage
 from odyssey_eval.corpus import load_pool
+from pipelines.artifacts import StageArtifacts
+from pipelines.catalog import record_run
+from pipelines.checkpoint import update_scope
 
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 MODEL = "x-ai/grok-4.1-fast"
 
 # ---------------------------------------------------------------------------
@@ -425,6 +430,11 @@ def main() -> None:
                 selected.append(p)
                 break
 
+    artifacts = StageArtifacts.create(ROOT / "runs" / "artifacts")
+    run_id = artifacts.run_id
+    call_json_fn = artifacts.wrap(call_json)
+    started = time.time()
+
     print(f"Testing {len(PERSONAS)} personas on {len(selected)} passages\n")
     print("=" * 70)
 
@@ -448,6 +458,7 @@ def main() -> None:
             print(f"[Greek: {passage['greek'][:80]}...]")
             print("Running pipeline (1 iteration)...")
 
+            update_scope(translator=persona_key, passage=label)
             result = run_passage(
                 client=client,
                 greek=passage["greek"],
@@ -455,12 +466,14 @@ def main() -> None:
                 model=MODEL,
                 iterations=1,
                 verbose=False,
+                call_json_fn=call_json_fn,
             )
             translation = result["final_translation"]
             persona_results.append({"label": label, "translation": translation})
             print(f"\nTRANSLATION:\n{translation}\n")
 
         results[persona_key] = persona_results
+    artifacts.flush()
 
     # Save results
     out_path = ROOT / "runs" / "persona_test.json"
@@ -469,6 +482,27 @@ def main() -> None:
         json.dump(results, f, ensure_ascii=False, indent=2)
     print(f"\nResults saved to {out_path}")
 
+    try:
+        record_run(
+            run_id=run_id,
+            script="persona_test",
+            pipeline="odyssey",
+            model=MODEL,
+            iterations=1,
+            started=started,
+            wall_seconds=time.time() - started,
+            report_path=out_path,
+            artifacts_path=artifacts.path,
+            passages=[
+                {"translator": key, "passage": row["label"], "translation": row["translation"]}
+                for key, rows in results.items()
+                for row in rows
+            ],
+            path=ROOT / "runs" / "catalog.sqlite",
+        )
+    except sqlite3.Error as exc:
+        print(f"[catalog] run not recorded: {exc}")
+
 
 if __name__ == "__main__":
     main()
@@ -9,10 +9,12 @@ from __future__ import annotations
 import json
 import re
 import time
-from typing import Any
+from typing import Any, Callable
 
 from openai import OpenAI
 
+from pipelines.checkpoint import update_scope
+
 DEFAULT_MODEL = "x-ai/grok-4.1-fast"
 DEFAULT_ITERATIONS = 2
 
@@ -27,7 +29,7 @@ GOALS_GUIDANCE = (
 # Minimal JSON call helper
 # ---------------------------------------------------------------------------
 
-def _call_json(
+def call_json(
     client: OpenAI,
     model: str,
     system: str,
@@ -258,6 +260,7 @@ def run_passage(
     model: str = DEFAULT_MODEL,
     iterations: int = DEFAULT_ITERATIONS,
     verbose: bool = False,
+    call_json_fn: Callable[..., dict[str, Any]] = call_json,
 ) -> dict[str, Any]:
     """Translate a single Greek passage, iterating toward the target style.
 
@@ -268,6 +271,7 @@ def run_passage(
     iteration_logs: list[dict[str, Any]] = []
 
     for it in range(1, iterations + 1):
+        update_scope(iteration=it, stage="translate")
         if verbose:
             print(f"  [iter {it}] translating...", flush=True)
         sys_t, usr_t = _translate_prompt(
@@ -277,8 +281,8 @@ def run_passage(
             previous_translation=current_translation or None,
             previous_judgment=current_judgment,
         )
-        t_result = _call_json(client, DEFAULT_MODEL if model == DEFAULT_MODEL else model,
-                              sys_t, usr_t, temperature=0.45)
+        t_result = call_json_fn(client, DEFAULT_MODEL if model == DEFAULT_MODEL else model,
+                                sys_t, usr_t, temperature=0.45)
         current_translation = str(t_result.get("translation", "")).strip()
 
         if verbose:
@@ -289,7 +293,8 @@ def run_passage(
             translation=current_translation,
             iteration=it,
         )
-        current_judgment = _call_json(client, model, sys_j, usr_j, temperature=0.3)
+        update_scope(stage="judge")
+        current_judgment = call_json_fn(client, model, sys_j, usr_j, temperature=0.3)
 
         iteration_logs.append(
             {
@@ -307,7 +312,8 @@ def run_passage(
         values_profile=values_profile,
         iteration_logs=iteration_logs,
     )
-    select_result = _call_json(client, model, sys_s, usr_s, temperature=0.25)
+    update_scope(stage="select")
+    select_result = call_json_fn(client, model, sys_s, usr_s, temperature=0.25)
     final_translation = str(select_result.get("final_translation", "")).strip()
     if not final_translation:
         final_translation = current_translation
@@ -0,0 +1,290 @@
+"""Compressed JSONL stage-call artifacts with a versioned schema.
+
+Every LLM stage call in a run becomes one record in
+`runs/artifacts/<run_id>.jsonl.gz`. A record holds the call's scope
+(paragraph or passage, iteration, agent, stage), its inputs (model, prompts,
+temperature), its output, any scores in the output, and its timing. A run can
+then be reloaded for reports, dashboards or comparisons without rerunning it.
+
+Records are written in blocks. Each block is its own gzip member, appended to
+the file. A sidecar `<run_id>.index.json` lists every block's byte range and
+the stages and paragraphs it contains. `load_stage_calls` uses the index to
+decompress only the blocks that can match a stage or paragraph filter. If
+the index is missing, it streams the whole file instead.
+
+Schema (`schema_version` 1), one JSON object per line:
+    schema_version, run_id, seq, stage, paragraph, scope,
+    input {model, system, user, temperature},
+    output, scores, timing {started_at_utc, seconds[, replayed]}, error
+
+A resumed run appends to the same file. Calls it replays from its checkpoint
+store are not recorded again when the interrupted run already wrote them.
+A replayed call whose record was lost with the interruption is written with
+`timing.replayed` set and `seconds` null, so it never counts as a timed call.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import gzip
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Iterator
+
+from .checkpoint import allocate_run_id, current_scope, request_digest, served_from_checkpoint
+
+ARTIFACT_SCHEMA_VERSION = 1
+ARTIFACT_DIR = Path("runs/artifacts")
+BLOCK_RECORDS = 64
+
+SCORE_KEYS = ("scores", "balance_scores", "self_scores", "score")
+
+
+def extract_scores(output: Any) -> dict[str, Any]:
+    if not isinstance(output, dict):
+        return {}
+    return {key: output[key] for key in SCORE_KEYS if isinstance(output.get(key), (dict, int, float))}
+
+
+def call_key(scope: dict[str, Any], inputs: dict[str, Any]) -> str:
+    """The checkpoint store's key for a call, from its scope and inputs."""
+    return request_digest({"scope": scope, "request": inputs})
+
+
+def index_path_for(path: Path) -> Path:
+    return path.with_name(path.name.removesuffix(".jsonl.gz") + ".index.json")
+
+
+class StageArtifacts:
+    """Writer for one run's stage-call records; thread-safe."""
+
+    def __init__(
+        self,
+        run_id: str,
+        directory: Path = ARTIFACT_DIR,
+        block_records: int | None = BLOCK_RECORDS,
+        *,
+        append: bool = False,
+    ) -> None:
+        """`block_records=None` writes a block only on `flush()`.
+
+        By default a (re)started run writes its records from scratch, because
+        a resumed run replays its checkpointed calls through the writer again.
+        With `append`, the records indexed so far are kept and anything after
+        the last indexed block (cut off by the interruption) is dropped.
+        Replayed calls that match a kept record are then not written again.
+        """
+        self.run_id = run_id
+        self.path = directory / f"{run_id}.jsonl.gz"
+        self.index_path = index_path_for(self.path)
+        self.block_records = block_records
+        self._pending: list[dict[str, Any]] = []
+        self._blocks: list[dict[str, Any]] = []
+        self._seq = 0
+        # Keys of kept records that a replayed call has not yet matched.
+        self._kept: dict[str, int] = {}
+        self._lock = threading.Lock()
+        directory.mkdir(parents=True, exist_ok=True)
+        if append and self.index_path.exists() and self.path.exists():
+            self._blocks = json.loads(self.index_path.read_text(encoding="utf-8"))["blocks"]
+            self._seq = sum(block["records"] for block in self._blocks)
+            end = self._blocks[-1]["offset"] + self._blocks[-1]["length"] if self._blocks else 0
+            with self.path.open("r+b") as handle:
+                handle.truncate(end)
+            self._write_index()
+            for row in load_stage_calls(self.path):
+                if row.get("error") is None:
+                    key = call_key(row["scope"], row["input"])
+                    self._kept[key] = self._kept.get(key, 0) + 1
+        else:
+            self.path.write_bytes(b"")
+        self._write_index()
+
+    @classmethod
+    def create(cls, directory: Path = ARTIFACT_DIR) -> StageArtifacts:
+        """A writer for a new run, under a run id no other run has claimed.
+
+        For scripts without a `CheckpointStore`, whose run id comes from here.
+        """
+        return cls(allocate_run_id(lambda run_id: directory / f"{run_id}.jsonl.gz"), directory)
+
+    def record(
+        self,
+        *,
+        stage: str,
+        scope: dict[str, Any],
+        inputs: dict[str, Any],
+        output: Any,
+        started: float,
+        seconds: float | None,
+        error: str | None = None,
+        replayed: bool = False,
+    ) -> None:
+        timing: dict[str, Any] = {
+            "started_at_utc": datetime.fromtimestamp(started, timezone.utc).isoformat(),
+            "seconds": None if seconds is None else round(seconds, 3),
+        }
+        if replayed:
+            timing["replayed"] = True
+        with self._lock:
+            self._seq += 1
+            self._pending.append(
+                {
+                    "schema_version": ARTIFACT_SCHEMA_VERSION,
+                    "run_id": self.run_id,
+                    "seq": self._seq,
+                    "stage": stage,
+                    "paragraph": scope.get("paragraph", scope.get("passage")),
+                    "scope": scope,
+                    "input": inputs,
+                    "output": output,
+                    "scores": extract_scores(output),
+                    "timing": timing,
+                    "error": error,
+                }
+            )
+            if self.block_records and len(self._pending) >= self.block_records:
+                self._flush_block()
+
+    def _flush_block(self) -> None:
+        if not self._pending:
+            return
+        data = gzip.compress(
+            "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in self._pending).encode("utf-8")
+        )
+        with self.path.open("ab") as handle:
+            offset = handle.tell()
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._blocks.append(
+            {
+                "offset": offset,
+                "length": len(data),
+                "records": len(self._pending),
+                "stages": sorted({str(row["stage"]) for row in self._pending}),
+                "paragraphs": sorted({str(row["paragraph"]) for row in self._pending}),
+            }
+        )
+        self._pending = []
+        self._write_index()
+
+    def _write_index(self) -> None:
+        index = {
+            "schema_version": ARTIFACT_SCHEMA_VERSION,
+            "run_id": self.run_id,
+            "records": sum(block["records"] for block in self._blocks),
+            "blocks": self._blocks,
+        }
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def _claim_kept(self, key: str) -> bool:
+        with self._lock:
+            if not self._kept.get(key):
+                return False
+            self._kept[key] -= 1
+            return True
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_block()
+
+    def wrap(self, call_json_fn: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+        """Drop-in `call_json_fn` that records every call it makes.
+
+        Wrap the checkpoint store's `wrap`, so replayed calls can be told apart.
+        """
+
+        def call(
+            client: Any,
+            model: str,
+            system_prompt: str,
+            user_prompt: str,
+            **kwargs: Any,
+        ) -> dict[str, Any]:
+            scope = current_scope()
+            inputs = {
+                "model": model,
+                "system": system_prompt,
+                "user": user_prompt,
+                "temperature": kwargs.get("temperature"),
+            }
+            started = time.time()
+            clock = time.perf_counter()
+            try:
+                response = call_json_fn(client, model, system_prompt, user_prompt, **kwargs)
+            except Exception as exc:
+                self.record(
+                    stage=str(scope.get("stage", "")),
+                    scope=scope,
+                    inputs=inputs,
+                    output=None,
+                    started=started,
+                    seconds=time.perf_counter() - clock,
+                    error=str(exc),
+                )
+                raise
+            replayed = served_from_checkpoint()
+            if replayed and self._claim_kept(call_key(scope, inputs)):
+                return response
+            self.record(
+                stage=str(scope.get("stage", "")),
+                scope=scope,
+                inputs=inputs,
+                output=response,
+                started=started,
+                seconds=None if replayed else time.perf_counter() - clock,
+                replayed=replayed,
+            )
+            return response
+
+        return call
+
+
+def _read_records(data: bytes) -> Iterator[dict[str, Any]]:
+    for line in gzip.decompress(data).decode("utf-8").splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def load_stage_calls(
+    path: Path,
+    *,
+    stage: str | None = None,
+    paragraph: int | str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield a run's stage-call records, optionally only one stage or paragraph."""
+    index_path = index_path_for(path)
+    wanted_paragraph = None if paragraph is None else str(paragraph)
+
+    def matches(row: dict[str, Any]) -> bool:
+        if stage is not None and row.get("stage") != stage:
+            return False
+        return wanted_paragraph is None or str(row.get("paragraph")) == wanted_paragraph
+
+    if not index_path.exists():
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    row = json.loads(line)
+                    if matches(row):
+                        yield row
+        return
+
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    if index.get("schema_version") != ARTIFACT_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported artifact schema version: {index.get('schema_version')}")
+    with path.open("rb") as handle:
+        for block in index["blocks"]:
+            if stage is not None and stage not in block["stages"]:
+                continue
+            if wanted_paragraph is not None and wanted_paragraph not in block["paragraphs"]:
+                continue
+            handle.seek(block["offset"])
+            for row in _read_records(handle.read(block["length"])):
+                if matches(row):
+                    yield row
@@ -0,0 +1,324 @@
+"""Manifest-driven batch experiments sharing one call layer.
+
+A manifest lists pipelines, preferences, models, iteration counts and
+paragraph selections; every combination becomes one `BatchJob`. Jobs run
+concurrently, and all of their LLM calls go through one shared call layer:
+- a `RateLimiter` spaces request starts across every job;
+- a semaphore caps the calls in flight across every job;
+- a `ResponseCache` answers identical requests (same model, prompts and
+  temperature) once, even when two jobs ask at the same moment.
+
+Per-job usage separates live calls from cache hits, so the summary table
+shows what each configuration actually cost.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+import copy
+from dataclasses import dataclass, field
+import itertools
+import json
+import re
+import threading
+import time
+from typing import Any, Callable
+
+from .checkpoint import request_digest, submit_in_context
+from .common import estimate_tokens
+from .feedback import parse_feedback_names, parse_feedback_timeouts
+
+DEFAULT_JOB_WORKERS = 4
+DEFAULT_MAX_CONCURRENT_CALLS = 16
+
+# run_pipeline keyword options a manifest may set for every job.
+JOB_OPTIONS = {
+    "paragraph_workers",
+    "candidates",
+    "judge_top_k",
+    "selection",
+    "quorum_size",
+    "topology",
+    "critique_peers",
+    "debate_state",
+    "state_budget",
+    "debate_schedule",
+    "sequential_feedback_model",
+    "feedback",
+    "feedback_timeouts",
+    "feedback_budget",
+    "feedback_mode",
+    "phrase_mode",
+    "analysis_mode",
+    "draft_mode",
+    "chunk_chars",
+    "chunk_overlap",
+}
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    job_id: str
+    pipeline: str
+    model: str
+    preference: str
+    iterations: int | None
+    paragraphs: tuple[int, ...] | None
+    options: dict[str, Any] = field(default_factory=dict)
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "pipeline": self.pipeline,
+            "model": self.model,
+            "preference": self.preference,
+            "iterations": self.iterations,
+            "paragraphs": list(self.paragraphs) if self.paragraphs else "all",
+        }
+
+
+def _as_list(value: Any, default: list[Any]) -> list[Any]:
+    if value is None:
+        return default
+    return value if isinstance(value, list) else [value]
+
+
+def _paragraph_selection(value: Any) -> tuple[int, ...] | None:
+    if value in (None, "all"):
+        return None
+    if isinstance(value, int):
+        return (value,)
+    if isinstance(value, str):
+        return tuple(int(part) for part in value.split(",") if part.strip())
+    return tuple(int(part) for part in value)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def expand_manifest(manifest: dict[str, Any], *, default_model: str) -> list[BatchJob]:
+    """Cross product of the manifest's lists, one job per combination.
+
+    Keys: pipelines, preferences, models, iterations (null = pipeline default)
+    and paragraphs ("all", a number, "1,3" or a list of numbers). `options`
+    holds run_pipeline keywords applied to every job.
+    """
+    options = dict(manifest.get("options") or {})
+    unknown = sorted(set(options) - JOB_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown manifest options: {', '.join(unknown)}")
+    # Feedback options take the same "a,b" and "name=sec,..." strings as main.py.
+    if "feedback" in options:
+        options["feedback"] = parse_feedback_names(",".join(_as_list(options["feedback"], [])))
+    if isinstance(options.get("feedback_timeouts"), str):
+        options["feedback_timeouts"] = parse_feedback_timeouts(options["feedback_timeouts"])
+    pipelines = _as_list(manifest.get("pipelines"), ["debate"])
+    preferences = _as_list(manifest.get("preferences"), [""])
+    models = _as_list(manifest.get("models"), [default_model])
+    iteration_counts = _as_list(manifest.get("iterations"), [None])
+    selections = [_paragraph_selection(value) for value in _as_list(manifest.get("paragraphs"), ["all"])]
+
+    jobs: list[BatchJob] = []
+    combos = itertools.product(pipelines, models, iteration_counts, selections, enumerate(preferences, start=1))
+    for number, (pipeline, model, iterations, paragraphs, (pref_no, preference)) in enumerate(combos, start=1):
+        if iterations is not None and int(iterations) < 1:
+            raise ValueError("Manifest iterations must be >= 1")
+        parts = [
+            f"{number:03d}",
+            pipeline,
+            _slug(model.split("/")[-1]),
+            f"it{iterations}" if iterations is not None else "itdefault",
+            "p" + "-".join(str(n) for n in paragraphs) if paragraphs else "pall",
+            f"pref{pref_no}",
+        ]
+        jobs.append(
+            BatchJob(
+                job_id="_".join(parts),
+                pipeline=str(pipeline),
+                model=str(model),
+                preference=str(preference),
+                iterations=int(iterations) if iterations is not None else None,
+                paragraphs=paragraphs,
+                options=options,
+            )
+        )
+    return jobs
+
+
+class RateLimiter:
+    """Spaces request starts so all jobs together stay under a per-minute cap."""
+
+    def __init__(self, requests_per_minute: float | None = None) -> None:
+        self._interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class ResponseCache:
+    """Shared responses keyed by request; concurrent duplicates wait for the first."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, Future[dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_call(self, key: str, call: Callable[[], dict[str, Any]]) -> tuple[dict[str, Any], bool]:
+        """Return (response, hit). Failed calls are not cached.
+
+        Pipelines annotate response dicts in place, so the cache keeps its own
+        copy and every hit gets a fresh one.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = Future()
+        if not owner:
+            return copy.deepcopy(entry.result()), True
+        try:
+            response = call()
+        except BaseException as exc:
+            with self._lock:
+                self._entries.pop(key, None)
+            entry.set_exception(exc)
+            raise
+        entry.set_result(copy.deepcopy(response))
+        return response, False
+
+
+def new_job_usage() -> dict[str, int]:
+    return {"calls": 0, "cache_hits": 0, "prompt_tokens_est": 0, "completion_tokens_est": 0}
+
+
+def shared_call_fn(
+    call_json_fn: Callable[..., dict[str, Any]],
+    limiter: RateLimiter,
+    cache: ResponseCache,
+    usage: dict[str, int],
+    in_flight: threading.BoundedSemaphore | None = None,
+) -> Callable[..., dict[str, Any]]:
+    """Per-job `call_json_fn` over the shared limiter, cache and call cap, metering into `usage`."""
+    lock = threading.Lock()
+
+    def call(
+        client: Any,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        key = request_digest([model, system_prompt, user_prompt, kwargs.get("temperature")])
+
+        def live() -> dict[str, Any]:
+            with in_flight or nullcontext():
+                limiter.wait()
+                return call_json_fn(client, model, system_prompt, user_prompt, **kwargs)
+
+        response, hit = cache.get_or_call(key, live)
+        with lock:
+            usage["calls"] += 1
+            if hit:
+                usage["cache_hits"] += 1
+            else:
+                usage["prompt_tokens_est"] += estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+                usage["completion_tokens_est"] += estimate_tokens(json.dumps(response, ensure_ascii=False))
+        return response
+
+    return call
+
+
+def estimated_cost(usage: dict[str, int], price: dict[str, float] | None) -> float | None:
+    """USD from per-million-token prices {"prompt": x, "completion": y}, if given."""
+    if not price:
+        return None
+    return round(
+        usage["prompt_tokens_est"] / 1e6 * float(price.get("prompt", 0))
+        + usage["completion_tokens_est"] / 1e6 * float(price.get("completion", 0)),
+        4,
+    )
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    run_job_fn: Callable[[BatchJob, Callable[..., dict[str, Any]]], dict[str, Any]],
+    call_json_fn: Callable[..., dict[str, Any]],
+    *,
+    job_workers: int = DEFAULT_JOB_WORKERS,
+    requests_per_minute: float | None = None,
+    max_concurrent_calls: int | None = None,
+    prices: dict[str, dict[str, float]] | None = None,
+    on_job_done: Callable[[dict[str, Any]], None] | None = None,
+) -> list[dict[str, Any]]:
+    """Run every job on one pool; return one summary row per job, in job order.
+
+    `run_job_fn(job, call_json_fn)` runs and writes one job. A failing job is
+    recorded with its error and the rest of the batch continues. With
+    `max_concurrent_calls`, at most that many live calls run at once across
+    all jobs.
+    """
+    limiter = RateLimiter(requests_per_minute)
+    in_flight = threading.BoundedSemaphore(max_concurrent_calls) if max_concurrent_calls else None
+    cache = ResponseCache()
+    prices = prices or {}
+
+    def run_one(job: BatchJob) -> dict[str, Any]:
+        usage = new_job_usage()
+        started = time.perf_counter()
+        row: dict[str, Any] = {"job_id": job.job_id, **job.describe()}
+        try:
+            row["output"] = run_job_fn(job, shared_call_fn(call_json_fn, limiter, cache, usage, in_flight))
+            row["status"] = "ok"
+        except Exception as exc:  # noqa: BLE001
+            row["status"] = f"failed: {exc}"
+        row["wall_seconds"] = round(time.perf_counter() - started, 3)
+        row["usage"] = usage
+        row["cost_usd_est"] = estimated_cost(usage, prices.get(job.model))
+        if on_job_done is not None:
+            on_job_done(row)
+        return row
+
+    rows: dict[str, dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, job_workers)) as pool:
+        futures = [submit_in_context(pool, run_one, job) for job in jobs]
+        for future in as_completed(futures):
+            row = future.result()
+            rows[row["job_id"]] = row
+    return [rows[job.job_id] for job in jobs]
+
+
+def render_summary_markdown(rows: list[dict[str, Any]], wall_seconds: float) -> str:
+    lines = [
+        "# Batch Summary",
+        "",
+        f"- Jobs: `{len(rows)}` (failed: `{sum(1 for row in rows if row['status'] != 'ok')}`)",
+        f"- Batch wall time: `{wall_seconds:.1f}s`",
+        f"- Calls: `{sum(row['usage']['calls'] for row in rows)}` "
+        f"(shared cache hits: `{sum(row['usage']['cache_hits'] for row in rows)}`)",
+        "",
+        "| Job | Pipeline | Model | Iterations | Paragraphs | Preference | Status | Wall (s) "
+        "| Calls | Cache hits | Prompt tok (est) | Completion tok (est) | Cost (USD est) |",
+        "|---|---|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for row in rows:
+        usage = row["usage"]
+        paragraphs = row["paragraphs"]
+        cost = "n/a" if row["cost_usd_est"] is None else f"{row['cost_usd_est']:.4f}"
+        preference = (row["preference"] or "(none)").replace("|", "/")
+        lines.append(
+            f"| `{row['job_id']}` | {row['pipeline']} | {row['model']} | {row['iterations'] or 'default'} "
+            f"| {paragraphs if paragraphs == 'all' else ','.join(map(str, paragraphs))} "
+            f"| {preference} | {row['status']} | {row['wall_seconds']} | {usage['calls']} "
+            f"| {usage['cache_hits']} | {usage['prompt_tokens_est']} | {usage['completion_tokens_est']} "
+            f"| {cost} |"
+        )
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+"""Best-of-N candidate generation helpers for the sequential pipeline.
+
+Candidates are pre-ranked with signals that cost no LLM calls: the
+translator's own self-scores, length relative to the reference
+translations, Flesch-Kincaid grade when the user preference asks for
+simpler or more elevated prose, and perplexity when a scorer is configured
+(every candidate is then scored). Near-duplicates are collapsed before
+anything is judged.
+"""
+from __future__ import annotations
+
+import math
+import re
+from typing import Any
+
+from translation_feedback_mechanisms import compute_grade_level
+
+from .convergence import mean_score, normalized_edit_distance
+
+DEFAULT_DUPLICATE_THRESHOLD = 0.08
+
+_SIMPLER = re.compile(
+    r"\b(simple|simpler|plain|easy|easier|accessible|young|child|children|kids|students?|beginners?|"
+    r"grade|middle school|high school)\b"
+)
+_ELEVATED = re.compile(r"\b(elevated|literary|formal|sophisticated|scholarly|academic|ornate|poetic)\b")
+
+
+def grade_direction(user_preference: str) -> int:
+    """-1 if the preference asks for simpler prose, +1 for more elevated, else 0."""
+    text = user_preference.lower()
+    simpler = bool(_SIMPLER.search(text))
+    elevated = bool(_ELEVATED.search(text))
+    if simpler == elevated:
+        return 0
+    return -1 if simpler else 1
+
+
+def candidate_temperatures(count: int, low: float = 0.3, high: float = 0.9) -> list[float]:
+    if count <= 1:
+        return [0.45]
+    step = (high - low) / (count - 1)
+    return [round(low + step * i, 3) for i in range(count)]
+
+
+def _word_count(text: str) -> int:
+    return len(text.split())
+
+
+def local_signals(
+    text: str,
+    reference_translations: dict[str, str],
+    perplexities: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    grade = compute_grade_level(text=text)
+    reference_lengths = [
+        _word_count(ref) for ref in reference_translations.values() if ref.strip()
+    ]
+    length_ratio = None
+    if reference_lengths and text:
+        length_ratio = _word_count(text) / (sum(reference_lengths) / len(reference_lengths))
+    perplexity = None
+    scored = (perplexities or {}).get(text)
+    if isinstance(scored, dict) and scored.get("available"):
+        perplexity = scored.get("perplexity")
+    return {
+        "grade_level": grade.get("flesch_kincaid_grade") if grade.get("available") else None,
+        "length_ratio": round(length_ratio, 3) if length_ratio is not None else None,
+        "perplexity": perplexity,
+    }
+
+
+def prerank_candidates(
+    drafts: list[dict[str, Any]],
+    temperatures: list[float],
+    reference_translations: dict[str, str],
+    *,
+    perplexities: dict[str, dict[str, Any]] | None = None,
+    user_preference: str = "",
+    duplicate_threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Return one record per draft, best first; duplicates sort last.
+
+    `perplexities` maps each candidate text to its scorer result; pass it for
+    every candidate or not at all. The grade term only applies when
+    `grade_direction(user_preference)` is set. A draft within
+    `duplicate_threshold` edit distance of a better-ranked draft gets
+    `duplicate_of` set to that draft's candidate number.
+    """
+    records: list[dict[str, Any]] = []
+    for number, (draft, temperature) in enumerate(zip(drafts, temperatures), start=1):
+        text = str(draft.get("translation", "")).strip()
+        records.append(
+            {
+                "candidate": number,
+                "temperature": temperature,
+                "translation": text,
+                "translation_step": draft,
+                "signals": local_signals(text, reference_translations, perplexities),
+                "duplicate_of": None,
+            }
+        )
+
+    grades = [r["signals"]["grade_level"] for r in records if r["signals"]["grade_level"] is not None]
+    perplexity_values = [
+        float(r["signals"]["perplexity"])
+        for r in records
+        if isinstance(r["signals"]["perplexity"], (int, float)) and r["signals"]["perplexity"] > 0
+    ]
+    direction = grade_direction(user_preference)
+    # Distance from the grade the preference favours: the lowest, or the highest.
+    best_grade = (min(grades) if direction < 0 else max(grades)) if grades and direction else None
+    min_perplexity = min(perplexity_values) if perplexity_values else None
+
+    for record in records:
+        if not record["translation"]:
+            record["local_score"] = -math.inf
+            continue
+        signals = record["signals"]
+        score = mean_score(record["translation_step"].get("self_scores"))
+        score = 7.0 if score is None else score
+        if signals["length_ratio"]:
+            score -= 3.0 * abs(math.log(signals["length_ratio"]))
+        if best_grade is not None and signals["grade_level"] is not None:
+            score -= 0.1 * abs(signals["grade_level"] - best_grade)
+        ppl = signals["perplexity"]
+        if min_perplexity and isinstance(ppl, (int, float)) and ppl > 0:
+            score -= 0.5 * math.log10(ppl / min_perplexity)
+        record["local_score"] = round(score, 3)
+
+    records.sort(key=lambda r: r["local_score"], reverse=True)
+    kept: list[dict[str, Any]] = []
+    for record in records:
+        match = next(
+            (
+                other
+                for other in kept
+                if normalized_edit_distance(other["translation"], record["translation"])
+                < duplicate_threshold
+            ),
+            None,
+        )
+        if match is not None:
+            record["duplicate_of"] = match["candidate"]
+        else:
+            kept.append(record)
+    return kept + [r for r in records if r["duplicate_of"] is not None]
@@ -0,0 +1,237 @@
+"""SQLite catalog of finished runs, for queries across runs.
+
+Reports, logs and artifacts are one set of files per run. A question such as
+"average judge readability for sequential with a 7-year-old preference" would
+otherwise mean grepping every report. `main.py`, `run_theseus_paragraph3.py`,
+`odyssey_eval/evaluate.py` and `odyssey_eval/persona_test.py` each add their
+run to `runs/catalog.sqlite` when they finish. `query_runs.py` answers
+questions over it.
+
+Tables:
+- `runs`: one row per run, with its script, pipeline, model, preference,
+  iterations, wall time, call count and token estimates, plus the report and
+  artifact paths.
+- `paragraphs`: each finished paragraph (or chunk) and its final translation.
+- `passages`: each Odyssey passage, with its translator and comparison score.
+- `stage_calls`: one row per LLM call from the run's stage-call artifacts, with
+  its scope, wall time and token estimates. The `iterations` view sums these
+  per paragraph and iteration.
+- `scores`: every numeric score found in a call's output, one row per metric.
+
+Recording a run id again replaces its rows, so a resumed run is stored once.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import sqlite3
+from typing import Any, Iterable, Iterator
+
+from .artifacts import load_stage_calls
+from .common import estimate_tokens
+
+CATALOG_PATH = Path("runs/catalog.sqlite")
+CATALOG_SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    script TEXT NOT NULL,
+    pipeline TEXT,
+    model TEXT,
+    user_preference TEXT,
+    iterations INTEGER,
+    started_at_utc TEXT,
+    wall_seconds REAL,
+    calls INTEGER,
+    prompt_tokens_est INTEGER,
+    completion_tokens_est INTEGER,
+    report_path TEXT,
+    artifacts_path TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_pipeline ON runs (pipeline, model);
+CREATE INDEX IF NOT EXISTS runs_script ON runs (script, started_at_utc);
+
+CREATE TABLE IF NOT EXISTS paragraphs (
+    run_id TEXT NOT NULL,
+    paragraph TEXT NOT NULL,
+    chunk INTEGER NOT NULL DEFAULT 0,
+    reused INTEGER NOT NULL DEFAULT 0,
+    final_translation TEXT,
+    PRIMARY KEY (run_id, paragraph, chunk)
+);
+
+CREATE TABLE IF NOT EXISTS passages (
+    run_id TEXT NOT NULL,
+    translator TEXT NOT NULL,
+    passage TEXT NOT NULL,
+    score REAL,
+    translation TEXT,
+    PRIMARY KEY (run_id, translator, passage)
+);
+CREATE INDEX IF NOT EXISTS passages_translator ON passages (translator, score);
+
+CREATE TABLE IF NOT EXISTS stage_calls (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    paragraph TEXT,
+    chunk INTEGER,
+    iteration INTEGER,
+    stage TEXT,
+    agent TEXT,
+    seconds REAL,
+    prompt_tokens_est INTEGER,
+    completion_tokens_est INTEGER,
+    error TEXT,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS stage_calls_stage ON stage_calls (stage, run_id);
+
+CREATE TABLE IF NOT EXISTS scores (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    paragraph TEXT,
+    iteration INTEGER,
+    stage TEXT,
+    agent TEXT,
+    kind TEXT,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_metric ON scores (metric, stage, run_id, value);
+CREATE INDEX IF NOT EXISTS scores_run ON scores (run_id, paragraph);
+
+CREATE VIEW IF NOT EXISTS iterations AS
+SELECT run_id, paragraph, chunk, iteration,
+       COUNT(*) AS calls,
+       SUM(seconds) AS call_seconds,
+       SUM(prompt_tokens_est) AS prompt_tokens_est,
+       SUM(completion_tokens_est) AS completion_tokens_est
+FROM stage_calls
+WHERE iteration IS NOT NULL
+GROUP BY run_id, paragraph, chunk, iteration;
+"""
+
+RUN_TABLES = ("runs", "paragraphs", "passages", "stage_calls", "scores")
+
+
+def open_catalog(path: Path = CATALOG_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    connection.row_factory = sqlite3.Row
+    # WAL lets a query run while another script is recording its run.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    connection.execute(f"PRAGMA user_version={CATALOG_SCHEMA_VERSION}")
+    return connection
+
+
+def flatten_scores(scores: dict[str, Any]) -> Iterator[tuple[str, str, float]]:
+    """(kind, metric, value) for every number in an artifact's `scores` field.
+
+    `{"scores": {"readability": 8}}` gives ("scores", "readability", 8.0);
+    a bare `{"score": 7}` gives ("score", "score", 7.0).
+    """
+    for kind, value in scores.items():
+        items = value.items() if isinstance(value, dict) else [(kind, value)]
+        for metric, number in items:
+            if isinstance(number, (int, float)) and not isinstance(number, bool):
+                yield kind, str(metric), float(number)
+
+
+def _call_rows(run_id: str, artifacts_path: Path) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]]]:
+    calls: list[tuple[Any, ...]] = []
+    scores: list[tuple[Any, ...]] = []
+    for row in load_stage_calls(artifacts_path):
+        scope = row["scope"]
+        paragraph = None if row["paragraph"] is None else str(row["paragraph"])
+        inputs = row["input"]
+        calls.append(
+            (
+                run_id,
+                row["seq"],
+                paragraph,
+                scope.get("chunk"),
+                scope.get("iteration"),
+                row["stage"],
+                scope.get("agent"),
+                row["timing"]["seconds"],
+                estimate_tokens(str(inputs.get("system") or "")) + estimate_tokens(str(inputs.get("user") or "")),
+                0 if row["output"] is None else estimate_tokens(json.dumps(row["output"], ensure_ascii=False)),
+                row["error"],
+            )
+        )
+        for kind, metric, value in flatten_scores(row["scores"]):
+            scores.append(
+                (run_id, row["seq"], paragraph, scope.get("iteration"), row["stage"], scope.get("agent"), kind, metric, value)
+            )
+    return calls, scores
+
+
+def record_run(
+    *,
+    run_id: str,
+    script: str,
+    pipeline: str | None = None,
+    model: str | None = None,
+    user_preference: str | None = None,
+    iterations: int | None = None,
+    started: float | None = None,
+    wall_seconds: float | None = None,
+    report_path: Path | None = None,
+    artifacts_path: Path | None = None,
+    paragraphs: Iterable[dict[str, Any]] = (),
+    passages: Iterable[dict[str, Any]] = (),
+    path: Path = CATALOG_PATH,
+) -> None:
+    """Add (or replace) one finished run.
+
+    `paragraphs` are the runner's paragraph results. `passages` are dicts with
+    translator, passage, score and translation keys. Calls and scores come from
+    the run's stage-call artifacts, if it wrote them.
+    """
+    calls, scores = _call_rows(run_id, artifacts_path) if artifacts_path and artifacts_path.exists() else ([], [])
+    paragraph_rows = [
+        (
+            run_id,
+            str(paragraph["paragraph_index"]),
+            int((paragraph.get("chunk") or {}).get("number", 0)),
+            int(bool(paragraph.get("reused"))),
+            str(paragraph["final_synthesis"].get("final_translation", "")).strip(),
+        )
+        for paragraph in paragraphs
+    ]
+    passage_rows = [
+        (run_id, str(passage["translator"]), str(passage["passage"]), passage.get("score"), passage.get("translation"))
+        for passage in passages
+    ]
+    connection = open_catalog(path)
+    try:
+        with connection:
+            for table in RUN_TABLES:
+                connection.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+            connection.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    script,
+                    pipeline,
+                    model,
+                    user_preference,
+                    iterations,
+                    datetime.fromtimestamp(started, timezone.utc).isoformat() if started else None,
+                    None if wall_seconds is None else round(wall_seconds, 3),
+                    len(calls),
+                    sum(call[8] for call in calls),
+                    sum(call[9] for call in calls),
+                    None if report_path is None else str(report_path),
+                    None if artifacts_path is None else str(artifacts_path),
+                ),
+            )
+            connection.executemany("INSERT INTO paragraphs VALUES (?, ?, ?, ?, ?)", paragraph_rows)
+            connection.executemany("INSERT INTO passages VALUES (?, ?, ?, ?, ?)", passage_rows)
+            connection.executemany("INSERT INTO stage_calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", calls)
+            connection.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", scores)
+    finally:
+        connection.close()
@@ -0,0 +1,191 @@
+"""Durable checkpoints so an interrupted run can resume where it stopped.
+
+Every completed LLM call is one pipeline stage (translate, judge, debate,
+revise, select, polish, compare). Each one is appended to
+`runs/checkpoints/<run_id>.jsonl` as soon as it returns, along with the scope
+it ran in: paragraph or passage, iteration, agent and stage. A resumed run
+replays recorded responses for matching calls. The pipeline rebuilds the same
+state without spending calls and goes live at the first call that has no
+checkpoint.
+
+Responses are keyed by scope plus request (model, prompts, temperature), not
+by call order, so concurrent paragraphs and agents may finish in any order.
+Identical requests in the same scope replay in the order they were recorded.
+"""
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor, Future
+import contextvars
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any, Callable
+
+CHECKPOINT_DIR = Path("runs/checkpoints")
+
+_SCOPE: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "checkpoint_scope",
+    default=None,
+)
+_REPLAYED: contextvars.ContextVar[bool] = contextvars.ContextVar("checkpoint_replayed", default=False)
+
+
+def new_run_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+
+
+def allocate_run_id(path_for: Callable[[str], Path]) -> str:
+    """A new run id, claimed by creating its file `path_for(run_id)`.
+
+    Runs started within the same second would share an id; a later one gets
+    its process id appended until it can create a file nobody else has.
+    """
+    run_id = new_run_id()
+    while True:
+        path = path_for(run_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            path.open("x").close()
+        except FileExistsError:
+            run_id = f"{run_id}_{os.getpid()}"
+            continue
+        return run_id
+
+
+def current_scope() -> dict[str, Any]:
+    return dict(_SCOPE.get() or {})
+
+
+def served_from_checkpoint() -> bool:
+    """Whether the last wrapped call in this context was replayed, not live."""
+    return _REPLAYED.get()
+
+
+def shared_scope() -> dict[str, Any] | None:
+    """The current scope itself, not a copy; never mutate it."""
+    return _SCOPE.get()
+
+
+def update_scope(**fields: Any) -> None:
+    """Label the calls that follow in this context (paragraph, iteration, stage...).
+
+    Pool tasks started with `submit_in_context` get a copy of the caller's
+    scope, so a label set inside one task never leaks into another.
+    """
+    _SCOPE.set({**current_scope(), **fields})
+
+
+def submit_in_context(pool: Executor, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def request_digest(value: Any) -> str:
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """Append-only JSONL log of completed calls for one run id."""
+
+    def __init__(self, run_id: str, directory: Path = CHECKPOINT_DIR) -> None:
+        self.run_id = run_id
+        self.path = directory / f"{run_id}.jsonl"
+        self.header: dict[str, Any] = {}
+        self.replayed = 0
+        self.recorded = 0
+        self.first_live_scope: dict[str, Any] | None = None
+        self._pending: dict[str, deque[Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def create(cls, argv: list[str], directory: Path = CHECKPOINT_DIR) -> CheckpointStore:
+        store = cls(allocate_run_id(lambda run_id: directory / f"{run_id}.jsonl"), directory)
+        store.header = {"type": "run", "run_id": store.run_id, "argv": list(argv)}
+        store._append(store.header)
+        return store
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    @property
+    def argv(self) -> list[str]:
+        return [str(arg) for arg in self.header.get("argv", [])]
+
+    def _load(self) -> None:
+        if not self.exists:
+            return
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by the interruption; that call reruns.
+                continue
+            if entry.get("type") == "run":
+                self.header = entry
+            elif entry.get("type") == "call":
+                self._pending.setdefault(entry["key"], deque()).append(entry["response"])
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def replay(self, scope: dict[str, Any], request: Any) -> tuple[str, Any | None]:
+        """Return (key, recorded response or None) for a request in a scope."""
+        key = request_digest({"scope": scope, "request": request})
+        with self._lock:
+            queue = self._pending.get(key)
+            if queue:
+                self.replayed += 1
+                return key, queue.popleft()
+        return key, None
+
+    def record(self, key: str, scope: dict[str, Any], response: Any) -> None:
+        with self._lock:
+            if self.first_live_scope is None:
+                self.first_live_scope = scope
+            self.recorded += 1
+            self._append({"type": "call", "key": key, "scope": scope, "response": response})
+
+    def wrap(self, call_json_fn: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+        """Drop-in `call_json_fn` that replays checkpoints and records new calls."""
+
+        def call(
+            client: Any,
+            model: str,
+            system_prompt: str,
+            user_prompt: str,
+            **kwargs: Any,
+        ) -> dict[str, Any]:
+            scope = current_scope()
+            request = {
+                "model": model,
+                "system": system_prompt,
+                "user": user_prompt,
+                "temperature": kwargs.get("temperature"),
+            }
+            key, response = self.replay(scope, request)
+            _REPLAYED.set(response is not None)
+            if response is not None:
+                return response
+            response = call_json_fn(client, model, system_prompt, user_prompt, **kwargs)
+            self.record(key, scope, response)
+            return response
+
+        return call
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "replayed_calls": self.replayed,
+            "new_calls": self.recorded,
+            "resumed_at": self.first_live_scope,
+        }
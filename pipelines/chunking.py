@@ -0,0 +1,184 @@
+"""Greek-aware chunking of long paragraphs.
+
+Pipelines translate one `greek_paragraphs` entry per prompt. A whole chapter
+or a long Odyssey passage makes that prompt slow and the output worse, so a
+long entry can be cut into chunk-sized runs of whole sentences. Each chunk goes
+through the chosen pipeline on its own. Its prompts carry the neighbouring
+Greek and the previous chunk's final translation as context. The chunk
+translations are then stitched back together in order.
+
+Segmentation works on NFC text. Under NFC the Greek question mark (U+037E)
+becomes `;` and the ano teleia (U+0387) becomes the raised dot `·`.
+Apostrophe-like marks after a Greek letter are read as elision and unified
+to `᾽`, so an elided word is never taken for a closing quote. Sentences end
+at `.`, `;` or `!`. The raised dot and `:` only split a sentence that is too
+long to fit in one chunk.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+import re
+from typing import Any, Callable
+import unicodedata
+
+from .checkpoint import update_scope
+from .common import run_paragraphs, set_chunk_context
+from .events import Event
+
+ELISION_MARK = "\u1fbd"
+_ELISION = re.compile("(?<=[\u0370-\u03ff\u1f00-\u1fff])['\u2019\u02bc\u1fbf]")
+_CLOSERS = "\"'»”’)\\]"
+_SENTENCE_END = re.compile(rf"[.;!][{_CLOSERS}]*(?=\s|$)")
+_CLAUSE_END = re.compile(rf"[·:][{_CLOSERS}]*(?=\s|$)")
+
+
+@dataclass(frozen=True)
+class GreekChunk:
+    number: int
+    count: int
+    greek: str
+    context_before: str
+    context_after: str
+
+
+def normalize_greek(text: str) -> str:
+    text = unicodedata.normalize("NFC", text)
+    text = _ELISION.sub(ELISION_MARK, text)
+    return " ".join(text.split())
+
+
+def _split_after(text: str, pattern: re.Pattern[str]) -> list[str]:
+    pieces: list[str] = []
+    start = 0
+    for match in pattern.finditer(text):
+        piece = text[start : match.end()].strip()
+        if piece:
+            pieces.append(piece)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        pieces.append(tail)
+    return pieces
+
+
+def split_greek_sentences(text: str) -> list[str]:
+    """Split normalized Greek after `.`, `;` or `!` (plus any closing quotes)."""
+    return _split_after(normalize_greek(text), _SENTENCE_END)
+
+
+def _units(text: str, max_chars: int) -> list[str]:
+    units: list[str] = []
+    for sentence in split_greek_sentences(text):
+        if len(sentence) <= max_chars:
+            units.append(sentence)
+        else:
+            # A sentence longer than a chunk falls back to clause breaks; a
+            # clause that is still too long stays whole.
+            units.extend(_split_after(sentence, _CLAUSE_END))
+    return units
+
+
+def chunk_greek(text: str, *, max_chars: int, overlap: int = 1) -> list[GreekChunk]:
+    """Pack whole sentences into chunks of at most `max_chars` characters.
+
+    `overlap` is how many neighbouring units on each side are passed as
+    context. They are shown to the model but not translated again.
+    """
+    units = _units(text, max_chars)
+    groups: list[list[int]] = []
+    size = 0
+    for at, unit in enumerate(units):
+        if groups and size + 1 + len(unit) <= max_chars:
+            groups[-1].append(at)
+            size += 1 + len(unit)
+        else:
+            groups.append([at])
+            size = len(unit)
+    chunks: list[GreekChunk] = []
+    for number, group in enumerate(groups, start=1):
+        first, last = group[0], group[-1]
+        chunks.append(
+            GreekChunk(
+                number=number,
+                count=len(groups),
+                greek=" ".join(units[first : last + 1]),
+                context_before=" ".join(units[max(0, first - overlap) : first]) if overlap else "",
+                context_after=" ".join(units[last + 1 : last + 1 + overlap]) if overlap else "",
+            )
+        )
+    return chunks
+
+
+def run_chunked(
+    greek_paragraphs: Sequence[str],
+    paragraph_numbers: list[int],
+    run_chunk_fn: Callable[[int, str], dict[str, Any]],
+    *,
+    max_chars: int,
+    overlap: int = 1,
+    workers: int = 1,
+    on_paragraph_done: Callable[[dict[str, Any]], None] | None = None,
+) -> list[dict[str, Any]]:
+    """Run every chunk of the numbered paragraphs and return them in order.
+
+    `run_chunk_fn(idx, chunk_greek)` runs one chunk through a pipeline and
+    returns its paragraph result. Chunks of one paragraph run in order, because
+    each needs the previous chunk's final translation. Separate paragraphs go
+    through `run_paragraphs`, so each paragraph's Greek is read only when it
+    starts and at most `2 * workers` are in flight. `on_paragraph_done` gets
+    each chunk as soon as it finishes. A paragraph that fits in one chunk is
+    passed through unchanged and its result carries no `chunk` field.
+    """
+
+    def run_paragraph(idx: int, greek: str, emit: Callable[[Event], None]) -> dict[str, Any]:
+        chunks = chunk_greek(greek, max_chars=max_chars, overlap=overlap)
+        if len(chunks) <= 1:
+            # A paragraph that fits in one chunk runs exactly as it would
+            # unchunked: same Greek, same prompts, same checkpoint scope.
+            paragraph = run_chunk_fn(idx, greek)
+            if on_paragraph_done is not None:
+                on_paragraph_done(paragraph)
+            return {"paragraph_index": idx, "chunks": [paragraph]}
+        results: list[dict[str, Any]] = []
+        previous_translation = ""
+        for chunk in chunks:
+            set_chunk_context(
+                {
+                    "number": chunk.number,
+                    "count": chunk.count,
+                    "before": chunk.context_before,
+                    "after": chunk.context_after,
+                    "previous_translation": previous_translation,
+                }
+            )
+            update_scope(chunk=chunk.number)
+            paragraph = run_chunk_fn(idx, chunk.greek)
+            paragraph["chunk"] = {
+                "number": chunk.number,
+                "count": chunk.count,
+                "context_before": chunk.context_before,
+                "context_after": chunk.context_after,
+            }
+            previous_translation = paragraph["final_synthesis"].get("final_translation", "").strip()
+            results.append(paragraph)
+            if on_paragraph_done is not None:
+                on_paragraph_done(paragraph)
+        return {"paragraph_index": idx, "chunks": results}
+
+    grouped = run_paragraphs(
+        greek_paragraphs,
+        run_paragraph,
+        workers=workers,
+        paragraph_numbers=paragraph_numbers,
+    )
+    return [paragraph for group in grouped for paragraph in group["chunks"]]
+
+
+def stitch_translations(paragraphs: list[dict[str, Any]]) -> str:
+    """Join chunk translations with spaces and paragraphs with blank lines."""
+    joined: dict[int, list[str]] = {}
+    for paragraph in paragraphs:
+        text = paragraph["final_synthesis"].get("final_translation", "").strip()
+        joined.setdefault(paragraph["paragraph_index"], []).append(text)
+    return "\n\n".join(" ".join(part for part in parts if part) for parts in joined.values()).strip()
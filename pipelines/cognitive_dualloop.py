@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import time
 from datetime import datetime, timezone
 from typing import Any, Callable
 
@@ -13,7 +14,19 @@ from .cognitive_logging import (
     log_reference_inputs,
     make_vprint,
 )
-from .common import reference_context_block, reference_translations_for_index
+from .checkpoint import update_scope
+from .common import (
+    estimate_tokens,
+    map_parallel,
+    reference_context_block,
+    reference_translations_for_index,
+    run_paragraphs,
+)
+from .convergence import ConvergencePolicy, ConvergenceTracker
+from .events import Event
+from .feedback import FEEDBACK_SELECTION_RULE, FeedbackOrchestrator, PendingFeedback, attach_iteration_feedback
+from .ranking import RankingContext, RankingEngine, rank_iterations
+from .results import ResultSpill
 
 
 def dual_loop_translate_prompt(
@@ -95,6 +108,245 @@ Return strict JSON with exactly these keys:
     return system, user
 
 
+ANALYSIS_KEYS = ("scene_model", "claim_map", "plain_restatement", "constraint_ledger")
+
+
+def frozen_analysis(translation_result: dict[str, Any]) -> dict[str, Any]:
+    return {key: translation_result.get(key) for key in ANALYSIS_KEYS if key in translation_result}
+
+
+def dual_loop_wording_prompt(
+    greek: str,
+    paragraph_index: int,
+    reference_translations: dict[str, str],
+    user_preference: str,
+    goals_guidance: str,
+    iteration: int,
+    analysis: dict[str, Any],
+    previous_translation: str | None,
+    previous_focus: str | None,
+) -> tuple[str, str]:
+    """Wording loop only, against the meaning-loop analysis frozen at iteration 1."""
+    system = (
+        "You are a dual-loop translation agent for Ancient Greek -> modern English. "
+        "The meaning loop is already done; run the wording loop. Output JSON only."
+    )
+    refs = reference_context_block(reference_translations)
+    prev_translation_block = ""
+    if previous_translation:
+        prev_translation_block = (
+            f"\nPrevious iteration translation:\n{previous_translation}\n"
+        )
+    prev_focus_block = ""
+    if previous_focus:
+        prev_focus_block = (
+            "\nCarry-forward focus from previous iteration:\n"
+            f"- {previous_focus}\n"
+        )
+    analysis_block = json.dumps(analysis, ensure_ascii=False, separators=(",", ":"))
+
+    user = f"""
+Paragraph {paragraph_index} Greek:
+{greek}
+
+{refs}
+
+User preference prompt:
+{user_preference}
+
+Meaning-loop analysis (fixed; do not redo it):
+{analysis_block}
+
+Iteration: {iteration}
+{prev_translation_block}{prev_focus_block}
+Task (wording loop):
+1) Respect every non-negotiable in the constraint ledger; rephrase negotiables freely.
+2) Draft three variants: source-close, plain-natural, and balanced.
+3) Merge into one final paragraph for publication quality.
+4) Prioritize user preference first, then balance:
+{goals_guidance}
+5) Keep tone clear, readable, and modern while preserving rhetorical intent.
+6) Readability for younger audiences means clarity and plain syntax, not childish diction.
+7) Keep a consistent literary-prose register; avoid colloquial phrasing.
+8) If carry-forward focus is provided, use it directly in this pass.
+
+Return strict JSON with exactly these keys:
+{{
+  "drafts": {{
+    "source_close": "...",
+    "plain_natural": "...",
+    "balanced": "..."
+  }},
+  "translation": "...",
+  "next_iteration_focus": "1-3 concrete improvements for the next pass"
+}}
+""".strip()
+    return system, user
+
+
+def dual_loop_analysis_prompt(
+    greek: str,
+    paragraph_index: int,
+    reference_translations: dict[str, str],
+    user_preference: str,
+    iteration: int,
+    previous_focus: str | None,
+) -> tuple[str, str]:
+    """Meaning loop only; the drafts are written by separate calls."""
+    system = (
+        "You are the meaning loop of a dual-loop translation agent for Ancient Greek -> modern English. "
+        "Analyse the source; do not translate it yet. Output JSON only."
+    )
+    refs = reference_context_block(reference_translations)
+    prev_focus_block = (
+        f"\nCarry-forward focus from previous iteration:\n- {previous_focus}\n"
+        if previous_focus
+        else ""
+    )
+    user = f"""
+Paragraph {paragraph_index} Greek:
+{greek}
+
+{refs}
+
+User preference prompt:
+{user_preference}
+
+Iteration: {iteration}
+{prev_focus_block}
+Task (meaning loop):
+1) Build a scene model: speaker, addressee, intent, stance, tone.
+2) Decompose into atomic claims and relations (contrast, condition, modality, rhetoric).
+3) Write a plain restatement for a young reader.
+4) Build a constraint ledger:
+   - non-negotiables (must preserve),
+   - negotiables (may rephrase freely).
+
+Return strict JSON with exactly these keys:
+{{
+  "scene_model": "...",
+  "claim_map": ["...", "..."],
+  "plain_restatement": "...",
+  "constraint_ledger": {{
+    "non_negotiables": ["...", "..."],
+    "negotiables": ["...", "..."]
+  }}
+}}
+""".strip()
+    return system, user
+
+
+DRAFT_VARIANTS = {
+    "source_close": "Source-close: follow the Greek's order of ideas, imagery and emphasis as far as English allows.",
+    "plain_natural": "Plain-natural: recast freely into the clearest natural English prose.",
+    "balanced": "Balanced: keep the source's rhetorical shape where it reads well, recast where it does not.",
+}
+
+
+def dual_loop_draft_prompt(
+    greek: str,
+    paragraph_index: int,
+    reference_translations: dict[str, str],
+    user_preference: str,
+    iteration: int,
+    analysis: dict[str, Any],
+    variant: str,
+    previous_translation: str | None,
+    previous_focus: str | None,
+) -> tuple[str, str]:
+    """One wording-loop draft; the three variants run as independent calls."""
+    system = (
+        "You write one draft in the wording loop of a dual-loop translation agent "
+        "for Ancient Greek -> modern English. Output JSON only."
+    )
+    refs = reference_context_block(reference_translations)
+    prev_translation_block = (
+        f"\nPrevious iteration translation:\n{previous_translation}\n"
+        if previous_translation
+        else ""
+    )
+    prev_focus_block = (
+        f"\nCarry-forward focus from previous iteration:\n- {previous_focus}\n"
+        if previous_focus
+        else ""
+    )
+    analysis_block = json.dumps(analysis, ensure_ascii=False, separators=(",", ":"))
+    user = f"""
+Paragraph {paragraph_index} Greek:
+{greek}
+
+{refs}
+
+User preference prompt:
+{user_preference}
+
+Meaning-loop analysis (fixed; do not redo it):
+{analysis_block}
+
+Iteration: {iteration}
+{prev_translation_block}{prev_focus_block}
+Task:
+1) Write one full-paragraph draft in this style:
+   {DRAFT_VARIANTS[variant]}
+2) Respect every non-negotiable in the constraint ledger.
+3) Keep a consistent literary-prose register; avoid colloquial phrasing.
+4) If carry-forward focus is provided, use it directly in this draft.
+
+Return strict JSON with exactly these keys:
+{{
+  "draft": "..."
+}}
+""".strip()
+    return system, user
+
+
+def dual_loop_merge_prompt(
+    greek: str,
+    paragraph_index: int,
+    user_preference: str,
+    goals_guidance: str,
+    iteration: int,
+    constraint_ledger: Any,
+    drafts: dict[str, str],
+) -> tuple[str, str]:
+    """Short merge step over the three parallel drafts."""
+    system = (
+        "You merge three drafts from the wording loop of a dual-loop translation agent "
+        "into one final paragraph. Output JSON only."
+    )
+    ledger_block = json.dumps(constraint_ledger, ensure_ascii=False, separators=(",", ":"))
+    drafts_block = json.dumps(drafts, ensure_ascii=False, indent=2)
+    user = f"""
+Paragraph {paragraph_index} Greek:
+{greek}
+
+User preference prompt:
+{user_preference}
+
+Constraint ledger:
+{ledger_block}
+
+Iteration: {iteration}
+
+Drafts:
+{drafts_block}
+
+Task:
+1) Merge the drafts into one final paragraph for publication quality.
+2) Prioritize user preference first, then balance:
+{goals_guidance}
+3) Respect every non-negotiable in the constraint ledger; add no meaning.
+4) Readability for younger audiences means clarity and plain syntax, not childish diction.
+
+Return strict JSON with exactly these keys:
+{{
+  "translation": "...",
+  "next_iteration_focus": "1-3 concrete improvements for the next pass"
+}}
+""".strip()
+    return system, user
+
+
 def dual_loop_selection_prompt(
     greek: str,
     paragraph_index: int,
@@ -111,15 +363,19 @@ def dual_loop_selection_prompt(
     compact_logs: list[dict[str, Any]] = []
     for row in iteration_logs:
         tstep = row.get("translation_step", {})
-        compact_logs.append(
-            {
-                "iteration": row.get("iteration"),
-                "translation": row.get("translation", ""),
-                "plain_restatement": tstep.get("plain_restatement", ""),
-                "next_iteration_focus": tstep.get("next_iteration_focus", ""),
-            }
-        )
+        compact = {
+            "iteration": row.get("iteration"),
+            "translation": row.get("translation", ""),
+            "plain_restatement": tstep.get("plain_restatement", ""),
+            "next_iteration_focus": tstep.get("next_iteration_focus", ""),
+        }
+        if row.get("external_feedback_summary"):
+            compact["external_feedback_summary"] = row["external_feedback_summary"]
+        compact_logs.append(compact)
     payload = json.dumps(compact_logs, ensure_ascii=False, indent=2)
+    feedback_rule = ""
+    if any("external_feedback_summary" in row for row in compact_logs):
+        feedback_rule = f"\n8) {FEEDBACK_SELECTION_RULE}"
     user = f"""
 Paragraph {paragraph_index} Greek:
 {greek}
@@ -140,7 +396,7 @@ Task:
 4) Preserve meaning relations and source stance while using natural modern prose.
 5) Keep one paragraph; no added meaning.
 6) Keep wording natural, readable, and stylistically coherent for the target audience.
-7) Maintain literary prose register with clear plain syntax.
+7) Maintain literary prose register with clear plain syntax.{feedback_rule}
 
 Return strict JSON with exactly these keys:
 {{
@@ -169,18 +425,27 @@ def run_dualloop_cognitive_pipeline(
     goals_guidance: str,
     dryden_paragraphs: list[str],
     perrin_paragraphs: list[str],
+    paragraph_workers: int = 1,
+    paragraph_numbers: list[int] | None = None,
+    on_paragraph_done: Callable[[dict[str, Any]], None] | None = None,
+    result_spill: ResultSpill | None = None,
+    convergence: ConvergencePolicy | None = None,
+    selection: str = "prompt",
+    analysis_mode: str = "fresh",
+    draft_mode: str = "single",
+    feedback: FeedbackOrchestrator | None = None,
 ) -> dict[str, Any]:
-    paragraphs: list[dict[str, Any]] = []
     color_enabled = should_use_color_fn(color_mode)
     normalized_preference = normalize_user_preference_fn(user_preference)
-    vprint = make_vprint(
-        verbose=verbose,
-        color_enabled=color_enabled,
-        colorize_fn=colorize_fn,
-        stage_colors=stage_colors,
-    )
 
-    for idx, greek in enumerate(greek_paragraphs, start=1):
+    def run_paragraph(idx: int, greek: str, emit: Callable[[Event], None]) -> dict[str, Any]:
+        vprint = make_vprint(
+            verbose=verbose,
+            color_enabled=color_enabled,
+            colorize_fn=colorize_fn,
+            stage_colors=stage_colors,
+            write_fn=emit,
+        )
         reference_translations = reference_translations_for_index(
             dryden_paragraphs=dryden_paragraphs,
             perrin_paragraphs=perrin_paragraphs,
@@ -197,10 +462,67 @@ def run_dualloop_cognitive_pipeline(
         current_translation = ""
         current_focus = ""
         iteration_logs: list[dict[str, Any]] = []
+        tracker = ConvergenceTracker(convergence, iterations)
+        pending_feedback: dict[int, PendingFeedback] = {}
+
+        analysis: dict[str, Any] = {}
+        output_tokens: list[int] = []
+        translate_seconds: list[float] = []
+
+        def parallel_translate(it: int, prompt_args: dict[str, Any]) -> tuple[dict[str, Any], int]:
+            """Meaning loop (unless frozen), three concurrent drafts, then a short merge."""
+            tokens = 0
+            meaning = analysis
+            if not meaning:
+                system, user = dual_loop_analysis_prompt(
+                    greek=greek,
+                    paragraph_index=idx,
+                    reference_translations=reference_translations,
+                    user_preference=normalized_preference,
+                    iteration=it,
+                    previous_focus=prompt_args["previous_focus"],
+                )
+                update_scope(stage="analyze")
+                meaning = frozen_analysis(call_json_fn(client, model, system, user, temperature=0.45))
+                tokens += estimate_tokens(json.dumps(meaning, ensure_ascii=False))
+
+            def draft(variant: str) -> str:
+                system, user = dual_loop_draft_prompt(
+                    greek=greek,
+                    paragraph_index=idx,
+                    reference_translations=reference_translations,
+                    user_preference=normalized_preference,
+                    iteration=it,
+                    analysis=meaning,
+                    variant=variant,
+                    previous_translation=prompt_args["previous_translation"],
+                    previous_focus=prompt_args["previous_focus"],
+                )
+                update_scope(stage="draft", variant=variant)
+                return str(call_json_fn(client, model, system, user, temperature=0.45).get("draft", "")).strip()
+
+            drafts = dict(zip(DRAFT_VARIANTS, map_parallel(draft, list(DRAFT_VARIANTS))))
+            system, user = dual_loop_merge_prompt(
+                greek=greek,
+                paragraph_index=idx,
+                user_preference=normalized_preference,
+                goals_guidance=goals_guidance,
+                iteration=it,
+                constraint_ledger=meaning.get("constraint_ledger"),
+                drafts=drafts,
+            )
+            update_scope(stage="merge")
+            merged = call_json_fn(client, model, system, user, temperature=0.3)
+            tokens += estimate_tokens(json.dumps(drafts, ensure_ascii=False))
+            tokens += estimate_tokens(json.dumps(merged, ensure_ascii=False))
+            result = {**meaning, "drafts": drafts, **merged, "parallel_drafts": True}
+            if meaning is analysis:
+                result["analysis_frozen"] = True
+            return result, tokens
 
         for it in range(1, iterations + 1):
-            vprint(f"[paragraph {idx}] [iter {it}] dual-loop translate...", "iteration")
-            system, user = dual_loop_translate_prompt(
+            update_scope(iteration=it)
+            prompt_args = dict(
                 greek=greek,
                 paragraph_index=idx,
                 reference_translations=reference_translations,
@@ -210,9 +532,34 @@ def run_dualloop_cognitive_pipeline(
                 previous_translation=current_translation or None,
                 previous_focus=current_focus or None,
             )
-            translation_result = call_json_fn(client, model, system, user, temperature=0.45)
+            started = time.perf_counter()
+            if draft_mode == "parallel":
+                vprint(f"[paragraph {idx}] [iter {it}] dual-loop parallel drafts...", "iteration")
+                translation_result, tokens = parallel_translate(it, prompt_args)
+                output_tokens.append(tokens)
+                if analysis_mode == "frozen" and not analysis:
+                    analysis = frozen_analysis(translation_result)
+            elif analysis_mode == "frozen" and analysis:
+                vprint(f"[paragraph {idx}] [iter {it}] dual-loop wording (frozen analysis)...", "iteration")
+                system, user = dual_loop_wording_prompt(**prompt_args, analysis=analysis)
+                update_scope(stage="translate")
+                wording = call_json_fn(client, model, system, user, temperature=0.45)
+                output_tokens.append(estimate_tokens(json.dumps(wording, ensure_ascii=False)))
+                translation_result = {**analysis, **wording, "analysis_frozen": True}
+            else:
+                vprint(f"[paragraph {idx}] [iter {it}] dual-loop translate...", "iteration")
+                system, user = dual_loop_translate_prompt(**prompt_args)
+                update_scope(stage="translate")
+                translation_result = call_json_fn(client, model, system, user, temperature=0.45)
+                output_tokens.append(estimate_tokens(json.dumps(translation_result, ensure_ascii=False)))
+                if analysis_mode == "frozen":
+                    analysis = frozen_analysis(translation_result)
+            translate_seconds.append(round(time.perf_counter() - started, 3))
             current_translation = str(translation_result.get("translation", "")).strip()
             current_focus = str(translation_result.get("next_iteration_focus", "")).strip()
+            if feedback is not None and selection != "ranking" and current_translation:
+                # Scored while the loop goes on; the selector waits for it.
+                pending_feedback[it] = feedback.start(greek=greek, translation=current_translation)
 
             log_dualloop_iteration(
                 vprint,
@@ -235,22 +582,50 @@ def run_dualloop_cognitive_pipeline(
                     "translation": current_translation,
                 }
             )
+            stop_reason = tracker.observe(current_translation)
+            if stop_reason:
+                vprint(f"[paragraph {idx}] [iter {it}] converged: {stop_reason}", "iteration")
+                break
+
+        iterations_run = len(iteration_logs)
+        ranking_stats: dict[str, int] | None = None
+        if selection == "ranking":
+            ranking = RankingEngine(
+                lambda system, user, temperature: call_json_fn(
+                    client, model, system, user, temperature=temperature
+                ),
+                RankingContext(
+                    greek=greek,
+                    paragraph_index=idx,
+                    reference_translations=reference_translations,
+                    user_preference=normalized_preference,
+                    goals_guidance=goals_guidance,
+                ),
+            )
+            ranked = rank_iterations(ranking, iteration_logs)
+            selected_iteration = ranked["selected_iteration"]
+            final_translation = iteration_logs[ranked["winner"]]["translation"] or current_translation
+            selection_notes = ranked["rationale"] or f"ranked by {ranked['method']} comparison"
+            ranking_stats = ranking.stats()
+        else:
+            if feedback is not None:
+                attach_iteration_feedback(feedback, iteration_logs, pending_feedback)
+            system, user = dual_loop_selection_prompt(
+                greek=greek,
+                paragraph_index=idx,
+                reference_translations=reference_translations,
+                user_preference=normalized_preference,
+                goals_guidance=goals_guidance,
+                iteration_logs=iteration_logs,
+            )
+            update_scope(stage="select")
+            selection_result = call_json_fn(client, model, system, user, temperature=0.25)
 
-        system, user = dual_loop_selection_prompt(
-            greek=greek,
-            paragraph_index=idx,
-            reference_translations=reference_translations,
-            user_preference=normalized_preference,
-            goals_guidance=goals_guidance,
-            iteration_logs=iteration_logs,
-        )
-        selection_result = call_json_fn(client, model, system, user, temperature=0.25)
-
-        selected_iteration = int(selection_result.get("selected_iteration", iterations) or iterations)
-        if not (1 <= selected_iteration <= len(iteration_logs)):
-            selected_iteration = iterations
-        final_translation = str(selection_result.get("final_translation", "")).strip() or current_translation
-        selection_notes = str(selection_result.get("selection_notes", "")).strip()
+            selected_iteration = int(selection_result.get("selected_iteration", iterations_run) or iterations_run)
+            if not (1 <= selected_iteration <= iterations_run):
+                selected_iteration = iterations_run
+            final_translation = str(selection_result.get("final_translation", "")).strip() or current_translation
+            selection_notes = str(selection_result.get("selection_notes", "")).strip()
 
         log_final_selection(
             vprint,
@@ -261,21 +636,37 @@ def run_dualloop_cognitive_pipeline(
             selection_notes=selection_notes,
         )
 
-        paragraphs.append(
-            {
-                "paragraph_index": idx,
-                "greek": greek,
-                "reference_translations": reference_translations,
-                "cognitive_iterations": iteration_logs,
-                "final_agent_versions": {"cognitive_dualloop": final_translation},
-                "final_synthesis": {
-                    "final_translation": final_translation,
-                    "selection_notes": selection_notes,
-                    "selected_iteration": selected_iteration,
-                },
-            }
-        )
-
+        paragraph: dict[str, Any] = {
+            "paragraph_index": idx,
+            "greek": greek,
+            "reference_translations": reference_translations,
+            "cognitive_iterations": iteration_logs,
+            "convergence": tracker.summary(),
+            "dualloop_usage": {
+                "analysis_mode": analysis_mode,
+                "draft_mode": draft_mode,
+                "output_tokens_est": output_tokens,
+                "translate_seconds": translate_seconds,
+            },
+            "final_agent_versions": {"cognitive_dualloop": final_translation},
+            "final_synthesis": {
+                "final_translation": final_translation,
+                "selection_notes": selection_notes,
+                "selected_iteration": selected_iteration,
+            },
+        }
+        if ranking_stats is not None:
+            paragraph["ranking"] = ranking_stats
+        return paragraph
+
+    paragraphs = run_paragraphs(
+        greek_paragraphs,
+        run_paragraph,
+        workers=paragraph_workers,
+        paragraph_numbers=paragraph_numbers,
+        on_paragraph_done=on_paragraph_done,
+        result_spill=result_spill,
+    )
     full_translation = "\n\n".join(
         p["final_synthesis"].get("final_translation", "").strip() for p in paragraphs
     ).strip()
@@ -294,7 +685,7 @@ def run_dualloop_cognitive_pipeline(
                 "priority": "balanced",
             }
         ],
-        "paragraph_count": len(greek_paragraphs),
+        "paragraph_count": len(paragraphs),
         "paragraphs": paragraphs,
         "final_translation": full_translation,
     }
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import sys
 from typing import Any, Callable
 
+from .events import Event, log_event, publish
+
 
 def make_vprint(
     *,
@@ -10,12 +11,13 @@ def make_vprint(
     color_enabled: bool,
     colorize_fn: Callable[[str, str | None, bool], str],
     stage_colors: dict[str, str],
+    write_fn: Callable[[Event], None] = publish,
 ) -> Callable[[str, str | None], None]:
     def vprint(message: str, stage: str | None = None) -> None:
         if not verbose:
             return
         color = stage_colors.get(stage) if stage else None
-        print(colorize_fn(message, color, color_enabled), file=sys.stderr)
+        write_fn(log_event(message, color, color_enabled=color_enabled, colorize_fn=colorize_fn))
 
     return vprint
 
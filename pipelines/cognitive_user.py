@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
+import time
 from typing import Any, Callable
 
 from openai import OpenAI
@@ -13,7 +14,18 @@ from .cognitive_logging import (
     log_user_iteration,
     make_vprint,
 )
-from .common import reference_context_block, reference_translations_for_index
+from .checkpoint import update_scope
+from .common import (
+    map_parallel,
+    reference_context_block,
+    reference_translations_for_index,
+    run_paragraphs,
+)
+from .convergence import ConvergencePolicy, ConvergenceTracker
+from .events import Event
+from .feedback import FEEDBACK_SELECTION_RULE, FeedbackOrchestrator, PendingFeedback, attach_iteration_feedback
+from .ranking import RankingContext, RankingEngine, rank_iterations
+from .results import ResultSpill
 
 
 def phrase_cognitive_translate_prompt(
@@ -92,6 +104,145 @@ Return strict JSON with exactly these keys:
     return system, user
 
 
+def phrase_segment_prompt(greek: str, paragraph_index: int) -> tuple[str, str]:
+    system = (
+        "You segment Ancient Greek prose into translation phrases for an expert translator. "
+        "Output JSON only."
+    )
+    user = f"""
+Paragraph {paragraph_index} Greek:
+{greek}
+
+Task:
+1) Split the paragraph into consecutive phrases in source order, the units an expert
+   translator would decide one at a time (a clause, a participial phrase, a quotation).
+2) Cover the whole paragraph; do not skip or reorder any Greek.
+3) For each phrase, note in one line how it fits the sentence and paragraph logic.
+
+Return strict JSON with exactly these keys:
+{{
+  "phrases": [
+    {{
+      "source_phrase": "...",
+      "context_note": "..."
+    }}
+  ]
+}}
+""".strip()
+    return system, user
+
+
+def phrase_analysis_prompt(
+    greek: str,
+    paragraph_index: int,
+    phrase: dict[str, Any],
+    phrase_number: int,
+    phrase_count: int,
+    user_preference: str,
+    iteration: int,
+    previous_focus: str | None,
+) -> tuple[str, str]:
+    system = (
+        "You are a phrase-level translation agent for Ancient Greek -> modern English. "
+        "You decide one phrase at a time and output JSON only."
+    )
+    focus_block = f"\nCarry-forward focus from previous iteration:\n- {previous_focus}\n" if previous_focus else ""
+    user = f"""
+Paragraph {paragraph_index} Greek (for context):
+{greek}
+
+Phrase {phrase_number} of {phrase_count}:
+{phrase.get("source_phrase", "")}
+
+Context note:
+{phrase.get("context_note", "")}
+
+User preference prompt:
+{user_preference}
+
+Iteration: {iteration}
+{focus_block}
+Task:
+1) Write one very simple English anchor for this phrase (it can be rough).
+2) Name the connotations and source feel the final wording should keep.
+3) Test two or three alternative English phrasings and choose one.
+4) The chosen phrase will be joined with the others and recast into one paragraph,
+   so keep it to this phrase's meaning; clear, plain, literary prose.
+
+Return strict JSON with exactly these keys:
+{{
+  "simple_anchor": "...",
+  "connotation_targets": "...",
+  "candidate_options": ["...", "..."],
+  "chosen_phrase": "..."
+}}
+""".strip()
+    return system, user
+
+
+def phrase_compose_prompt(
+    greek: str,
+    paragraph_index: int,
+    reference_translations: dict[str, str],
+    user_preference: str,
+    goals_guidance: str,
+    iteration: int,
+    phrase_notes: list[dict[str, Any]],
+    previous_translation: str | None,
+    previous_focus: str | None,
+) -> tuple[str, str]:
+    system = (
+        "You compose phrase-level translation decisions for Ancient Greek -> modern English "
+        "into one paragraph. Output JSON only."
+    )
+    refs = reference_context_block(reference_translations)
+    chosen = "\n".join(
+        f"{number}. {note.get('source_phrase', '')} -> {note.get('chosen_phrase', '')}"
+        for number, note in enumerate(phrase_notes, start=1)
+    )
+    prev_translation_block = (
+        f"\nPrevious iteration paragraph translation:\n{previous_translation}\n"
+        if previous_translation
+        else ""
+    )
+    prev_focus_block = (
+        f"\nCarry-forward focus from previous iteration:\n- {previous_focus}\n"
+        if previous_focus
+        else ""
+    )
+    user = f"""
+Paragraph {paragraph_index} Greek:
+{greek}
+
+{refs}
+
+User preference prompt:
+{user_preference}
+
+Iteration: {iteration}
+{prev_translation_block}{prev_focus_block}
+Chosen phrases in source order:
+{chosen}
+
+Task:
+1) Zoom out to sentence and paragraph level and compose one natural English paragraph
+   from the chosen phrases, recasting syntax freely for natural English.
+2) Prioritize user preference first, then balance these goals:
+{goals_guidance}
+3) Keep meaning/relations intact; add nothing.
+4) Readability for younger audiences means clarity and plain syntax, not childish diction.
+5) Keep a consistent literary-prose register; avoid colloquial phrasing.
+
+Return strict JSON with exactly these keys:
+{{
+  "zoom_out_notes": "brief sentence/paragraph-level checks",
+  "translation": "...",
+  "next_iteration_focus": "1-3 concrete improvements for the next pass"
+}}
+""".strip()
+    return system, user
+
+
 def phrase_cognitive_selection_prompt(
     greek: str,
     paragraph_index: int,
@@ -108,15 +259,19 @@ def phrase_cognitive_selection_prompt(
     compact_logs: list[dict[str, Any]] = []
     for row in iteration_logs:
         tstep = row.get("translation_step", {})
-        compact_logs.append(
-            {
-                "iteration": row.get("iteration"),
-                "translation": row.get("translation", ""),
-                "zoom_out_notes": tstep.get("zoom_out_notes", ""),
-                "next_iteration_focus": tstep.get("next_iteration_focus", ""),
-            }
-        )
+        compact = {
+            "iteration": row.get("iteration"),
+            "translation": row.get("translation", ""),
+            "zoom_out_notes": tstep.get("zoom_out_notes", ""),
+            "next_iteration_focus": tstep.get("next_iteration_focus", ""),
+        }
+        if row.get("external_feedback_summary"):
+            compact["external_feedback_summary"] = row["external_feedback_summary"]
+        compact_logs.append(compact)
     payload = json.dumps(compact_logs, ensure_ascii=False, indent=2)
+    feedback_rule = ""
+    if any("external_feedback_summary" in row for row in compact_logs):
+        feedback_rule = f"\n8) {FEEDBACK_SELECTION_RULE}"
     user = f"""
 Paragraph {paragraph_index} Greek:
 {greek}
@@ -137,7 +292,7 @@ Task:
 4) Preserve meaning/relations and avoid source-shaped phrasing.
 5) Keep one paragraph; no added meaning.
 6) Keep wording natural, readable, and stylistically coherent for the target audience.
-7) Maintain literary prose register with clear plain syntax.
+7) Maintain literary prose register with clear plain syntax.{feedback_rule}
 
 Return strict JSON with exactly these keys:
 {{
@@ -166,18 +321,26 @@ def run_user_cognitive_pipeline(
     goals_guidance: str,
     dryden_paragraphs: list[str],
     perrin_paragraphs: list[str],
+    paragraph_workers: int = 1,
+    paragraph_numbers: list[int] | None = None,
+    on_paragraph_done: Callable[[dict[str, Any]], None] | None = None,
+    result_spill: ResultSpill | None = None,
+    convergence: ConvergencePolicy | None = None,
+    selection: str = "prompt",
+    phrase_mode: str = "single",
+    feedback: FeedbackOrchestrator | None = None,
 ) -> dict[str, Any]:
-    paragraphs: list[dict[str, Any]] = []
     color_enabled = should_use_color_fn(color_mode)
     normalized_preference = normalize_user_preference_fn(user_preference)
-    vprint = make_vprint(
-        verbose=verbose,
-        color_enabled=color_enabled,
-        colorize_fn=colorize_fn,
-        stage_colors=stage_colors,
-    )
 
-    for idx, greek in enumerate(greek_paragraphs, start=1):
+    def run_paragraph(idx: int, greek: str, emit: Callable[[Event], None]) -> dict[str, Any]:
+        vprint = make_vprint(
+            verbose=verbose,
+            color_enabled=color_enabled,
+            colorize_fn=colorize_fn,
+            stage_colors=stage_colors,
+            write_fn=emit,
+        )
         reference_translations = reference_translations_for_index(
             dryden_paragraphs=dryden_paragraphs,
             perrin_paragraphs=perrin_paragraphs,
@@ -194,22 +357,101 @@ def run_user_cognitive_pipeline(
         current_translation = ""
         current_focus = ""
         iteration_logs: list[dict[str, Any]] = []
+        tracker = ConvergenceTracker(convergence, iterations)
+        phrases: list[dict[str, Any]] = []
+        pending_feedback: dict[int, PendingFeedback] = {}
 
-        for it in range(1, iterations + 1):
-            vprint(f"[paragraph {idx}] [iter {it}] phrase-level translate...", "iteration")
-            system, user = phrase_cognitive_translate_prompt(
+        def decomposed_translate(it: int) -> dict[str, Any]:
+            # Segment once per paragraph (it depends only on the Greek), then
+            # analyse every phrase in its own small concurrent call and compose
+            # the paragraph in one short final call.
+            calls = 0
+            if not phrases:
+                update_scope(stage="segment")
+                system, user = phrase_segment_prompt(greek, idx)
+                segmented = call_json_fn(client, model, system, user, temperature=0.2)
+                calls += 1
+                raw = segmented.get("phrases", [])
+                phrases.extend(
+                    item for item in (raw if isinstance(raw, list) else [])
+                    if isinstance(item, dict) and str(item.get("source_phrase", "")).strip()
+                )
+                if not phrases:
+                    phrases.append({"source_phrase": greek, "context_note": "whole paragraph"})
+                vprint(f"[paragraph {idx}] segmented into {len(phrases)} phrases", "iteration")
+
+            def analyse(numbered: tuple[int, dict[str, Any]]) -> dict[str, Any]:
+                number, phrase = numbered
+                update_scope(stage="analyze", phrase=number)
+                system, user = phrase_analysis_prompt(
+                    greek=greek,
+                    paragraph_index=idx,
+                    phrase=phrase,
+                    phrase_number=number,
+                    phrase_count=len(phrases),
+                    user_preference=normalized_preference,
+                    iteration=it,
+                    previous_focus=current_focus or None,
+                )
+                result = call_json_fn(client, model, system, user, temperature=0.45)
+                return {
+                    "source_phrase": phrase.get("source_phrase", ""),
+                    "context_note": phrase.get("context_note", ""),
+                    "simple_anchor": result.get("simple_anchor", ""),
+                    "connotation_targets": result.get("connotation_targets", ""),
+                    "candidate_options": result.get("candidate_options", []),
+                    "chosen_phrase": result.get("chosen_phrase", ""),
+                }
+
+            notes = map_parallel(analyse, list(enumerate(phrases, start=1)))
+            calls += len(notes)
+            update_scope(stage="compose")
+            system, user = phrase_compose_prompt(
                 greek=greek,
                 paragraph_index=idx,
                 reference_translations=reference_translations,
                 user_preference=normalized_preference,
                 goals_guidance=goals_guidance,
                 iteration=it,
+                phrase_notes=notes,
                 previous_translation=current_translation or None,
                 previous_focus=current_focus or None,
             )
-            translation_result = call_json_fn(client, model, system, user, temperature=0.45)
+            composed = call_json_fn(client, model, system, user, temperature=0.45)
+            calls += 1
+            return {
+                "phrase_process_notes": notes,
+                "zoom_out_notes": composed.get("zoom_out_notes", ""),
+                "translation": composed.get("translation", ""),
+                "next_iteration_focus": composed.get("next_iteration_focus", ""),
+                "decomposition": {"phrases": len(notes), "calls": calls},
+            }
+
+        for it in range(1, iterations + 1):
+            update_scope(iteration=it)
+            vprint(f"[paragraph {idx}] [iter {it}] phrase-level translate ({phrase_mode})...", "iteration")
+            started = time.perf_counter()
+            if phrase_mode == "decomposed":
+                translation_result = decomposed_translate(it)
+            else:
+                system, user = phrase_cognitive_translate_prompt(
+                    greek=greek,
+                    paragraph_index=idx,
+                    reference_translations=reference_translations,
+                    user_preference=normalized_preference,
+                    goals_guidance=goals_guidance,
+                    iteration=it,
+                    previous_translation=current_translation or None,
+                    previous_focus=current_focus or None,
+                )
+                update_scope(stage="translate")
+                translation_result = call_json_fn(client, model, system, user, temperature=0.45)
+            translate_seconds = round(time.perf_counter() - started, 3)
             current_translation = str(translation_result.get("translation", "")).strip()
             current_focus = str(translation_result.get("next_iteration_focus", "")).strip()
+            if feedback is not None and selection != "ranking" and current_translation:
+                # Scored while the loop goes on; the selector waits for it.
+                pending_feedback[it] = feedback.start(greek=greek, translation=current_translation)
 
             log_user_iteration(
                 vprint,
@@ -230,24 +472,53 @@ def run_user_cognitive_pipeline(
                     "iteration": it,
                     "translation_step": translation_result,
                     "translation": current_translation,
+                    "translate_seconds": translate_seconds,
                 }
             )
+            stop_reason = tracker.observe(current_translation)
+            if stop_reason:
+                vprint(f"[paragraph {idx}] [iter {it}] converged: {stop_reason}", "iteration")
+                break
 
-        system, user = phrase_cognitive_selection_prompt(
-            greek=greek,
-            paragraph_index=idx,
-            reference_translations=reference_translations,
-            user_preference=normalized_preference,
-            goals_guidance=goals_guidance,
-            iteration_logs=iteration_logs,
-        )
-        selection_result = call_json_fn(client, model, system, user, temperature=0.25)
+        iterations_run = len(iteration_logs)
+        ranking_stats: dict[str, int] | None = None
+        if selection == "ranking":
+            ranking = RankingEngine(
+                lambda system, user, temperature: call_json_fn(
+                    client, model, system, user, temperature=temperature
+                ),
+                RankingContext(
+                    greek=greek,
+                    paragraph_index=idx,
+                    reference_translations=reference_translations,
+                    user_preference=normalized_preference,
+                    goals_guidance=goals_guidance,
+                ),
+            )
+            ranked = rank_iterations(ranking, iteration_logs)
+            selected_iteration = ranked["selected_iteration"]
+            final_translation = iteration_logs[ranked["winner"]]["translation"] or current_translation
+            selection_notes = ranked["rationale"] or f"ranked by {ranked['method']} comparison"
+            ranking_stats = ranking.stats()
+        else:
+            if feedback is not None:
+                attach_iteration_feedback(feedback, iteration_logs, pending_feedback)
+            system, user = phrase_cognitive_selection_prompt(
+                greek=greek,
+                paragraph_index=idx,
+                reference_translations=reference_translations,
+                user_preference=normalized_preference,
+                goals_guidance=goals_guidance,
+                iteration_logs=iteration_logs,
+            )
+            update_scope(stage="select")
+            selection_result = call_json_fn(client, model, system, user, temperature=0.25)
 
-        selected_iteration = int(selection_result.get("selected_iteration", iterations) or iterations)
-        if not (1 <= selected_iteration <= len(iteration_logs)):
-            selected_iteration = iterations
-        final_translation = str(selection_result.get("final_translation", "")).strip() or current_translation
-        selection_notes = str(selection_result.get("selection_notes", "")).strip()
+            selected_iteration = int(selection_result.get("selected_iteration", iterations_run) or iterations_run)
+            if not (1 <= selected_iteration <= iterations_run):
+                selected_iteration = iterations_run
+            final_translation = str(selection_result.get("final_translation", "")).strip() or current_translation
+            selection_notes = str(selection_result.get("selection_notes", "")).strip()
 
         log_final_selection(
             vprint,
@@ -258,21 +529,36 @@ def run_user_cognitive_pipeline(
             selection_notes=selection_notes,
         )
 
-        paragraphs.append(
-            {
-                "paragraph_index": idx,
-                "greek": greek,
-                "reference_translations": reference_translations,
-                "cognitive_iterations": iteration_logs,
-                "final_agent_versions": {"cognitive_user": final_translation},
-                "final_synthesis": {
-                    "final_translation": final_translation,
-                    "selection_notes": selection_notes,
-                    "selected_iteration": selected_iteration,
-                },
-            }
-        )
+        paragraph: dict[str, Any] = {
+            "paragraph_index": idx,
+            "greek": greek,
+            "reference_translations": reference_translations,
+            "cognitive_iterations": iteration_logs,
+            "convergence": tracker.summary(),
+            "phrase_timing": {
+                "mode": phrase_mode,
+                "translate_seconds": round(sum(row["translate_seconds"] for row in iteration_logs), 3),
+                "iterations": len(iteration_logs),
+            },
+            "final_agent_versions": {"cognitive_user": final_translation},
+            "final_synthesis": {
+                "final_translation": final_translation,
+                "selection_notes": selection_notes,
+                "selected_iteration": selected_iteration,
+            },
+        }
+        if ranking_stats is not None:
+            paragraph["ranking"] = ranking_stats
+        return paragraph
 
+    paragraphs = run_paragraphs(
+        greek_paragraphs,
+        run_paragraph,
+        workers=paragraph_workers,
+        paragraph_numbers=paragraph_numbers,
+        on_paragraph_done=on_paragraph_done,
+        result_spill=result_spill,
+    )
     full_translation = "\n\n".join(
         p["final_synthesis"].get("final_translation", "").strip() for p in paragraphs
     ).strip()
@@ -291,7 +577,7 @@ def run_user_cognitive_pipeline(
                 "priority": "balanced",
             }
         ],
-        "paragraph_count": len(greek_paragraphs),
+        "paragraph_count": len(paragraphs),
         "paragraphs": paragraphs,
         "final_translation": full_translation,
     }
@@ -1,5 +1,48 @@
 from __future__ import annotations
 
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import contextvars
+from typing import Any, Callable, TypeVar
+
+from .checkpoint import submit_in_context, update_scope
+from .events import Event, publish
+from .results import ResultSpill
+from .tracing import span
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+_CHUNK_CONTEXT: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "chunk_context",
+    default=None,
+)
+
+
+def set_chunk_context(context: dict[str, Any] | None) -> None:
+    """Mark the prompts that follow in this context as one chunk of a longer paragraph."""
+    _CHUNK_CONTEXT.set(context)
+
+
+def chunk_context_block() -> str:
+    context = _CHUNK_CONTEXT.get()
+    if not context or context["count"] <= 1:
+        return ""
+    lines = [
+        f"\n\nThe Greek above is part {context['number']} of {context['count']} of a longer paragraph. "
+        "Translate only that part; the lines below are context for continuity, not text to translate."
+    ]
+    if context.get("before"):
+        lines.append(f"- Greek just before: {context['before']}")
+    if context.get("previous_translation"):
+        lines.append(f"- Final translation of the previous part: {context['previous_translation']}")
+    if context.get("after"):
+        lines.append(f"- Greek just after: {context['after']}")
+    return "\n".join(lines)
+
 
 def reference_context_block(reference_translations: dict[str, str]) -> str:
     dryden = reference_translations.get("dryden_clough", "").strip()
@@ -8,12 +51,18 @@ def reference_context_block(reference_translations: dict[str, str]) -> str:
         "Reference translations for context:\n"
         f"- Dryden/Clough: {dryden}\n"
         f"- Perrin: {perrin}"
+        f"{chunk_context_block()}"
     )
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for cost reporting."""
+    return (len(text) + 3) // 4
+
+
 def reference_translations_for_index(
-    dryden_paragraphs: list[str],
-    perrin_paragraphs: list[str],
+    dryden_paragraphs: Sequence[str],
+    perrin_paragraphs: Sequence[str],
     paragraph_index: int,
 ) -> dict[str, str]:
     at = paragraph_index - 1
@@ -22,3 +71,102 @@ def reference_translations_for_index(
         "perrin": perrin_paragraphs[at] if at < len(perrin_paragraphs) else "",
     }
 
+
+
+@contextmanager
+def cancelling_pool(max_workers: int) -> Iterator[ThreadPoolExecutor]:
+    """A thread pool that drops its queued tasks when the body raises.
+
+    On Ctrl-C or a failed task, `with ThreadPoolExecutor()` would still run
+    every queued task before unwinding; this pool only waits for the running
+    ones.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield pool
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+
+
+def map_parallel(fn: Callable[[T], R], items: list[T]) -> list[R]:
+    """Apply fn to every item concurrently and return results in input order."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with cancelling_pool(len(items)) as pool:
+        futures = [submit_in_context(pool, fn, item) for item in items]
+        with span("parallel wait", "wait", tasks=len(items)):
+            return [future.result() for future in futures]
+
+
+def run_paragraphs(
+    greek_paragraphs: Sequence[str],
+    paragraph_fn: Callable[[int, str, Callable[[Event], None]], dict[str, Any]],
+    workers: int = 1,
+    paragraph_numbers: list[int] | None = None,
+    on_paragraph_done: Callable[[dict[str, Any]], None] | None = None,
+    result_spill: ResultSpill | None = None,
+) -> list[dict[str, Any]]:
+    """Run paragraph_fn(idx, greek, emit) for every paragraph, keeping order.
+
+    `paragraph_numbers` (1-based) restricts the run to those paragraphs while
+    keeping their original indices, so prompts and reference lookups match a
+    full run. With more than one worker, paragraphs share a pool of that
+    size. Each paragraph's events are buffered and published in paragraph
+    order, so verbose output reads the same as a one-worker run.
+
+    Each paragraph's Greek is read only when the paragraph starts. At most
+    `2 * workers` paragraphs are running or waiting for an earlier one to
+    finish, so a lazy source such as `ParagraphFile` is never read ahead.
+    `on_paragraph_done` gets each result as soon as it is ready, from the
+    worker that produced it and so not necessarily in order. With
+    `result_spill`, each result is compacted as soon as it is returned, so
+    heavy iteration logs never pile up in memory.
+    """
+    numbers = paragraph_numbers if paragraph_numbers is not None else range(1, len(greek_paragraphs) + 1)
+
+    def scoped_paragraph(idx: int, emit: Callable[[Event], None]) -> dict[str, Any]:
+        update_scope(paragraph=idx)
+        with span(f"paragraph {idx}", "paragraph", paragraph=idx):
+            paragraph = paragraph_fn(idx, greek_paragraphs[idx - 1], emit)
+        if result_spill is not None:
+            paragraph = result_spill.compact(paragraph)
+        if on_paragraph_done is not None:
+            on_paragraph_done(paragraph)
+        return paragraph
+
+    if workers <= 1 or len(numbers) <= 1:
+        return [contextvars.copy_context().run(scoped_paragraph, idx, publish) for idx in numbers]
+
+    window = 2 * workers
+    upcoming = iter(numbers)
+    flush_order: deque[int] = deque()
+    buffers: dict[int, list[Event]] = {}
+    running: dict[Future[dict[str, Any]], int] = {}
+    finished: dict[int, dict[str, Any]] = {}
+    ordered: list[dict[str, Any]] = []
+    with cancelling_pool(workers) as pool:
+
+        def start_next() -> None:
+            idx = next(upcoming, None)
+            if idx is None:
+                return
+            buffers[idx] = []
+            flush_order.append(idx)
+            running[submit_in_context(pool, scoped_paragraph, idx, buffers[idx].append)] = idx
+
+        for _ in range(window):
+            start_next()
+        while running:
+            with span("paragraph pool wait", "wait", running=len(running)):
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[running.pop(future)] = future.result()
+            while flush_order and flush_order[0] in finished:
+                idx = flush_order.popleft()
+                for event in buffers.pop(idx):
+                    publish(event)
+                ordered.append(finished.pop(idx))
+                start_next()
+    return ordered
@@ -0,0 +1,115 @@
+"""Convergence policy that lets iterative loops stop before `--iterations`."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import combinations
+import re
+from typing import Any
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+
+
+@dataclass(frozen=True)
+class ConvergencePolicy:
+    edit_threshold: float | None = None
+    patience: int | None = None
+    target_score: float | None = None
+    min_iterations: int = 1
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.edit_threshold is not None
+            or self.patience is not None
+            or self.target_score is not None
+        )
+
+
+def normalized_edit_distance(a: str, b: str) -> float:
+    """Word-level Levenshtein distance divided by the longer token count."""
+    left = _WORD.findall(a.lower())
+    right = _WORD.findall(b.lower())
+    if not left and not right:
+        return 0.0
+    if not left or not right:
+        return 1.0
+    previous = list(range(len(right) + 1))
+    for i, token in enumerate(left, start=1):
+        current = [i]
+        for j, other in enumerate(right, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (token != other),
+                )
+            )
+        previous = current
+    return previous[-1] / max(len(left), len(right))
+
+
+def mean_score(scores: Any) -> float | None:
+    if not isinstance(scores, dict):
+        return None
+    values = [float(v) for v in scores.values() if isinstance(v, (int, float))]
+    if not values:
+        return None
+    return sum(values) / len(values)
+
+
+class ConvergenceTracker:
+    """Watches one paragraph's loop and reports why it should stop, if at all.
+
+    `observe` takes either a single translation or a mapping of agent key to
+    translation (debate). For a mapping, the loop has converged when every
+    agent's version is within the edit threshold of every other agent's.
+    """
+
+    def __init__(self, policy: ConvergencePolicy | None, iterations: int) -> None:
+        self.policy = policy or ConvergencePolicy()
+        self.iterations = iterations
+        self.iterations_run = 0
+        self.stop_reason = ""
+        self._previous: str | None = None
+        self._best_score: float | None = None
+        self._stale_rounds = 0
+
+    def observe(self, translations: str | dict[str, str], score: float | None = None) -> str:
+        self.iterations_run += 1
+        policy = self.policy
+        reason = ""
+        if isinstance(translations, dict):
+            texts = [text for text in translations.values() if text]
+            if policy.edit_threshold is not None and len(texts) > 1:
+                spread = max(normalized_edit_distance(a, b) for a, b in combinations(texts, 2))
+                if spread < policy.edit_threshold:
+                    reason = f"agents_converged (max pairwise distance {spread:.3f})"
+        else:
+            if policy.edit_threshold is not None and self._previous:
+                distance = normalized_edit_distance(self._previous, translations)
+                if distance < policy.edit_threshold:
+                    reason = f"translation_stable (distance {distance:.3f})"
+            self._previous = translations
+
+        if score is not None:
+            if policy.target_score is not None and score >= policy.target_score and not reason:
+                reason = f"target_score_reached ({score:.2f})"
+            if self._best_score is None or score > self._best_score:
+                self._best_score = score
+                self._stale_rounds = 0
+            else:
+                self._stale_rounds += 1
+                if policy.patience is not None and self._stale_rounds >= policy.patience and not reason:
+                    reason = f"scores_plateaued ({self._stale_rounds} rounds without improvement)"
+
+        if self.iterations_run < policy.min_iterations or self.iterations_run >= self.iterations:
+            return ""
+        self.stop_reason = reason
+        return reason
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "iterations_run": self.iterations_run,
+            "iterations_saved": max(0, self.iterations - self.iterations_run),
+            "stop_reason": self.stop_reason,
+        }
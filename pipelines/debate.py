@@ -1,15 +1,31 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import json
-import sys
+import queue
+import random
+import threading
+import time
 from typing import Any, Callable
 
 from openai import OpenAI
 
-from .common import reference_context_block, reference_translations_for_index
+from .checkpoint import submit_in_context, update_scope
+from .common import (
+    cancelling_pool,
+    estimate_tokens,
+    reference_context_block,
+    reference_translations_for_index,
+    run_paragraphs,
+)
+from .convergence import ConvergencePolicy, ConvergenceTracker, mean_score
+from .debate_state import DEFAULT_SECTION_BUDGET, DebateState, compact_json
+from .events import Event, log_event
+from .feedback import FeedbackOrchestrator
+from .results import ResultSpill
+from .tracing import span
 
 
 @dataclass(frozen=True)
@@ -19,11 +35,67 @@ class Agent:
     priority: str
 
 
-AGENTS = [
+AGENT_POOL = [
     Agent("faithful", "Faithfulness-First", "faithfulness"),
     Agent("readable", "Readability-First", "readability"),
     Agent("modern", "Modernity-First", "modernity"),
+    Agent("imagery", "Imagery-First", "keeping the source's concrete imagery vivid"),
+    Agent("argument", "Argument-First", "preserving the author's line of argument and contrasts"),
+    Agent("concise", "Concision-First", "concision without dropping meaning"),
+    Agent("audience", "Audience-First", "fit to the user preference and its target audience"),
+    Agent("cadence", "Cadence-First", "sentence rhythm and flow when read aloud"),
 ]
+AGENTS = AGENT_POOL[:3]
+CRITIC = Agent("critic", "Dedicated Critic", "even-handed assessment of every translation")
+TOPOLOGIES = ("all_to_all", "ring", "random_k", "critic")
+
+
+def select_agents(quorum_size: int) -> list[Agent]:
+    """First `quorum_size` agents of the pool; past its end, priorities repeat under numbered keys."""
+    agents: list[Agent] = []
+    for at in range(quorum_size):
+        base = AGENT_POOL[at % len(AGENT_POOL)]
+        copy = at // len(AGENT_POOL) + 1
+        if copy == 1:
+            agents.append(base)
+        else:
+            agents.append(Agent(f"{base.key}_{copy}", f"{base.name} ({copy})", base.priority))
+    return agents
+
+
+def critique_assignments(
+    agents: list[Agent],
+    topology: str,
+    *,
+    peers: int = 2,
+    rng: random.Random | None = None,
+) -> dict[str, list[str]]:
+    """Map each reviewer's key to the agent keys whose translations it critiques.
+
+    Critique calls per round are N for every topology except `critic` (one
+    call), but prompt size per call is N translations for `all_to_all`, one
+    for `ring` and `peers` for `random_k`.
+    """
+    keys = [agent.key for agent in agents]
+    n = len(keys)
+    if topology == "all_to_all":
+        return {key: list(keys) for key in keys}
+    if topology == "critic":
+        return {CRITIC.key: list(keys)}
+    if n == 1:
+        return {keys[0]: list(keys)}
+    if topology == "ring":
+        return {keys[i]: [keys[(i + 1) % n]] for i in range(n)}
+    if topology == "random_k":
+        # Shared random offsets keep the load even: every translation gets
+        # exactly `peers` critiques and nobody reviews their own.
+        offsets = (rng or random.Random()).sample(range(1, n), min(max(1, peers), n - 1))
+        return {keys[i]: [keys[(i + offset) % n] for offset in offsets] for i in range(n)}
+    raise ValueError(f"Unsupported critique topology: {topology}")
+
+
+def new_usage() -> dict[str, int]:
+    return {"calls": 0, "prompt_tokens_est": 0, "completion_tokens_est": 0}
 
 
 def run_agent_tasks_parallel(
@@ -33,11 +105,12 @@ def run_agent_tasks_parallel(
     if not agents:
         return {}
     results: dict[str, dict[str, Any]] = {}
-    with ThreadPoolExecutor(max_workers=len(agents)) as pool:
-        future_to_agent = {pool.submit(task_fn, agent): agent for agent in agents}
-        for future in as_completed(future_to_agent):
-            agent = future_to_agent[future]
-            results[agent.key] = future.result()
+    with cancelling_pool(len(agents)) as pool:
+        future_to_agent = {submit_in_context(pool, task_fn, agent): agent for agent in agents}
+        with span("agent pool wait", "wait", agents=len(agents)):
+            for future in as_completed(future_to_agent):
+                agent = future_to_agent[future]
+                results[agent.key] = future.result()
     return results
 
 
@@ -110,6 +183,7 @@ def debate_prompt(
         "Critique rigorously but constructively. Output JSON only."
     )
     payload = json.dumps(translations, ensure_ascii=False, indent=2)
+    target_keys = "|".join(translations)
     refs = reference_context_block(reference_translations)
     user = f"""
 Paragraph {paragraph_index} Greek:
@@ -120,13 +194,13 @@ Paragraph {paragraph_index} Greek:
 User preference prompt:
 {user_preference}
 
-Current translations by agent:
+Translations to critique, by agent:
 {payload}
 
 Debate iteration: {iteration}
 Your personal priority: {agent.priority}
 
-Assess every translation (including your own) using these goal definitions:
+Assess every translation above (including your own, if listed) using these goal definitions:
 {goals_guidance}
 Also assess how well each translation follows the user preference prompt.
 
@@ -135,7 +209,7 @@ Return strict JSON with exactly these keys:
   "round_summary": "summary of strongest arguments",
   "critiques": [
     {{
-      "agent": "faithful|readable|modern",
+      "agent": "{target_keys}",
       "strengths": "...",
       "concerns": "...",
       "scores": {{
@@ -162,13 +236,18 @@ def revision_prompt(
     reference_translations: dict[str, str],
     user_preference: str,
     goals_guidance: str,
+    compact: bool = False,
 ) -> tuple[str, str]:
     system = (
         "You are revising your translation after debate. "
         "Preserve meaning while improving according to your priority. Output JSON only."
     )
-    translations_json = json.dumps(current_translations, ensure_ascii=False, indent=2)
-    debates_json = json.dumps(debate_round, ensure_ascii=False, indent=2)
+    if compact:
+        translations_json = compact_json(current_translations)
+        debates_json = compact_json(debate_round)
+    else:
+        translations_json = json.dumps(current_translations, ensure_ascii=False, indent=2)
+        debates_json = json.dumps(debate_round, ensure_ascii=False, indent=2)
     refs = reference_context_block(reference_translations)
     user = f"""
 Paragraph {paragraph_index} Greek:
@@ -185,7 +264,7 @@ Your previous translation:
 Current translations:
 {translations_json}
 
-Debate outputs this round:
+Debate feedback on your translation this round:
 {debates_json}
 
 Debate iteration: {iteration}
@@ -221,6 +300,8 @@ def final_synthesis_prompt(
     reference_translations: dict[str, str],
     user_preference: str,
     goals_guidance: str,
+    compact: bool = False,
+    automatic_feedback: dict[str, str] | None = None,
 ) -> tuple[str, str]:
     system = (
         "You are the final synthesis agent. "
@@ -231,9 +312,21 @@ def final_synthesis_prompt(
         "final_translations": final_translations,
         "agent_summaries": agent_summaries,
         "debate_summaries": debate_summaries,
-        "reference_translations": reference_translations,
-        "user_preference": user_preference,
     }
+    feedback_task = ""
+    if automatic_feedback:
+        payload["automatic_feedback"] = automatic_feedback
+        feedback_task = (
+            "\n- Treat automatic_feedback (keyed by agent) as a secondary signal; "
+            "never let it override faithfulness or source logic."
+        )
+    if compact:
+        # References and preference already appear verbatim above the JSON.
+        quorum_json = compact_json(payload)
+    else:
+        payload["reference_translations"] = reference_translations
+        payload["user_preference"] = user_preference
+        quorum_json = json.dumps(payload, ensure_ascii=False, indent=2)
     refs = reference_context_block(reference_translations)
     user = f"""
 Greek paragraph:
@@ -245,7 +338,7 @@ User preference prompt (highest priority):
 {user_preference}
 
 Quorum context (JSON):
-{json.dumps(payload, ensure_ascii=False, indent=2)}
+{quorum_json}
 
 Task:
 - Produce one final translation for this paragraph.
@@ -256,7 +349,7 @@ Task:
 - Resolve disagreements using the debate summaries.
 - Translate by meaning, not by Greek word order; recast syntax when needed so the English reads naturally.
 - Before finalizing, explore multiple plausible phrasings and choose the clearest natural wording that still preserves meaning.
-- Keep the tone clear and dignified: simple modern English without cutesy wording, slang, or cartoonish substitutions.
+- Keep the tone clear and dignified: simple modern English without cutesy wording, slang, or cartoonish substitutions.{feedback_task}
 
 Return strict JSON with exactly these keys:
 {{
@@ -290,24 +383,41 @@ def run_debate_pipeline(
     goals_guidance: str,
     dryden_paragraphs: list[str],
     perrin_paragraphs: list[str],
+    paragraph_workers: int = 1,
+    paragraph_numbers: list[int] | None = None,
+    on_paragraph_done: Callable[[dict[str, Any]], None] | None = None,
+    result_spill: ResultSpill | None = None,
+    convergence: ConvergencePolicy | None = None,
+    quorum_size: int = len(AGENTS),
+    topology: str = "all_to_all",
+    critique_peers: int = 2,
+    debate_state: str = "full",
+    state_budget: int = DEFAULT_SECTION_BUDGET,
+    debate_schedule: str = "rounds",
+    feedback: FeedbackOrchestrator | None = None,
 ) -> dict[str, Any]:
-    paragraphs: list[dict[str, Any]] = []
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unsupported critique topology: {topology}")
     color_enabled = should_use_color_fn(color_mode)
     normalized_preference = normalize_user_preference_fn(user_preference)
-
-    def vprint(
-        message: str,
-        agent_key: str | None = None,
-        stage: str | None = None,
-    ) -> None:
-        if not verbose:
-            return
-        color: str | None = None
-        if agent_key:
-            color = agent_colors.get(agent_key)
-        elif stage:
-            color = stage_colors.get(stage)
-        print(colorize_fn(message, color, color_enabled), file=sys.stderr)
+    agents = select_agents(quorum_size)
+
+    def make_paragraph_vprint(emit: Callable[[Event], None]) -> Callable[..., None]:
+        def vprint(
+            message: str,
+            agent_key: str | None = None,
+            stage: str | None = None,
+        ) -> None:
+            if not verbose:
+                return
+            color: str | None = None
+            if agent_key:
+                color = agent_colors.get(agent_key) or agent_colors.get(agent_key.split("_")[0])
+            elif stage:
+                color = stage_colors.get(stage)
+            emit(log_event(message, color, color_enabled=color_enabled, colorize_fn=colorize_fn))
+
+        return vprint
 
     def score_line(scores: Any) -> str:
         if not isinstance(scores, dict):
@@ -317,7 +427,8 @@ def run_debate_pipeline(
         m = scores.get("modernity", "n/a")
         return f"faithfulness={f}, readability={r}, modernity={m}"
 
-    for idx, greek in enumerate(greek_paragraphs, start=1):
+    def run_paragraph(idx: int, greek: str, emit: Callable[[Event], None]) -> dict[str, Any]:
+        vprint = make_paragraph_vprint(emit)
         vprint(f"[paragraph {idx}] initial translations...", stage="iteration")
         vprint(
             f"[paragraph {idx}] user preference prompt: {normalized_preference}",
@@ -343,6 +454,26 @@ def run_debate_pipeline(
 
         current: dict[str, str] = {}
         agent_logs: dict[str, Any] = {}
+        critic_log: list[dict[str, Any]] = []
+        usage_lock = threading.Lock()
+
+        def metered_call(
+            usage: dict[str, int],
+            system: str,
+            user: str,
+            temperature: float,
+        ) -> dict[str, Any]:
+            result = call_json_fn(client, model, system, user, temperature=temperature)
+            with usage_lock:
+                usage["calls"] += 1
+                usage["prompt_tokens_est"] += estimate_tokens(system) + estimate_tokens(user)
+                usage["completion_tokens_est"] += estimate_tokens(
+                    json.dumps(result, ensure_ascii=False)
+                )
+            return result
+
+        initial_usage = new_usage()
+        state = DebateState(section_budget=state_budget) if debate_state == "compact" else None
 
         def initial_task(agent: Agent) -> dict[str, Any]:
             system, user = initial_translation_prompt(
@@ -353,10 +484,11 @@ def run_debate_pipeline(
                 normalized_preference,
                 goals_guidance,
             )
-            return call_json_fn(client, model, system, user, temperature=0.45)
+            update_scope(stage="translate", agent=agent.key)
+            return metered_call(initial_usage, system, user, 0.45)
 
-        initial_results = run_agent_tasks_parallel(AGENTS, initial_task)
-        for agent in AGENTS:
+        initial_results = run_agent_tasks_parallel(agents, initial_task)
+        for agent in agents:
             result = initial_results[agent.key]
             current[agent.key] = str(result.get("translation", "")).strip()
             observations = str(result.get("observations", "")).strip()
@@ -379,113 +511,413 @@ def run_debate_pipeline(
             )
 
         debate_round_summaries: list[dict[str, Any]] = []
-
-        for it in range(1, iterations + 1):
-            vprint(f"[paragraph {idx}] debate iteration {it}...", stage="iteration")
-
-            def debate_task(agent: Agent) -> dict[str, Any]:
-                system, user = debate_prompt(
-                    agent,
-                    greek,
-                    idx,
-                    current,
-                    it,
-                    reference_translations,
-                    normalized_preference,
-                    goals_guidance,
+        tracker = ConvergenceTracker(convergence, iterations)
+        reviewers = [CRITIC] if topology == "critic" else agents
+        rounds: dict[int, dict[str, Any]] = {}
+
+        def round_record(it: int) -> dict[str, Any]:
+            if it not in rounds:
+                assignments = critique_assignments(
+                    agents,
+                    topology,
+                    peers=critique_peers,
+                    rng=random.Random(f"{idx}:{it}"),
                 )
-                return call_json_fn(client, model, system, user, temperature=0.35)
+                waiting = {agent.key: 0 for agent in agents}
+                for targets in assignments.values():
+                    for target in targets:
+                        waiting[target] += 1
+                rounds[it] = {
+                    "assignments": assignments,
+                    "waiting": waiting,
+                    "debates": {},
+                    "critiques_for": {agent.key: [] for agent in agents},
+                    "revisions": {},
+                    "critique_usage": new_usage(),
+                    "revision_usage": new_usage(),
+                    "prompt_size": {"full_tokens_est": 0, "compact_tokens_est": 0},
+                }
+            return rounds[it]
 
-            round_debates = run_agent_tasks_parallel(AGENTS, debate_task)
-            for agent in AGENTS:
-                debate = round_debates[agent.key]
+        def critique_task(agent: Agent, it: int, targets: dict[str, str]) -> dict[str, Any]:
+            system, user = debate_prompt(
+                agent,
+                greek,
+                idx,
+                targets,
+                it,
+                reference_translations,
+                normalized_preference,
+                goals_guidance,
+            )
+            update_scope(iteration=it, stage="debate", agent=agent.key)
+            return metered_call(round_record(it)["critique_usage"], system, user, 0.35)
+
+        def absorb_critique(
+            agent: Agent,
+            it: int,
+            debate: dict[str, Any],
+            target_versions: dict[str, int] | None = None,
+        ) -> None:
+            record = round_record(it)
+            record["debates"][agent.key] = debate
+            if agent.key in agent_logs:
                 agent_logs[agent.key]["debates"].append(debate)
-                vprint(
-                    f"[paragraph {idx}] [iter {it}] [{agent.key}] debate summary: "
-                    f"{debate.get('round_summary', '')}",
-                    agent_key=agent.key,
-                )
-                vprint(
-                    f"[paragraph {idx}] [iter {it}] [{agent.key}] revision plan: "
-                    f"{debate.get('self_revision_plan', '')}",
-                    agent_key=agent.key,
-                )
-                critiques = debate.get("critiques", [])
-                if isinstance(critiques, list):
-                    for critique in critiques:
-                        if not isinstance(critique, dict):
-                            continue
-                        target = critique.get("agent", "unknown")
-                        strengths = critique.get("strengths", "")
-                        concerns = critique.get("concerns", "")
-                        scores = score_line(critique.get("scores"))
-                        vprint(
-                            f"[paragraph {idx}] [iter {it}] [{agent.key}] critique of [{target}] "
-                            f"scores: {scores}",
-                            agent_key=agent.key,
-                        )
-                        vprint(
-                            f"[paragraph {idx}] [iter {it}] [{agent.key}] critique strengths: {strengths}",
-                            agent_key=agent.key,
-                        )
-                        vprint(
-                            f"[paragraph {idx}] [iter {it}] [{agent.key}] critique concerns: {concerns}",
-                            agent_key=agent.key,
-                        )
-
-            revised: dict[str, str] = {}
-
-            def revision_task(agent: Agent) -> dict[str, Any]:
-                system, user = revision_prompt(
-                    agent=agent,
-                    greek=greek,
-                    paragraph_index=idx,
-                    current_translations=current,
-                    debate_round=round_debates,
-                    own_previous=current[agent.key],
-                    iteration=it,
-                    reference_translations=reference_translations,
-                    user_preference=normalized_preference,
-                    goals_guidance=goals_guidance,
+            else:
+                critic_log.append({"iteration": it, **debate})
+            vprint(
+                f"[paragraph {idx}] [iter {it}] [{agent.key}] debate summary: "
+                f"{debate.get('round_summary', '')}",
+                agent_key=agent.key,
+            )
+            vprint(
+                f"[paragraph {idx}] [iter {it}] [{agent.key}] revision plan: "
+                f"{debate.get('self_revision_plan', '')}",
+                agent_key=agent.key,
+            )
+            received: dict[str, list[dict[str, Any]]] = {}
+            critiques = debate.get("critiques", [])
+            if isinstance(critiques, list):
+                for critique in critiques:
+                    if not isinstance(critique, dict):
+                        continue
+                    target = critique.get("agent", "unknown")
+                    strengths = critique.get("strengths", "")
+                    concerns = critique.get("concerns", "")
+                    scores = score_line(critique.get("scores"))
+                    if target in record["assignments"][agent.key]:
+                        entry = {
+                            "from": agent.key,
+                            "strengths": strengths,
+                            "concerns": concerns,
+                            "scores": critique.get("scores", {}),
+                        }
+                        if target_versions is not None:
+                            entry["target_version"] = target_versions.get(target)
+                        record["critiques_for"][target].append(entry)
+                        received.setdefault(target, []).append(entry)
+                    vprint(
+                        f"[paragraph {idx}] [iter {it}] [{agent.key}] critique of [{target}] "
+                        f"scores: {scores}",
+                        agent_key=agent.key,
+                    )
+                    vprint(
+                        f"[paragraph {idx}] [iter {it}] [{agent.key}] critique strengths: {strengths}",
+                        agent_key=agent.key,
+                    )
+                    vprint(
+                        f"[paragraph {idx}] [iter {it}] [{agent.key}] critique concerns: {concerns}",
+                        agent_key=agent.key,
+                    )
+            if state is not None:
+                state.record_round(
+                    received,
+                    {agent.key: str(debate.get("round_summary", ""))},
+                    {agent.key: str(debate.get("self_revision_plan", ""))},
                 )
-                return call_json_fn(client, model, system, user, temperature=0.45)
 
-            revision_results = run_agent_tasks_parallel(AGENTS, revision_task)
-            for agent in AGENTS:
-                revision = revision_results[agent.key]
-                revised[agent.key] = str(revision.get("translation", "")).strip()
-                agent_logs[agent.key]["revisions"].append(revision)
+        def revision_task(
+            agent: Agent,
+            it: int,
+            translations: dict[str, str],
+            view: dict[str, Any] | None = None,
+        ) -> dict[str, Any]:
+            # Only this agent's own critiques and the translations it reviewed
+            # go into the prompt, so revision prompts stay O(peers), not O(N).
+            record = round_record(it)
+            own_debate = record["debates"].get(agent.key, {})
+            seen = [agent.key] + [
+                key for key in record["assignments"].get(agent.key, []) if key != agent.key
+            ]
+            prompt_args = dict(
+                agent=agent,
+                greek=greek,
+                paragraph_index=idx,
+                current_translations={key: translations[key] for key in seen},
+                debate_round={
+                    "critiques_of_your_translation": record["critiques_for"][agent.key],
+                    "your_revision_plan": own_debate.get("self_revision_plan", ""),
+                },
+                own_previous=translations[agent.key],
+                iteration=it,
+                reference_translations=reference_translations,
+                user_preference=normalized_preference,
+                goals_guidance=goals_guidance,
+            )
+            system, user = revision_prompt(**prompt_args)
+            if state is not None:
+                full_tokens = estimate_tokens(system) + estimate_tokens(user)
+                # `view` is taken on the scheduling thread, which keeps
+                # updating the state while this call runs.
+                prompt_args["debate_round"] = view
+                system, user = revision_prompt(**prompt_args, compact=True)
+                with usage_lock:
+                    record["prompt_size"]["full_tokens_est"] += full_tokens
+                    record["prompt_size"]["compact_tokens_est"] += (
+                        estimate_tokens(system) + estimate_tokens(user)
+                    )
+            update_scope(iteration=it, stage="revise", agent=agent.key)
+            return metered_call(record["revision_usage"], system, user, 0.45)
+
+        def revision_view(agent: Agent) -> dict[str, Any] | None:
+            return state.revision_view(agent.key) if state is not None else None
+
+        def absorb_revision(agent: Agent, it: int, revision: dict[str, Any]) -> None:
+            round_record(it)["revisions"][agent.key] = revision
+            current[agent.key] = str(revision.get("translation", "")).strip()
+            agent_logs[agent.key]["revisions"].append(revision)
+            vprint(
+                f"[paragraph {idx}] [iter {it}] [{agent.key}] revised translation:",
+                agent_key=agent.key,
+            )
+            vprint(current[agent.key], agent_key=agent.key)
+            vprint(
+                f"[paragraph {idx}] [iter {it}] [{agent.key}] change summary: "
+                f"{revision.get('change_summary', '')}",
+                agent_key=agent.key,
+            )
+            vprint(
+                f"[paragraph {idx}] [iter {it}] [{agent.key}] revised scores: "
+                f"{score_line(revision.get('self_scores'))}",
+                agent_key=agent.key,
+            )
+            if state is not None:
+                state.record_revisions({agent.key: str(revision.get("change_summary", ""))})
+
+        def close_round(it: int) -> str:
+            """Summarize a round once every agent has revised; returns a stop reason."""
+            record = round_record(it)
+            critique_usage = record["critique_usage"]
+            revision_usage = record["revision_usage"]
+            prompt_size = record["prompt_size"]
+            if state is not None:
                 vprint(
-                    f"[paragraph {idx}] [iter {it}] [{agent.key}] revised translation:",
-                    agent_key=agent.key,
+                    f"[paragraph {idx}] [iter {it}] compact revision prompts: "
+                    f"~{prompt_size['compact_tokens_est']} tokens vs ~{prompt_size['full_tokens_est']} full",
+                    stage="iteration",
                 )
-                vprint(revised[agent.key], agent_key=agent.key)
-                vprint(
-                    f"[paragraph {idx}] [iter {it}] [{agent.key}] change summary: "
-                    f"{revision.get('change_summary', '')}",
-                    agent_key=agent.key,
+            vprint(
+                f"[paragraph {idx}] [iter {it}] round cost: "
+                f"{critique_usage['calls'] + revision_usage['calls']} calls, "
+                f"~{critique_usage['prompt_tokens_est'] + revision_usage['prompt_tokens_est']} prompt tokens",
+                stage="iteration",
+            )
+            round_summary: dict[str, Any] = {
+                "iteration": it,
+                "summaries": {
+                    agent_key: debate.get("round_summary", "")
+                    for agent_key, debate in record["debates"].items()
+                },
+                "critique_assignments": record["assignments"],
+                "usage": {"critique": critique_usage, "revision": revision_usage},
+            }
+            if state is not None:
+                round_summary["prompt_size"] = prompt_size
+            debate_round_summaries.append(round_summary)
+            revision_scores = [
+                mean_score(record["revisions"][agent.key].get("self_scores")) for agent in agents
+            ]
+            known_scores = [score for score in revision_scores if score is not None]
+            # This round's own versions: under barrier_free, `current` may
+            # already hold later rounds' revisions from faster agents.
+            round_versions = {
+                agent.key: str(record["revisions"][agent.key].get("translation", "")).strip() for agent in agents
+            }
+            stop_reason = tracker.observe(
+                round_versions,
+                sum(known_scores) / len(known_scores) if known_scores else None,
+            )
+            if stop_reason:
+                vprint(f"[paragraph {idx}] [iter {it}] converged: {stop_reason}", stage="iteration")
+            return stop_reason
+
+        def run_rounds() -> None:
+            for it in range(1, iterations + 1):
+                vprint(f"[paragraph {idx}] debate iteration {it}...", stage="iteration")
+                assignments = round_record(it)["assignments"]
+                snapshot = dict(current)
+                round_debates = run_agent_tasks_parallel(
+                    reviewers,
+                    lambda agent: critique_task(
+                        agent, it, {key: snapshot[key] for key in assignments[agent.key]}
+                    ),
                 )
-                vprint(
-                    f"[paragraph {idx}] [iter {it}] [{agent.key}] revised scores: "
-                    f"{score_line(revision.get('self_scores'))}",
-                    agent_key=agent.key,
+                for agent in reviewers:
+                    absorb_critique(agent, it, round_debates[agent.key])
+                snapshot = dict(current)
+                views = {agent.key: revision_view(agent) for agent in agents}
+                revision_results = run_agent_tasks_parallel(
+                    agents,
+                    lambda agent: revision_task(agent, it, snapshot, views[agent.key]),
                 )
-
-            debate_round_summaries.append(
-                {
-                    "iteration": it,
-                    "summaries": {
-                        agent_key: round_debates[agent_key].get("round_summary", "")
-                        for agent_key in round_debates
-                    },
-                }
-            )
-            current = revised
+                for agent in agents:
+                    absorb_revision(agent, it, revision_results[agent.key])
+                if close_round(it):
+                    break
+
+        def run_barrier_free() -> None:
+            # Event loop over completed calls: an agent revises as soon as every
+            # critique aimed at it this round and its own critique for the
+            # round are in, and its previous revision has landed; it reviews
+            # for its next round as soon as it has revised. Critiques target
+            # whatever version is current when they start, recorded as
+            # `target_version`.
+            versions = {agent.key: 0 for agent in agents}
+            reviewer_keys = {reviewer.key for reviewer in reviewers}
+            # Rounds whose critiques are all in but whose revision waits for
+            # the agent's previous round, so versions only move forward.
+            held: dict[str, set[int]] = {agent.key: set() for agent in agents}
+            finished: dict[int, set[str]] = {}
+            events: queue.Queue[tuple[str, Agent, int, Any, float, Future[dict[str, Any]]]] = queue.Queue()
+            in_flight: set[Future[dict[str, Any]]] = set()
+            outstanding = 0
+            stopped = False
+            stop_round = 0
+
+            with cancelling_pool(max(2, 2 * len(agents))) as pool:
+
+                def launch(
+                    kind: str,
+                    agent: Agent,
+                    it: int,
+                    meta: Any,
+                    fn: Callable[..., dict[str, Any]],
+                    *args: Any,
+                ) -> None:
+                    nonlocal outstanding
+                    outstanding += 1
+                    started = time.perf_counter() - started_at
+                    future = submit_in_context(pool, fn, *args)
+                    in_flight.add(future)
+                    future.add_done_callback(
+                        lambda done: events.put((kind, agent, it, meta, started, done))
+                    )
+
+                def start_critique(agent: Agent, it: int) -> None:
+                    targets = round_record(it)["assignments"][agent.key]
+                    launch(
+                        "critique",
+                        agent,
+                        it,
+                        {key: versions[key] for key in targets},
+                        critique_task,
+                        agent,
+                        it,
+                        {key: current[key] for key in targets},
+                    )
+
+                def start_revision(agent: Agent, it: int) -> None:
+                    launch(
+                        "revision",
+                        agent,
+                        it,
+                        versions[agent.key],
+                        revision_task,
+                        agent,
+                        it,
+                        dict(current),
+                        revision_view(agent),
+                    )
+
+                def revise_when_ready(key: str, it: int) -> None:
+                    # The revision prompt carries the agent's own revision plan
+                    # for the round, so it must not start before that lands.
+                    record = round_record(it)
+                    if stopped or record["waiting"][key]:
+                        return
+                    if key in reviewer_keys and key not in record["debates"]:
+                        return
+                    if versions[key] == it - 1:
+                        start_revision(agents_by_key[key], it)
+                    else:
+                        held[key].add(it)
+
+                def stop_at(it: int) -> None:
+                    # Later rounds' calls are cancelled or dropped, and every
+                    # agent goes back to its version from the converged round.
+                    nonlocal stopped, stop_round
+                    stopped, stop_round = True, it
+                    for future in in_flight:
+                        future.cancel()
+                    for agent in agents:
+                        revision = round_record(it)["revisions"][agent.key]
+                        current[agent.key] = str(revision.get("translation", "")).strip()
+                        agent_logs[agent.key]["revisions"] = agent_logs[agent.key]["revisions"][:it]
+                        agent_logs[agent.key]["debates"] = agent_logs[agent.key]["debates"][:it]
+                    critic_log[:] = [entry for entry in critic_log if entry["iteration"] <= it]
+
+                for agent in reviewers:
+                    start_critique(agent, 1)
+                while outstanding:
+                    kind, agent, it, meta, started, future = events.get()
+                    outstanding -= 1
+                    in_flight.discard(future)
+                    if future.cancelled():
+                        continue
+                    result = future.result()
+                    exchange: dict[str, Any] = {
+                        "kind": kind,
+                        "agent": agent.key,
+                        "round": it,
+                        "started_s": round(started, 3),
+                        "finished_s": round(time.perf_counter() - started_at, 3),
+                    }
+                    if kind == "critique":
+                        exchange["target_versions"] = meta
+                    else:
+                        exchange["from_version"] = meta
+                        exchange["to_version"] = it
+                    exchanges.append(exchange)
+                    if stopped and it > stop_round:
+                        # Landed after the debate converged: logged, not used.
+                        exchange["dropped"] = True
+                        continue
+                    if kind == "critique":
+                        absorb_critique(agent, it, result, target_versions=meta)
+                        record = round_record(it)
+                        targets = record["assignments"][agent.key]
+                        for target in targets:
+                            record["waiting"][target] -= 1
+                        for key in dict.fromkeys([*targets, agent.key]):
+                            if key in agents_by_key:
+                                revise_when_ready(key, it)
+                        continue
+                    absorb_revision(agent, it, result)
+                    versions[agent.key] = it
+                    finished.setdefault(it, set()).add(agent.key)
+                    round_done = len(finished[it]) == len(agents)
+                    if round_done and close_round(it):
+                        stop_at(it)
+                    if stopped or it >= iterations:
+                        continue
+                    if it + 1 in held[agent.key]:
+                        held[agent.key].discard(it + 1)
+                        start_revision(agent, it + 1)
+                    if topology != "critic":
+                        start_critique(agent, it + 1)
+                    elif round_done:
+                        start_critique(CRITIC, it + 1)
+
+        agents_by_key = {agent.key: agent for agent in agents}
+        exchanges: list[dict[str, Any]] = []
+        started_at = time.perf_counter()
+        if debate_schedule == "barrier_free":
+            run_barrier_free()
+        else:
+            run_rounds()
+        debate_timing = {
+            "schedule": debate_schedule,
+            "wall_seconds": round(time.perf_counter() - started_at, 3),
+        }
+        vprint(
+            f"[paragraph {idx}] debate wall time ({debate_schedule}): {debate_timing['wall_seconds']}s",
+            stage="iteration",
+        )
 
         vprint(f"[paragraph {idx}] final synthesis...", stage="final")
 
         agent_summaries: dict[str, Any] = {}
-        for agent in AGENTS:
+        for agent in agents:
             key = agent.key
             agent_summaries[key] = {
                 "priority": agent.priority,
@@ -498,19 +930,42 @@ def run_debate_pipeline(
                 ],
             }
 
-        system, user = final_synthesis_prompt(
+        feedback_reports: dict[str, dict[str, Any]] = {}
+        if feedback is not None:
+            feedback_reports = feedback.collect_many(greek=greek, translations=current)
+        synthesis_args = dict(
             greek=greek,
             paragraph_index=idx,
             final_translations=current,
             agent_summaries=agent_summaries,
-            debate_summaries=debate_round_summaries,
+            # Assignments, usage and prompt sizes stay on the paragraph record
+            # for the report; the synthesizer only needs what was said.
+            debate_summaries=[
+                {"iteration": summary["iteration"], "summaries": summary["summaries"]}
+                for summary in debate_round_summaries
+            ],
             reference_translations=reference_translations,
             user_preference=normalized_preference,
             goals_guidance=goals_guidance,
+            automatic_feedback={key: report["summary"] for key, report in feedback_reports.items() if report["summary"]},
         )
-        final_result = call_json_fn(client, model, system, user, temperature=0.4)
+        system, user = final_synthesis_prompt(**synthesis_args)
+        synthesis_size: dict[str, int] | None = None
+        if state is not None:
+            full_tokens = estimate_tokens(system) + estimate_tokens(user)
+            view = state.synthesis_view({agent.key: agent.priority for agent in agents})
+            synthesis_args["agent_summaries"] = view["agents"]
+            synthesis_args["debate_summaries"] = [{"rolling_summary": view["debate_summary"]}]
+            system, user = final_synthesis_prompt(**synthesis_args, compact=True)
+            synthesis_size = {
+                "full_tokens_est": full_tokens,
+                "compact_tokens_est": estimate_tokens(system) + estimate_tokens(user),
+            }
+        synthesis_usage = new_usage()
+        update_scope(stage="synthesis")
+        final_result = metered_call(synthesis_usage, system, user, 0.4)
         vprint(f"[paragraph {idx}] final candidate agent versions:", stage="final")
-        for agent in AGENTS:
+        for agent in agents:
             vprint(f"[paragraph {idx}] [{agent.key}] {current[agent.key]}", agent_key=agent.key)
         vprint(f"[paragraph {idx}] final synthesis translation:", stage="final")
         vprint(str(final_result.get("final_translation", "")).strip(), stage="final")
@@ -525,18 +980,36 @@ def run_debate_pipeline(
             stage="final",
         )
 
-        paragraphs.append(
-            {
-                "paragraph_index": idx,
-                "greek": greek,
-                "reference_translations": reference_translations,
-                "agents": agent_logs,
-                "final_agent_versions": current,
-                "debate_round_summaries": debate_round_summaries,
-                "final_synthesis": final_result,
-            }
-        )
-
+        paragraph: dict[str, Any] = {
+            "paragraph_index": idx,
+            "greek": greek,
+            "reference_translations": reference_translations,
+            "agents": agent_logs,
+            "final_agent_versions": current,
+            "debate_round_summaries": debate_round_summaries,
+            "convergence": tracker.summary(),
+            "usage": {"initial": initial_usage, "synthesis": synthesis_usage},
+            "debate_timing": debate_timing,
+            "final_synthesis": final_result,
+        }
+        if critic_log:
+            paragraph["critic"] = critic_log
+        if synthesis_size is not None:
+            paragraph["synthesis_prompt_size"] = synthesis_size
+        if exchanges:
+            paragraph["debate_exchanges"] = exchanges
+        if feedback_reports:
+            paragraph["external_feedback"] = {key: report["results"] for key, report in feedback_reports.items()}
+        return paragraph
+
+    paragraphs = run_paragraphs(
+        greek_paragraphs,
+        run_paragraph,
+        workers=paragraph_workers,
+        paragraph_numbers=paragraph_numbers,
+        on_paragraph_done=on_paragraph_done,
+        result_spill=result_spill,
+    )
     full_translation = "\n\n".join(
         p["final_synthesis"].get("final_translation", "").strip() for p in paragraphs
     ).strip()
@@ -546,10 +1019,11 @@ def run_debate_pipeline(
         "pipeline": "debate",
         "model": model,
         "iterations": iterations,
-        "agent_count": len(AGENTS),
+        "agent_count": len(agents),
+        "critique_topology": topology,
         "user_preference": normalized_preference,
-        "agents": [agent.__dict__ for agent in AGENTS],
-        "paragraph_count": len(greek_paragraphs),
+        "agents": [agent.__dict__ for agent in agents],
+        "paragraph_count": len(paragraphs),
         "paragraphs": paragraphs,
         "final_translation": full_translation,
     }
@@ -0,0 +1,142 @@
+"""Compact rolling debate state for revision and synthesis prompts.
+
+Instead of re-sending every critique, plan and summary from every round, the
+debate keeps one `DebateState` per paragraph. Each prompt section (concerns,
+rolling summary, plan, change summary) is capped at a token budget and
+serialized without indentation.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import re
+from typing import Any
+
+from .common import estimate_tokens
+from .convergence import normalized_edit_distance
+
+DEFAULT_SECTION_BUDGET = 300
+CONCERN_DUPLICATE_THRESHOLD = 0.35
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    text = text.strip()
+    limit = budget * 4
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1].rstrip() + "…"
+
+
+def split_points(text: str) -> list[str]:
+    return [part.strip() for part in _SENTENCE_END.split(str(text or "")) if part.strip()]
+
+
+def add_unique(points: list[str], new_points: list[str]) -> list[str]:
+    """Newest-first list; a point close to an older one replaces it."""
+    kept = list(points)
+    for point in new_points:
+        kept = [
+            old for old in kept
+            if normalized_edit_distance(old, point) >= CONCERN_DUPLICATE_THRESHOLD
+        ]
+        kept.insert(0, point)
+    return kept
+
+
+def within_budget(points: list[str], budget: int) -> list[str]:
+    selected: list[str] = []
+    used = 0
+    for point in points:
+        cost = estimate_tokens(point) + 1
+        if selected and used + cost > budget:
+            break
+        selected.append(truncate_to_budget(point, budget))
+        used += cost
+    return selected
+
+
+@dataclass
+class DebateState:
+    """Rolling memory of one paragraph's debate.
+
+    Keeps, per target agent, only the latest scores from each reviewer and a
+    deduplicated newest-first list of concerns, plus each agent's latest plan
+    and change summary and a rolling summary of all rounds so far.
+    """
+
+    section_budget: int = DEFAULT_SECTION_BUDGET
+    scores: dict[str, dict[str, Any]] = field(default_factory=dict)
+    concerns: dict[str, list[str]] = field(default_factory=dict)
+    plans: dict[str, str] = field(default_factory=dict)
+    changes: dict[str, str] = field(default_factory=dict)
+    summary_points: list[str] = field(default_factory=list)
+
+    def record_round(
+        self,
+        critiques_for: dict[str, list[dict[str, Any]]],
+        round_summaries: dict[str, str],
+        plans: dict[str, str],
+    ) -> None:
+        for target, critiques in critiques_for.items():
+            latest = self.scores.setdefault(target, {})
+            for critique in critiques:
+                if isinstance(critique.get("scores"), dict):
+                    latest[critique["from"]] = critique["scores"]
+                self.concerns[target] = add_unique(
+                    self.concerns.get(target, []),
+                    split_points(critique.get("concerns", "")),
+                )
+        for summary in round_summaries.values():
+            self.summary_points = add_unique(self.summary_points, split_points(summary))
+        for key, plan in plans.items():
+            if str(plan).strip():
+                self.plans[key] = str(plan).strip()
+
+    def record_revisions(self, change_summaries: dict[str, str]) -> None:
+        for key, change in change_summaries.items():
+            if str(change).strip():
+                self.changes[key] = str(change).strip()
+
+    def rolling_summary(self) -> str:
+        # Newest points first so the budget trims the oldest rounds.
+        return " ".join(within_budget(self.summary_points, self.section_budget))
+
+    def revision_view(self, agent_key: str) -> dict[str, Any]:
+        """A snapshot for one reviser; later rounds may update the state while it is serialized."""
+        return {
+            "latest_scores_of_your_translation": {
+                reviewer: dict(scores) if isinstance(scores, dict) else scores
+                for reviewer, scores in self.scores.get(agent_key, {}).items()
+            },
+            "open_concerns": within_budget(self.concerns.get(agent_key, []), self.section_budget),
+            "your_revision_plan": truncate_to_budget(self.plans.get(agent_key, ""), self.section_budget),
+        }
+
+    def synthesis_view(self, agent_priorities: dict[str, str]) -> dict[str, Any]:
+        agents: dict[str, Any] = {}
+        per_agent_budget = max(40, self.section_budget // max(1, len(agent_priorities)))
+        for key, priority in agent_priorities.items():
+            agents[key] = {
+                "priority": priority,
+                "latest_scores": mean_scores(self.scores.get(key, {})),
+                "open_concerns": within_budget(self.concerns.get(key, []), per_agent_budget),
+                "last_change": truncate_to_budget(self.changes.get(key, ""), per_agent_budget),
+            }
+        return {"agents": agents, "debate_summary": self.rolling_summary()}
+
+
+def mean_scores(by_reviewer: dict[str, Any]) -> dict[str, float]:
+    totals: dict[str, list[float]] = {}
+    for scores in by_reviewer.values():
+        if not isinstance(scores, dict):
+            continue
+        for dimension, value in scores.items():
+            if isinstance(value, (int, float)):
+                totals.setdefault(dimension, []).append(float(value))
+    return {dimension: round(sum(values) / len(values), 1) for dimension, values in totals.items()}
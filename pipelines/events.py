@@ -0,0 +1,203 @@
+"""Structured progress events, rendered off the hot path.
+
+Runners used to format, colorize and print every progress line themselves,
+synchronously and often dozens of lines per critique. They now emit `Event`
+objects instead. Emitting an event only puts it on a queue. An `EventBus`
+thread takes events off the queue and renders them: `log` events become the
+usual colored stderr lines, and with a JSONL path every event is also written
+there as one JSON object, with its scope, thread and time.
+
+Event kinds:
+- `log`: a progress line from a runner's verbose output.
+- `stage_start` / `stage_end`: one LLM call, with its seconds and any error.
+- `translation`: a call returned a translation.
+- `score`: a call returned scores.
+
+The typed kinds come from `EventBus.wrap`, which sits on `call_json_fn` like
+the checkpoint and artifact wrappers. Without an active bus, `publish` prints
+`log` events straight to stderr, so scripts that never start one behave as
+before.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, TextIO
+
+from .artifacts import extract_scores
+from .checkpoint import current_scope, shared_scope
+
+TRANSLATION_KEYS = ("translation", "final_translation", "draft")
+
+
+class Event:
+    """One progress event; building it is a few attribute stores.
+
+    `scope` defaults to the caller's checkpoint scope. Scopes are never
+    changed in place, so the event keeps a reference rather than a copy.
+    """
+
+    __slots__ = ("kind", "message", "data", "color", "colorize_fn", "scope", "time", "thread")
+
+    def __init__(
+        self,
+        kind: str,
+        message: str = "",
+        *,
+        data: dict[str, Any] | None = None,
+        color: str | None = None,
+        colorize_fn: Callable[[str, str | None, bool], str] | None = None,
+        scope: dict[str, Any] | None = None,
+    ) -> None:
+        self.kind = kind
+        self.message = message
+        self.data = data
+        self.color = color
+        self.colorize_fn = colorize_fn
+        self.scope = shared_scope() if scope is None else scope
+        self.time = time.time()
+        self.thread = threading.get_ident()
+
+    def text(self) -> str:
+        if self.color and self.colorize_fn is not None:
+            return self.colorize_fn(self.message, self.color, True)
+        return self.message
+
+    def to_json(self) -> dict[str, Any]:
+        row: dict[str, Any] = {"kind": self.kind, "time": self.time, "thread": self.thread, "scope": self.scope or {}}
+        if self.message:
+            row["message"] = self.message
+        if self.data:
+            row["data"] = self.data
+        return row
+
+
+def log_event(
+    message: str,
+    color: str | None,
+    *,
+    color_enabled: bool,
+    colorize_fn: Callable[[str, str | None, bool], str],
+) -> Event:
+    """A progress line; colorizing waits until the bus renders it."""
+    return Event("log", message, color=color if color_enabled else None, colorize_fn=colorize_fn)
+
+
+_ACTIVE: EventBus | None = None
+
+
+def publish(event: Event) -> None:
+    bus = _ACTIVE
+    if bus is not None:
+        bus.emit(event)
+    elif event.kind == "log":
+        print(event.text(), file=sys.stderr)
+
+
+class EventBus:
+    """Queue plus one writer thread; `with EventBus(...)` makes it the active bus."""
+
+    def __init__(self, *, stderr: TextIO | None = None, jsonl_path: Path | None = None) -> None:
+        self._stderr = stderr
+        self.jsonl_path = jsonl_path
+        self._queue: queue.SimpleQueue[Event | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name="event-bus", daemon=True)
+        self._jsonl: TextIO | None = None
+
+    def emit(self, event: Event) -> None:
+        self._queue.put(event)
+
+    def _drain(self) -> None:
+        stderr = self._stderr or sys.stderr
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines: list[str] = []
+            rows: list[str] = []
+            for event in batch:
+                if event is None:
+                    running = False
+                    continue
+                if event.kind == "log":
+                    lines.append(event.text() + "\n")
+                if self._jsonl is not None:
+                    rows.append(json.dumps(event.to_json(), ensure_ascii=False, default=str) + "\n")
+            if lines:
+                stderr.write("".join(lines))
+                stderr.flush()
+            if rows:
+                self._jsonl.write("".join(rows))
+                self._jsonl.flush()
+
+    def start(self) -> EventBus:
+        global _ACTIVE
+        if self.jsonl_path is not None:
+            self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            self._jsonl = self.jsonl_path.open("w", encoding="utf-8")
+        self._thread.start()
+        _ACTIVE = self
+        return self
+
+    def close(self) -> None:
+        """Render everything emitted so far, then stop the writer."""
+        global _ACTIVE
+        if _ACTIVE is self:
+            _ACTIVE = None
+        self._queue.put(None)
+        self._thread.join()
+        if self._jsonl is not None:
+            self._jsonl.close()
+
+    def __enter__(self) -> EventBus:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def wrap(self, call_json_fn: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+        """Drop-in `call_json_fn` that emits stage, translation and score events."""
+
+        def call(
+            client: Any,
+            model: str,
+            system_prompt: str,
+            user_prompt: str,
+            **kwargs: Any,
+        ) -> dict[str, Any]:
+            scope = current_scope()
+            stage = str(scope.get("stage", ""))
+            self.emit(Event("stage_start", data={"stage": stage, "model": model}, scope=scope))
+            clock = time.perf_counter()
+            try:
+                response = call_json_fn(client, model, system_prompt, user_prompt, **kwargs)
+            except Exception as exc:
+                self.emit(
+                    Event(
+                        "stage_end",
+                        data={"stage": stage, "seconds": round(time.perf_counter() - clock, 3), "error": str(exc)},
+                        scope=scope,
+                    )
+                )
+                raise
+            self.emit(
+                Event("stage_end", data={"stage": stage, "seconds": round(time.perf_counter() - clock, 3)}, scope=scope)
+            )
+            for key in TRANSLATION_KEYS:
+                if isinstance(response.get(key), str):
+                    self.emit(Event("translation", data={"stage": stage, "text": response[key]}, scope=scope))
+                    break
+            scores = extract_scores(response)
+            if scores:
+                self.emit(Event("score", data={"stage": stage, "scores": scores}, scope=scope))
+            return response
+
+        return call
@@ -0,0 +1,462 @@
+"""Offline stand-in for OpenRouter and llama.cpp, for benchmarks and dry runs.
+
+`FakeServer` answers the HTTP endpoints the repo calls:
+- `POST /v1/chat/completions`: a chat completion whose content is one JSON
+  object holding every key any pipeline stage asks for (translation, scores,
+  critiques, drafts, ranking, ...), so each stage parses its own fields from
+  it. Ranking labels are taken from the prompt's candidate list.
+- `POST /v1/completions`: echoes the prompt with per-token logprobs, as the
+  prompt-echo perplexity scorer expects.
+- `POST /v1/embeddings`: a deterministic unit vector per input.
+- llama.cpp: `GET /v1/models`, `GET /props`, `POST /tokenize` and
+  `POST /completion`. `/completion` returns top logprobs that contain the
+  next token of any text the server has tokenized, sometimes past the first
+  `n_probs`, so the exact scorer's expansion path runs too.
+
+Responses are seeded by the request body, so the same prompts get the same
+answers (with errors enabled, also by request order). Each route group has
+its own `Latency`. `error_rate` turns that share of requests into
+429/500/503 errors, and `malformed_rate` returns chat content that is not
+JSON. `GET /fake/stats` reports request counts per route,
+and `POST /fake/reset` clears them.
+
+Run it standalone and point a script at it:
+    python -m pipelines.fake_server --port 8089 --chat-ms 400
+    OPENROUTER_BASE_URL=http://127.0.0.1:8089/v1 LLAMACPP_BASE_URL=http://127.0.0.1:8089 python main.py ...
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+import hashlib
+import itertools
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any
+
+N_VOCAB = 32000
+BOS_TOKEN = "<s>"
+BOS_ID = 1
+MODEL_ID = "fake-model.gguf"
+EMBEDDING_DIM = 64
+ERROR_CODES = (429, 500, 503)
+
+ROUTE_GROUPS = {
+    "/v1/chat/completions": "chat",
+    "/v1/completions": "completions",
+    "/v1/embeddings": "embeddings",
+    "/completion": "llamacpp",
+    "/tokenize": "llamacpp",
+    "/props": "llamacpp",
+    "/v1/models": "llamacpp",
+}
+
+_TOKEN = re.compile(r"\s*\S+")
+_CANDIDATE_LABEL = re.compile(r"^(C\d+):\s*$", flags=re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Per-request delay: `mean_ms` with `jitter` spread.
+
+    `distribution` is `fixed`, `uniform` (mean ± jitter) or `lognormal`
+    (median mean_ms, sigma jitter / mean_ms), the long tail of real APIs.
+    """
+
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0
+    distribution: str = "uniform"
+
+    def sample(self, rng: random.Random) -> float:
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == "fixed" or self.jitter_ms <= 0:
+            return self.mean_ms / 1000
+        if self.distribution == "lognormal":
+            sigma = self.jitter_ms / self.mean_ms
+            return rng.lognormvariate(math.log(self.mean_ms), sigma) / 1000
+        return max(0.0, rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)) / 1000
+
+
+@dataclass
+class FakeConfig:
+    latency: dict[str, Latency] = field(default_factory=dict)
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    seed: int = 0
+
+
+def _seeded(seed: int, *parts: Any) -> random.Random:
+    digest = hashlib.blake2b(json.dumps([seed, *parts], default=str).encode("utf-8"), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, "big"))
+
+
+def _token_id(piece: str) -> int:
+    digest = hashlib.blake2b(piece.encode("utf-8"), digest_size=4).digest()
+    return 2 + int.from_bytes(digest, "big") % (N_VOCAB - 2)
+
+
+def canned_stage_json(user_prompt: str, rng: random.Random) -> dict[str, Any]:
+    """One object that satisfies every stage schema in the repo."""
+    scores = {key: rng.randint(6, 10) for key in ("faithfulness", "readability", "modernity")}
+    labels = _CANDIDATE_LABEL.findall(user_prompt) or ["C1", "C2"]
+    rng.shuffle(labels)
+    draw = rng.randint(100, 999)
+    return {
+        "observations": "The draft keeps the main clause and loses one contrast.",
+        "translation": f"So may the mythical element yield to reason ({draw}) and take the look of history.",
+        "draft": f"Draft {draw}: the mythical element yields to reason.",
+        "scores": scores,
+        "self_scores": scores,
+        "balance_scores": scores,
+        "score": rng.randint(4, 9),
+        "overall_judgment": "Faithful and readable; one contrast is softened.",
+        "strengths": "Clear syntax.",
+        "issues": "The second clause loses its concession.",
+        "revision_plan": "Restore the concession in the second clause.",
+        "selected_iteration": 1,
+        "final_translation": f"So may the mythical element yield to reason ({draw}).",
+        "justification": "Best balance of the goals.",
+        "polished_translation": f"So may myth yield to reason ({draw}).",
+        "polish_notes": "Tightened the first clause.",
+        "round_summary": "Agents agree on the first clause.",
+        "critiques": [
+            {"agent": agent, "strengths": "Clear.", "concerns": "Loses a contrast.", "scores": scores}
+            for agent in ("faithful", "readable", "modern")
+        ],
+        "self_revision_plan": "Keep the structure, restore the contrast.",
+        "change_summary": "Restored the contrast.",
+        "phrase_process_notes": [
+            {
+                "source_phrase": "τὸ μυθῶδες",
+                "context_note": "The fabulous element.",
+                "simple_anchor": "myth",
+                "connotation_targets": "legend, not lie",
+                "candidate_options": ["the mythical", "legend"],
+                "chosen_phrase": "the mythical",
+            }
+        ],
+        "zoom_out_notes": "The sentence reads as one wish.",
+        "next_iteration_focus": "The second clause.",
+        "scene_model": "An author asks readers for patience.",
+        "claim_map": ["Myth should submit to reason."],
+        "plain_restatement": "Let myth look like history.",
+        "constraint_ledger": {"non_negotiables": ["the wish mood"], "negotiables": ["word order"]},
+        "drafts": {
+            "source_close": f"Source-close draft {draw}.",
+            "plain_natural": f"Plain draft {draw}.",
+            "balanced": f"Balanced draft {draw}.",
+        },
+        "selection_notes": "Balanced draft chosen.",
+        "ranking": labels,
+        "rationale": "The top candidate keeps every relation.",
+        "best_candidate_feedback": {
+            "overall_judgment": "Strong.",
+            "strengths": "Faithful.",
+            "issues": "Slightly stiff.",
+            "revision_plan": "Loosen the rhythm.",
+            "scores": scores,
+        },
+        "winner": rng.choice("AB"),
+        "key_gaps": ["A softened contrast."],
+        "key_matches": ["The wish mood."],
+        "greek": "εἴη μὲν οὖν ἡμῖν.",
+        "entities": ["Theseus", "Romulus"],
+        "relations": ["myth submits to reason"],
+        "contrasts": ["myth vs history"],
+        "modal_stance": "wish",
+    }
+
+
+class FakeServer:
+    """Threaded fake API server; `with FakeServer() as server:` serves on `server.base_url`."""
+
+    def __init__(self, config: FakeConfig | None = None, *, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or FakeConfig()
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+        self._errors = 0
+        # Token ids seen after each token in tokenized texts; `/completion`
+        # looks up the prompt's last token here.
+        self._next_tokens: dict[tuple[int, ...], set[int]] = {}
+        self._request_seq = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI-client base URL."""
+        return f"{self.url}/v1"
+
+    def start(self) -> FakeServer:
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> FakeServer:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"requests": dict(self._counts), "errors": self._errors}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._errors = 0
+
+    # -- responses -----------------------------------------------------------
+
+    def _chat(self, body: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+        messages = body.get("messages") or []
+        user = str(messages[-1].get("content", "")) if messages else ""
+        if rng.random() < self.config.malformed_rate:
+            content = "I cannot answer in JSON right now."
+        else:
+            content = json.dumps(canned_stage_json(user, rng), ensure_ascii=False)
+        prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // 4
+        return {
+            "id": f"chatcmpl-fake-{rng.getrandbits(32):08x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", MODEL_ID),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_tokens + len(content) // 4,
+            },
+        }
+
+    def _echo_completion(self, body: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+        prompt = str(body.get("prompt", ""))
+        pieces = _TOKEN.findall(prompt)
+        offsets = list(itertools.accumulate((len(piece) for piece in pieces[:-1]), initial=0))[: len(pieces)]
+        logprobs = [None] + [round(-rng.uniform(0.2, 4.0), 4) for _ in pieces[1:]]
+        return {
+            "id": f"cmpl-fake-{rng.getrandbits(32):08x}",
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": body.get("model", MODEL_ID),
+            "choices": [
+                {
+                    "index": 0,
+                    "text": prompt if body.get("echo") else "",
+                    "finish_reason": "length",
+                    "logprobs": {
+                        "tokens": pieces,
+                        "token_logprobs": logprobs,
+                        "top_logprobs": [None] + [{piece: value} for piece, value in zip(pieces[1:], logprobs[1:])],
+                        "text_offset": offsets,
+                    },
+                }
+            ],
+            "usage": {"prompt_tokens": len(pieces), "completion_tokens": 0, "total_tokens": len(pieces)},
+        }
+
+    def _embeddings(self, body: dict[str, Any]) -> dict[str, Any]:
+        inputs = body.get("input")
+        texts = inputs if isinstance(inputs, list) else [inputs]
+        data = []
+        for index, text in enumerate(texts):
+            rng = _seeded(self.config.seed, "embedding", text)
+            vector = [rng.gauss(0, 1) for _ in range(EMBEDDING_DIM)]
+            norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+            data.append({"object": "embedding", "index": index, "embedding": [value / norm for value in vector]})
+        return {
+            "object": "list",
+            "model": body.get("model", ""),
+            "data": data,
+            "usage": {"prompt_tokens": sum(len(str(text)) // 4 for text in texts), "total_tokens": 0},
+        }
+
+    def _tokenize(self, body: dict[str, Any]) -> dict[str, Any]:
+        content = str(body.get("content", ""))
+        if content == BOS_TOKEN:
+            return {"tokens": [BOS_ID]}
+        tokens = [_token_id(piece) for piece in _TOKEN.findall(content)]
+        with self._lock:
+            for index, token in enumerate(tokens):
+                prefix = (BOS_ID,) if index == 0 else (tokens[index - 1],)
+                self._next_tokens.setdefault(prefix, set()).add(token)
+        return {"tokens": tokens}
+
+    def _llamacpp_completion(self, body: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+        prompt = body.get("prompt") or [BOS_ID]
+        n_probs = max(1, min(N_VOCAB, int(body.get("n_probs", 10))))
+        with self._lock:
+            expected = sorted(self._next_tokens.get((int(prompt[-1]),), ()))
+        # The true next token lands at a seeded rank, sometimes beyond the
+        # default 256, so the scorer has to widen n_probs.
+        ranks = {token: _seeded(self.config.seed, "rank", prompt[-1], token).randrange(400) for token in expected}
+        top: list[dict[str, Any]] = []
+        filler = rng.randrange(N_VOCAB)
+        for rank in range(n_probs):
+            token = next((token for token, wanted in ranks.items() if wanted == rank), None)
+            if token is None:
+                filler = (filler + 7919) % N_VOCAB
+                token = filler
+            top.append({"id": token, "token": f"t{token}", "logprob": round(-0.3 - 0.015 * rank, 4), "bytes": []})
+        return {
+            "content": "",
+            "tokens": [],
+            "stop": True,
+            "model": body.get("model", MODEL_ID),
+            "completion_probabilities": [
+                {"id": top[0]["id"], "token": top[0]["token"], "logprob": top[0]["logprob"], "bytes": [], "top_logprobs": top}
+            ],
+        }
+
+    def _respond(self, method: str, path: str, body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        if path == "/fake/stats":
+            return 200, self.stats()
+        if path == "/fake/reset" and method == "POST":
+            self.reset()
+            return 200, {"ok": True}
+        group = ROUTE_GROUPS.get(path)
+        if group is None:
+            return 404, {"error": {"message": f"unknown route {method} {path}", "type": "not_found"}}
+        with self._lock:
+            self._counts[path] = self._counts.get(path, 0) + 1
+            self._request_seq += 1
+            sequence = self._request_seq
+        rng = _seeded(self.config.seed, path, body, sequence if self.config.error_rate else 0)
+        delay = self.config.latency.get(group, Latency()).sample(rng)
+        if delay:
+            time.sleep(delay)
+        if path not in ("/props", "/v1/models") and rng.random() < self.config.error_rate:
+            with self._lock:
+                self._errors += 1
+            code = rng.choice(ERROR_CODES)
+            return code, {"error": {"message": f"fake error {code}", "type": "server_error", "code": code}}
+        if path == "/v1/chat/completions":
+            return 200, self._chat(body, rng)
+        if path == "/v1/completions":
+            return 200, self._echo_completion(body, rng)
+        if path == "/v1/embeddings":
+            return 200, self._embeddings(body)
+        if path == "/tokenize":
+            return 200, self._tokenize(body)
+        if path == "/completion":
+            return 200, self._llamacpp_completion(body, rng)
+        if path == "/props":
+            return 200, {"bos_token": BOS_TOKEN, "eos_token": "</s>", "total_slots": 4, "default_generation_settings": {"n_ctx": 4096}}
+        return 200, {
+            "object": "list",
+            "data": [{"id": MODEL_ID, "object": "model", "owned_by": "llamacpp", "meta": {"n_vocab": N_VOCAB, "n_ctx_train": 4096}}],
+        }
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    status, payload = 400, {"error": {"message": "invalid JSON body", "type": "invalid_request"}}
+                else:
+                    status, payload = server._respond(method, self.path.split("?", 1)[0], body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._serve("GET")
+
+            def do_POST(self) -> None:  # noqa: N802
+                self._serve("POST")
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+        return Handler
+
+
+def latency_arg(value: str) -> Latency:
+    """`MEAN[:JITTER[:DISTRIBUTION]]` in milliseconds, e.g. `400:150:lognormal`."""
+    parts = value.split(":")
+    try:
+        return Latency(
+            float(parts[0]),
+            float(parts[1]) if len(parts) > 1 else 0.0,
+            parts[2] if len(parts) > 2 else "uniform",
+        )
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"bad latency '{value}': {exc}") from exc
+
+
+def add_fake_server_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--chat-ms", type=latency_arg, default=Latency(), help="Chat latency MEAN[:JITTER[:DIST]].")
+    parser.add_argument("--completions-ms", type=latency_arg, default=Latency(), help="Echo-logprob latency.")
+    parser.add_argument("--embeddings-ms", type=latency_arg, default=Latency(), help="Embedding latency.")
+    parser.add_argument("--llamacpp-ms", type=latency_arg, default=Latency(), help="Latency of each llama.cpp request.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 429/500/503.")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of chat replies that are not JSON.")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    return FakeConfig(
+        latency={
+            "chat": args.chat_ms,
+            "completions": args.completions_ms,
+            "embeddings": args.embeddings_ms,
+            "llamacpp": args.llamacpp_ms,
+        },
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve fake OpenAI and llama.cpp endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_fake_server_args(parser)
+    args = parser.parse_args()
+    server = FakeServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"Fake server on {server.url} (OpenAI base URL {server.base_url})", flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,409 @@
+"""Named external feedback mechanisms, run concurrently per translation.
+
+Before this, `translation_feedback_mechanisms.py` held five signals but only
+perplexity reached a pipeline, through the sequential judge. Each mechanism
+is now a registered `FeedbackMechanism`:
+- `perplexity`: the small-LM perplexity scorer (llama.cpp or prompt echo).
+- `grade_level`: Flesch-Kincaid grade and reading ease; no calls.
+- `embedding_similarity`: cosine similarity of the Greek and the English.
+- `back_translation`: English back to Greek, compared with the original.
+- `entity_check`: entity, relation and contrast coverage, against a
+  checklist extracted once per paragraph.
+
+A `FeedbackOrchestrator` runs the enabled mechanisms on a shared pool. Each
+one has its own deadline. A mechanism that misses its deadline is reported
+as unavailable ("timeout after Ns") and the iteration goes on without it. Its
+result still lands in the cache when it finishes, so a later request for the
+same text gets it. Results are cached per mechanism, Greek and translation.
+The mechanisms' `format_*_for_prompt` lines are merged into one block of at
+most `budget_chars` characters for the judge or selector prompt.
+
+Register a new mechanism with `register_feedback_mechanism`.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any, Callable, Hashable, Sequence
+
+from translation_feedback_mechanisms import (
+    DEFAULT_EMBEDDING_MODEL,
+    check_entities_in_translation,
+    compute_back_translation,
+    compute_embedding_similarity,
+    compute_grade_level,
+    compute_smoothness_feedback_from_perplexity,
+    extract_entities_and_relations,
+    format_back_translation_for_prompt,
+    format_embedding_similarity_for_prompt,
+    format_entity_check_for_prompt,
+    format_grade_level_for_prompt,
+    format_smoothness_feedback_for_prompt,
+)
+
+from .checkpoint import submit_in_context
+from .tracing import span
+
+DEFAULT_FEEDBACK_BUDGET = 1200
+
+
+@dataclass(frozen=True)
+class FeedbackRequest:
+    """What a mechanism gets: the texts, the models and a per-run memo."""
+
+    client: Any
+    model: str
+    greek: str
+    translation: str
+    timeout: float
+    perplexity_model: str | None
+    embedding_model: str
+    compute_perplexity_fn: Callable[..., dict[str, Any]]
+    once: Callable[[Hashable, Callable[[], Any]], Any]
+
+
+@dataclass(frozen=True)
+class FeedbackMechanism:
+    name: str
+    compute: Callable[[FeedbackRequest], dict[str, Any]]
+    format: Callable[[dict[str, Any]], str]
+    timeout: float = 60.0
+
+
+FEEDBACK_MECHANISMS: dict[str, FeedbackMechanism] = {}
+
+
+def register_feedback_mechanism(mechanism: FeedbackMechanism) -> None:
+    FEEDBACK_MECHANISMS[mechanism.name] = mechanism
+
+
+def unavailable(name: str, reason: str) -> dict[str, Any]:
+    return {"mechanism": name, "available": False, "reason": reason}
+
+
+def _perplexity(request: FeedbackRequest) -> dict[str, Any]:
+    if not request.perplexity_model:
+        return unavailable("small_lm_perplexity", "no_feedback_model")
+    return request.compute_perplexity_fn(
+        client=request.client,
+        model=request.perplexity_model,
+        text=request.translation,
+        timeout=max(1, int(request.timeout)),
+    )
+
+
+def _entity_check(request: FeedbackRequest) -> dict[str, Any]:
+    # One extraction per paragraph, shared by every candidate and iteration.
+    extraction = request.once(
+        ("entities", request.model, request.greek),
+        lambda: extract_entities_and_relations(client=request.client, model=request.model, greek=request.greek),
+    )
+    return check_entities_in_translation(extraction=extraction, translation=request.translation)
+
+
+for _mechanism in (
+    FeedbackMechanism("perplexity", _perplexity, format_smoothness_feedback_for_prompt, timeout=120.0),
+    FeedbackMechanism(
+        "grade_level",
+        lambda request: compute_grade_level(text=request.translation),
+        format_grade_level_for_prompt,
+        timeout=5.0,
+    ),
+    FeedbackMechanism(
+        "embedding_similarity",
+        lambda request: compute_embedding_similarity(
+            client=request.client,
+            source_text=request.greek,
+            translation_text=request.translation,
+            model=request.embedding_model,
+        ),
+        format_embedding_similarity_for_prompt,
+        timeout=30.0,
+    ),
+    FeedbackMechanism(
+        "back_translation",
+        lambda request: compute_back_translation(
+            client=request.client,
+            model=request.model,
+            original_greek=request.greek,
+            translation=request.translation,
+            embedding_model=request.embedding_model,
+        ),
+        format_back_translation_for_prompt,
+        timeout=90.0,
+    ),
+    FeedbackMechanism("entity_check", _entity_check, format_entity_check_for_prompt, timeout=90.0),
+):
+    register_feedback_mechanism(_mechanism)
+
+
+def parse_feedback_names(value: str) -> list[str]:
+    """`"grade_level, entity_check"` -> names, checked against the registry."""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FEEDBACK_MECHANISMS]
+    if unknown:
+        raise ValueError(
+            f"Unknown feedback mechanism(s): {', '.join(unknown)}; "
+            f"known: {', '.join(sorted(FEEDBACK_MECHANISMS))}"
+        )
+    return list(dict.fromkeys(names))
+
+
+def parse_feedback_timeouts(value: str) -> dict[str, float]:
+    """`"perplexity=30,back_translation=60"` -> per-mechanism seconds."""
+    timeouts: dict[str, float] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, seconds = item.partition("=")
+        parse_feedback_names(name)
+        try:
+            timeouts[name.strip()] = float(seconds)
+        except ValueError as exc:
+            raise ValueError(f"Bad feedback timeout '{item.strip()}'; expected NAME=SECONDS") from exc
+    return timeouts
+
+
+def merge_feedback_summaries(lines: Sequence[tuple[str, str]], budget_chars: int) -> str:
+    """One `- line` per mechanism, trimmed so the block fits `budget_chars`.
+
+    Short lines keep their full text; the budget they leave over is shared
+    by the longer ones, which are cut at a word boundary.
+    """
+    lines = [(name, text.strip()) for name, text in lines if text.strip()]
+    if not lines:
+        return ""
+    overhead = 3  # "- " plus the newline
+    remaining = max(0, budget_chars - overhead * len(lines))
+    allowance: dict[str, int] = {}
+    for position, (name, text) in enumerate(sorted(lines, key=lambda line: len(line[1]))):
+        share = remaining // (len(lines) - position)
+        allowance[name] = min(len(text), share)
+        remaining -= allowance[name]
+    out: list[str] = []
+    for name, text in lines:
+        limit = allowance[name]
+        if len(text) > limit:
+            cut = text[: max(0, limit - 1)].rsplit(" ", 1)[0]
+            text = f"{cut}…" if cut else ""
+        if text:
+            out.append(f"- {text}")
+    if len(out) == 1:
+        # A single mechanism reads as before, without a list marker.
+        return out[0][2:]
+    return "\n".join(out)
+
+
+@dataclass(frozen=True)
+class PendingFeedback:
+    """Mechanisms started for one translation; `FeedbackOrchestrator.gather` waits."""
+
+    futures: dict[str, Future[dict[str, Any]]]
+    started: float
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures.values())
+
+
+class FeedbackOrchestrator:
+    """Runs the enabled mechanisms for a run; thread-safe, one per run."""
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        *,
+        client: Any,
+        model: str,
+        perplexity_model: str | None = None,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+        compute_perplexity_fn: Callable[..., dict[str, Any]] = compute_smoothness_feedback_from_perplexity,
+        timeouts: dict[str, float] | None = None,
+        budget_chars: int = DEFAULT_FEEDBACK_BUDGET,
+    ) -> None:
+        self.mechanisms = [FEEDBACK_MECHANISMS[name] for name in parse_feedback_names(",".join(names))]
+        self.client = client
+        self.model = model
+        self.perplexity_model = perplexity_model
+        self.embedding_model = embedding_model
+        self.compute_perplexity_fn = compute_perplexity_fn
+        self.timeouts = {
+            mechanism.name: (timeouts or {}).get(mechanism.name, mechanism.timeout) for mechanism in self.mechanisms
+        }
+        self.budget_chars = budget_chars
+        self._lock = threading.Lock()
+        self._cache: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._inflight: dict[tuple[str, str, str], Future[dict[str, Any]]] = {}
+        self._memo: dict[Hashable, Future[Any]] = {}
+        # Timed-out work keeps its thread until it returns, so the pool has
+        # room for several stragglers per mechanism.
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(4, 4 * len(self.mechanisms)),
+            thread_name_prefix="feedback",
+        )
+
+    @property
+    def names(self) -> list[str]:
+        return [mechanism.name for mechanism in self.mechanisms]
+
+    @property
+    def heading(self) -> str:
+        """Prompt heading; a perplexity-only run keeps its original wording."""
+        return "perplexity feedback" if self.names == ["perplexity"] else "automatic feedback"
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> FeedbackOrchestrator:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _once(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._memo.get(key)
+            owner = future is None
+            if owner:
+                future = self._memo[key] = Future()
+        if owner:
+            try:
+                future.set_result(fn())
+            except BaseException as exc:
+                with self._lock:
+                    self._memo.pop(key, None)
+                future.set_exception(exc)
+        return future.result()
+
+    def _run(self, mechanism: FeedbackMechanism, greek: str, translation: str) -> dict[str, Any]:
+        request = FeedbackRequest(
+            client=self.client,
+            model=self.model,
+            greek=greek,
+            translation=translation,
+            timeout=self.timeouts[mechanism.name],
+            perplexity_model=self.perplexity_model,
+            embedding_model=self.embedding_model,
+            compute_perplexity_fn=self.compute_perplexity_fn,
+            once=self._once,
+        )
+        with span(f"{mechanism.name} feedback", "feedback", mechanism=mechanism.name):
+            try:
+                return mechanism.compute(request)
+            except Exception as exc:  # noqa: BLE001
+                return unavailable(mechanism.name, f"failed: {str(exc)[:200]}")
+
+    def _submit(self, mechanism: FeedbackMechanism, greek: str, translation: str) -> Future[dict[str, Any]]:
+        key = (mechanism.name, greek, translation)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                done: Future[dict[str, Any]] = Future()
+                done.set_result(cached)
+                return done
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = submit_in_context(self._pool, self._run, mechanism, greek, translation)
+            self._inflight[key] = future
+
+        def store(finished: Future[dict[str, Any]]) -> None:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if not finished.cancelled() and finished.exception() is None:
+                    self._cache[key] = finished.result()
+
+        future.add_done_callback(store)
+        return future
+
+    def start(self, *, greek: str, translation: str) -> PendingFeedback:
+        """Start every mechanism for one translation without waiting."""
+        return PendingFeedback(
+            {mechanism.name: self._submit(mechanism, greek, translation) for mechanism in self.mechanisms},
+            time.monotonic(),
+        )
+
+    def gather(self, pending: PendingFeedback, *, wait: bool = True) -> dict[str, Any]:
+        """Wait for started mechanisms up to their deadlines and merge the results.
+
+        Deadlines count from when the mechanisms were started, so time the
+        caller spent on other work counts against them. With `wait=False`
+        only what has already finished is used. Mechanisms left out either
+        way are listed under `late`.
+        """
+        results: dict[str, dict[str, Any]] = {}
+        late: list[str] = []
+        for name, future in pending.futures.items():
+            remaining = self.timeouts[name] - (time.monotonic() - pending.started) if wait else 0.0
+            try:
+                results[name] = future.result(timeout=max(0.0, remaining))
+            except TimeoutError:
+                late.append(name)
+                reason = f"timeout after {self.timeouts[name]:g}s" if wait else "still running"
+                results[name] = unavailable(name, reason)
+        by_name = {mechanism.name: mechanism for mechanism in self.mechanisms}
+        summary = merge_feedback_summaries(
+            [(name, by_name[name].format(payload)) for name, payload in results.items()],
+            self.budget_chars,
+        )
+        return {
+            "results": results,
+            "summary": summary,
+            "available": sorted(name for name, payload in results.items() if payload.get("available")),
+            "late": late,
+        }
+
+    def score(self, name: str, *, greek: str, translations: Sequence[str]) -> dict[str, dict[str, Any]]:
+        """Run one enabled mechanism on several translations at once, within its deadline.
+
+        Shares the cache with `start`, so a later `collect` reuses the results.
+        """
+        mechanism = next(mechanism for mechanism in self.mechanisms if mechanism.name == name)
+        started = time.monotonic()
+        futures = {text: self._submit(mechanism, greek, text) for text in translations}
+        results: dict[str, dict[str, Any]] = {}
+        for text, future in futures.items():
+            remaining = self.timeouts[name] - (time.monotonic() - started)
+            try:
+                results[text] = future.result(timeout=max(0.0, remaining))
+            except TimeoutError:
+                results[text] = unavailable(name, f"timeout after {self.timeouts[name]:g}s")
+        return results
+
+    def collect(self, *, greek: str, translation: str) -> dict[str, Any]:
+        """Run every enabled mechanism on one translation and wait for them."""
+        pending = self.start(greek=greek, translation=translation)
+        with span("feedback wait", "wait", mechanisms=len(self.mechanisms)):
+            return self.gather(pending)
+
+    def collect_many(self, *, greek: str, translations: dict[str, str]) -> dict[str, dict[str, Any]]:
+        """`collect` for several candidates at once; keys are kept."""
+        pending = {key: self.start(greek=greek, translation=text) for key, text in translations.items() if text}
+        with span("feedback wait", "wait", mechanisms=len(self.mechanisms) * len(pending)):
+            return {key: self.gather(started) for key, started in pending.items()}
+
+
+def attach_iteration_feedback(
+    feedback: FeedbackOrchestrator,
+    iteration_logs: list[dict[str, Any]],
+    pending: dict[int, PendingFeedback],
+) -> None:
+    """Wait for feedback started per iteration and store it on the iteration rows.
+
+    Selector prompts show a row's `external_feedback_summary` when it is set.
+    """
+    with span("feedback wait", "wait", mechanisms=len(feedback.mechanisms) * len(pending)):
+        for row in iteration_logs:
+            started = pending.get(row["iteration"])
+            if started is None:
+                continue
+            report = feedback.gather(started)
+            row["external_feedback"] = report["results"]
+            row["external_feedback_summary"] = report["summary"]
+
+
+FEEDBACK_SELECTION_RULE = (
+    "Treat external_feedback_summary as an automatic secondary signal; "
+    "never let it override faithfulness or source logic."
+)
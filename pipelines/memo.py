@@ -0,0 +1,100 @@
+"""Content-hash memoization of complete per-paragraph results.
+
+A paragraph's result is stored under a key covering everything that shapes
+it: the Greek, its reference translations, the normalized user preference,
+pipeline, model, iteration count, pipeline settings and a digest of the
+source that holds the prompt templates and paragraph logic. A later run with
+the same key reuses the stored paragraph instead of recomputing it. The
+paragraph's position is not part of the key, so inserting or removing a
+paragraph elsewhere still reuses the others.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+from .checkpoint import request_digest
+
+# Modules whose prompt templates or paragraph logic shape a stored result,
+# relative to the repository root. Their source is hashed into every key, so
+# editing a prompt or a runner retires paragraphs cached under the old code.
+PARAGRAPH_LOGIC_SOURCES = (
+    "pipelines/candidates.py",
+    "pipelines/chunking.py",
+    "pipelines/cognitive_dualloop.py",
+    "pipelines/cognitive_user.py",
+    "pipelines/common.py",
+    "pipelines/convergence.py",
+    "pipelines/debate.py",
+    "pipelines/debate_state.py",
+    "pipelines/feedback.py",
+    "pipelines/ranking.py",
+    "pipelines/sequential.py",
+    "translation_feedback_mechanisms.py",
+)
+
+PARAGRAPH_CACHE_DIR = Path("runs/paragraph_cache")
+
+
+@lru_cache(maxsize=1)
+def prompt_template_digest() -> str:
+    root = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for name in PARAGRAPH_LOGIC_SOURCES:
+        digest.update(name.encode("utf-8") + b"\0")
+        digest.update((root / name).read_bytes())
+    return digest.hexdigest()
+
+
+class ParagraphMemo:
+    def __init__(self, directory: Path = PARAGRAPH_CACHE_DIR) -> None:
+        self.directory = directory
+
+    def key(
+        self,
+        *,
+        greek: str,
+        reference_translations: dict[str, str],
+        user_preference: str,
+        pipeline: str,
+        model: str,
+        iterations: int,
+        settings: dict[str, Any],
+    ) -> str:
+        return request_digest(
+            {
+                "greek": greek,
+                "references": reference_translations,
+                "preference": user_preference,
+                "pipeline": pipeline,
+                "model": model,
+                "iterations": iterations,
+                "settings": settings,
+                "templates": prompt_template_digest(),
+            }
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def store(self, key: str, paragraph: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        # Write then rename so concurrent runs never read a half-written file.
+        tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(paragraph, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
@@ -0,0 +1,236 @@
+"""Listwise / tournament ranking engine for translation candidates.
+
+Small candidate sets are ranked in one listwise call. Larger sets run a
+knockout tournament of listwise pods. Every pair implied by a listwise order
+goes into a pairwise outcome cache that lives as long as the engine.
+A later ranking whose winner already follows from cached outcomes, directly or
+transitively, costs no call. The feedback and rationale a listwise call gave
+for its winner are cached too, so a ranking settled from the cache or by a
+cached final pod still returns them. Keep one engine per paragraph so
+comparisons made in earlier iterations are reused for later ones and for
+final selection.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import re
+import threading
+from typing import Any, Callable
+
+from .checkpoint import update_scope
+from .common import map_parallel, reference_context_block
+
+DEFAULT_LISTWISE_MAX = 6
+
+
+@dataclass(frozen=True)
+class RankingContext:
+    greek: str
+    paragraph_index: int
+    reference_translations: dict[str, str]
+    user_preference: str
+    goals_guidance: str
+
+
+def listwise_rank_prompt(
+    context: RankingContext,
+    candidates: list[str],
+) -> tuple[str, str]:
+    system = (
+        "You are a translation judge ranking candidate translations of one Ancient Greek "
+        "paragraph against each other. Output JSON only."
+    )
+    refs = reference_context_block(context.reference_translations)
+    listing = "\n\n".join(
+        f"C{number}:\n{text}" for number, text in enumerate(candidates, start=1)
+    )
+    user = f"""
+Paragraph {context.paragraph_index} Greek:
+{context.greek}
+
+{refs}
+
+User preference prompt:
+{context.user_preference}
+
+Candidates:
+{listing}
+
+Task:
+1) Rank every candidate from best to worst for the user preference, then these goals:
+{context.goals_guidance}
+2) Compare the candidates directly against each other; do not score them in isolation.
+3) Never reward simplification that drops a core relation or contrast from the Greek.
+4) Treat reference translations as semantic checks only, not style targets.
+5) Give concrete, actionable feedback for the best candidate so the next revision can improve it.
+
+Return strict JSON with exactly these keys:
+{{
+  "ranking": ["C1", "C2"],
+  "rationale": "why the top candidate beats the others",
+  "best_candidate_feedback": {{
+    "overall_judgment": "candid quality assessment of the best candidate",
+    "strengths": "concrete strengths",
+    "issues": "concrete issues",
+    "revision_plan": "concrete edits for next iteration",
+    "scores": {{
+      "faithfulness": 1-10,
+      "readability": 1-10,
+      "modernity": 1-10
+    }}
+  }}
+}}
+""".strip()
+    return system, user
+
+
+def _pair_key(a: str, b: str) -> tuple[str, str]:
+    return (a, b) if a <= b else (b, a)
+
+
+class RankingEngine:
+    def __init__(
+        self,
+        call_fn: Callable[[str, str, float], dict[str, Any]],
+        context: RankingContext,
+        *,
+        listwise_max: int = DEFAULT_LISTWISE_MAX,
+    ) -> None:
+        self._call_fn = call_fn
+        self.context = context
+        self.listwise_max = max(2, listwise_max)
+        self._winners: dict[tuple[str, str], str] = {}
+        # Winner text -> (rationale, best_candidate_feedback) of its latest win.
+        self._verdicts: dict[str, tuple[str, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.cached_comparisons = 0
+
+    def _record(self, winner: str, loser: str) -> None:
+        if winner != loser:
+            self._winners[_pair_key(winner, loser)] = winner
+
+    def _cached_order(self, texts: list[str]) -> list[int] | None:
+        """Order implied by cached outcomes, if they settle a unique winner."""
+        n = len(texts)
+        beats = [[False] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(n):
+                if i != j and self._winners.get(_pair_key(texts[i], texts[j])) == texts[i]:
+                    beats[i][j] = True
+        for k in range(n):
+            for i in range(n):
+                if beats[i][k]:
+                    for j in range(n):
+                        if beats[k][j] and i != j:
+                            beats[i][j] = True
+        wins = [sum(row) for row in beats]
+        if max(wins) < n - 1:
+            return None
+        return sorted(range(n), key=lambda i: (-wins[i], i))
+
+    def _listwise(self, texts: list[str]) -> tuple[list[int], dict[str, Any]]:
+        system, user = listwise_rank_prompt(self.context, texts)
+        with self._lock:
+            self.calls += 1
+        update_scope(stage="rank")
+        result = self._call_fn(system, user, 0.2)
+        order: list[int] = []
+        raw = result.get("ranking", [])
+        for label in raw if isinstance(raw, list) else []:
+            match = re.search(r"\d+", str(label))
+            if match:
+                at = int(match.group(0)) - 1
+                if 0 <= at < len(texts) and at not in order:
+                    order.append(at)
+        order += [at for at in range(len(texts)) if at not in order]
+        feedback = result.get("best_candidate_feedback")
+        with self._lock:
+            for pos, winner in enumerate(order):
+                for loser in order[pos + 1:]:
+                    self._record(texts[winner], texts[loser])
+            if isinstance(feedback, dict) and feedback:
+                self._verdicts[texts[order[0]]] = (str(result.get("rationale", "")).strip(), feedback)
+        return order, result
+
+    def _rank_small(self, texts: list[str]) -> tuple[list[int], str, dict[str, Any]]:
+        if len(texts) <= 1:
+            return list(range(len(texts))), "trivial", {}
+        with self._lock:
+            cached = self._cached_order(texts)
+            if cached is not None:
+                self.cached_comparisons += len(texts) - 1
+        if cached is not None:
+            return cached, "cached", {}
+        order, result = self._listwise(texts)
+        return order, "listwise", result
+
+    def _tournament(self, texts: list[str]) -> tuple[list[int], dict[str, Any]]:
+        """Knockout of listwise pods; each pod's winner advances.
+
+        Seeds are dealt round-robin into pods so the strongest inputs (callers
+        pass them best-first) meet late. A pairwise tournament needs at least
+        n - 1 calls; pods of size m need about (n - 1) / (m - 1).
+        """
+        contenders = list(range(len(texts)))
+        eliminated: list[list[int]] = []
+        result: dict[str, Any] = {}
+        while len(contenders) > 1:
+            pod_count = math.ceil(len(contenders) / self.listwise_max)
+            pods = [contenders[at::pod_count] for at in range(pod_count)]
+            outcomes = map_parallel(
+                lambda pod: self._rank_small([texts[i] for i in pod]),
+                pods,
+            )
+            losers: list[tuple[int, int]] = []
+            contenders = []
+            for pod, (order, _method, pod_result) in zip(pods, outcomes):
+                contenders.append(pod[order[0]])
+                losers += [(place, pod[at]) for place, at in enumerate(order[1:])]
+                result = pod_result
+            eliminated.append([i for _place, i in sorted(losers)])
+        order = contenders + [i for losers in reversed(eliminated) for i in losers]
+        return order, result
+
+    def rank(self, texts: list[str]) -> dict[str, Any]:
+        """Rank texts best-first. Returns indices into `texts` plus metadata.
+
+        `feedback` holds judge-shaped fields (scores, issues, revision_plan) for
+        the winner from the deciding listwise call or, when no call decided
+        it, from the last call the winner won. It is empty only if no call
+        ever gave feedback for the winner.
+        """
+        calls_before = self.calls
+        unique: list[str] = list(dict.fromkeys(texts))
+        if len(unique) <= self.listwise_max:
+            order_unique, method, result = self._rank_small(unique)
+        else:
+            order_unique, result = self._tournament(unique)
+            method = "tournament"
+        ranked_texts = [unique[at] for at in order_unique]
+        order = sorted(range(len(texts)), key=lambda i: (ranked_texts.index(texts[i]), i))
+        rationale = str(result.get("rationale", "")).strip()
+        feedback = result.get("best_candidate_feedback")
+        if not (isinstance(feedback, dict) and feedback) and ranked_texts:
+            with self._lock:
+                rationale, feedback = self._verdicts.get(ranked_texts[0], (rationale, {}))
+        return {
+            "order": order,
+            "winner": order[0] if order else None,
+            "method": method,
+            "calls": self.calls - calls_before,
+            "rationale": rationale,
+            "feedback": feedback if isinstance(feedback, dict) else {},
+        }
+
+    def stats(self) -> dict[str, int]:
+        return {"calls": self.calls, "cached_comparisons": self.cached_comparisons}
+
+
+def rank_iterations(engine: RankingEngine, iteration_logs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Rank iteration results; adds `selected_iteration` to the ranking result."""
+    result = engine.rank([str(item.get("translation", "")) for item in iteration_logs])
+    winner = result["winner"] or 0
+    result["selected_iteration"] = iteration_logs[winner].get("iteration", winner + 1)
+    return result
@@ -0,0 +1,113 @@
+"""Streaming report sink for long runs.
+
+The full report is rendered only once the whole run is done. Until then,
+`ReportSink` keeps an in-progress `.md` up to date. As each paragraph
+finishes, its section is appended and its final translation is printed to
+stdout. A long run therefore shows results as it goes, and a run that dies
+still leaves every finished paragraph on disk.
+
+Paragraphs may finish out of order with parallel workers, reused paragraphs
+or chunked paragraphs. A small reorder buffer holds each one until every
+paragraph before it has been written.
+
+The header is published with a temp file and a rename. Each batch of
+released sections is then appended to the report itself with an `O_APPEND`
+write and synced, so a finished paragraph is on disk as soon as stdout shows it and
+a section costs only its own bytes. With `publish_interval` above zero,
+released sections are held in memory and appended at most once per interval
+and when the sink is closed.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable
+
+
+class ReportSink:
+    def __init__(
+        self,
+        path: Path,
+        header: str,
+        paragraph_numbers: list[int],
+        render_section_fn: Callable[[dict[str, Any]], str],
+        echo_fn: Callable[[str], None] = print,
+        publish_interval: float = 0.0,
+    ) -> None:
+        self.path = path
+        self._render_section = render_section_fn
+        self._echo = echo_fn
+        self._order = list(paragraph_numbers)
+        self._next = 0
+        self._waiting: dict[int, list[dict[str, Any]]] = {}
+        self._complete: set[int] = set()
+        self._lock = threading.Lock()
+        self._publish_interval = publish_interval
+        self._pending: list[bytes] = []
+        self._replace(header)
+        self._report = self.path.open("ab", buffering=0)
+        self._published_at = time.monotonic()
+
+    def _replace(self, text: str) -> None:
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as handle:
+            handle.write(text.encode("utf-8"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, self.path)
+
+    def _append_pending(self) -> None:
+        if self._pending:
+            data = memoryview(b"".join(self._pending))
+            while data:
+                data = data[self._report.write(data) :]
+            os.fsync(self._report.fileno())
+            self._pending.clear()
+        self._published_at = time.monotonic()
+
+    def _release(self) -> None:
+        if not self._report.closed:
+            self._report.close()
+
+    def add(self, paragraph: dict[str, Any]) -> None:
+        """Accept a finished paragraph (or chunk) from any thread, in any order.
+
+        Chunks of one paragraph arrive in order, and the last one carries
+        `chunk.number == chunk.count`.
+        """
+        number = int(paragraph["paragraph_index"])
+        chunk = paragraph.get("chunk")
+        with self._lock:
+            self._waiting.setdefault(number, []).append(paragraph)
+            if not chunk or chunk["number"] == chunk["count"]:
+                self._complete.add(number)
+            ready: list[dict[str, Any]] = []
+            while self._next < len(self._order):
+                head = self._order[self._next]
+                ready.extend(self._waiting.pop(head, []))
+                if head not in self._complete:
+                    break
+                self._next += 1
+            if not ready:
+                return
+            self._pending.append("".join(self._render_section(part) for part in ready).encode("utf-8"))
+            if time.monotonic() - self._published_at >= self._publish_interval:
+                self._append_pending()
+            for part in ready:
+                self._echo(part["final_synthesis"].get("final_translation", "").strip() + "\n")
+
+    def close(self) -> None:
+        """Append any held sections and close the report."""
+        with self._lock:
+            if self._report.closed:
+                return
+            self._append_pending()
+            self._release()
+
+    def finish(self, report: str) -> None:
+        """Replace the in-progress file with the complete report."""
+        with self._lock:
+            self._release()
+            self._replace(report)
@@ -0,0 +1,145 @@
+"""Compact in-memory paragraph results with heavy fields spilled to disk.
+
+A finished paragraph carries far more than the report's final text. Its
+iteration logs hold raw translate and judge payloads, phrase notes and
+observations, and a debate adds every agent's critiques. On a whole-work run,
+keeping all of that until the report is written grows without bound.
+
+`ResultSpill.compact` turns a finished paragraph dict into a `ParagraphResult`.
+It appends the heavy fields to `runs/spill/<run_id>.jsonl` and keeps only
+their byte offset. The index, Greek, final synthesis, agent versions and the
+small summary fields (convergence, usage, timing, ranking, chunk) stay in
+memory. `ParagraphResult` reads like the original dict. A spilled field is
+loaded from disk only when something asks for it, such as the debate cost
+lines in the report.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator, MutableMapping
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import threading
+from typing import Any
+
+SPILL_DIR = Path("runs/spill")
+
+# Per-paragraph fields that can be large: iteration logs, agent logs,
+# critiques and the reference texts already held by the source.
+HEAVY_FIELDS = (
+    "sequential_iterations",
+    "cognitive_iterations",
+    "agents",
+    "debate_round_summaries",
+    "reference_translations",
+)
+
+
+class ResultSpill:
+    """Append-only JSONL of spilled paragraph fields for one run."""
+
+    def __init__(self, run_id: str, directory: Path = SPILL_DIR) -> None:
+        self.path = directory / f"{run_id}.jsonl"
+        self._lock = threading.Lock()
+
+    def append(self, fields: dict[str, Any]) -> tuple[int, int]:
+        data = (json.dumps(fields, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as handle:
+                offset = handle.tell()
+                handle.write(data)
+        return offset, len(data)
+
+    def read(self, offset: int, length: int) -> dict[str, Any]:
+        with self.path.open("rb") as handle:
+            handle.seek(offset)
+            return json.loads(handle.read(length).decode("utf-8"))
+
+    def compact(self, paragraph: dict[str, Any]) -> ParagraphResult:
+        if isinstance(paragraph, ParagraphResult):
+            return paragraph
+        summary = dict(paragraph)
+        heavy = {name: summary.pop(name) for name in HEAVY_FIELDS if name in summary}
+        spilled = None
+        if heavy:
+            offset, length = self.append(heavy)
+            spilled = SpilledFields(self, offset, length, tuple(heavy))
+        return ParagraphResult(
+            paragraph_index=int(summary.pop("paragraph_index")),
+            greek=str(summary.pop("greek", "")),
+            final_synthesis=summary.pop("final_synthesis", {}),
+            final_agent_versions=summary.pop("final_agent_versions", {}),
+            summary=summary,
+            spilled=spilled,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SpilledFields:
+    spill: ResultSpill
+    offset: int
+    length: int
+    names: tuple[str, ...]
+
+    def load(self) -> dict[str, Any]:
+        return self.spill.read(self.offset, self.length)
+
+
+@dataclass(slots=True)
+class ParagraphResult(MutableMapping[str, Any]):
+    """One finished paragraph; reads like the runner's dict, heavy fields lazily."""
+
+    paragraph_index: int
+    greek: str
+    final_synthesis: dict[str, Any]
+    final_agent_versions: dict[str, str]
+    summary: dict[str, Any] = field(default_factory=dict)
+    spilled: SpilledFields | None = None
+
+    _CORE = ("paragraph_index", "greek", "final_synthesis", "final_agent_versions")
+
+    @property
+    def final_translation(self) -> str:
+        return str(self.final_synthesis.get("final_translation", "")).strip()
+
+    def _spilled_names(self) -> tuple[str, ...]:
+        return self.spilled.names if self.spilled is not None else ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._CORE:
+            return getattr(self, key)
+        if key in self.summary:
+            return self.summary[key]
+        if key in self._spilled_names():
+            return self.spilled.load()[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._CORE:
+            setattr(self, key, value)
+        else:
+            self.summary[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.summary[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._CORE or key in self.summary or key in self._spilled_names()
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._CORE
+        yield from self.summary
+        yield from self._spilled_names()
+
+    def __len__(self) -> int:
+        return len(self._CORE) + len(self.summary) + len(self._spilled_names())
+
+    def to_dict(self) -> dict[str, Any]:
+        """The full paragraph, spilled fields included, e.g. for the paragraph memo."""
+        spilled = self.spilled.load() if self.spilled is not None else {}
+        return {name: getattr(self, name) for name in self._CORE} | self.summary | spilled
+
+
+def as_dict(paragraph: dict[str, Any] | ParagraphResult) -> dict[str, Any]:
+    return paragraph.to_dict() if isinstance(paragraph, ParagraphResult) else paragraph
@@ -2,16 +2,26 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 import json
-import sys
+import time
 from typing import Any, Callable
 
 from openai import OpenAI
-from translation_feedback_mechanisms import (
-    compute_smoothness_feedback_from_perplexity,
-    format_smoothness_feedback_for_prompt,
+
+from .candidates import candidate_temperatures, prerank_candidates
+from .checkpoint import update_scope
+from .common import (
+    map_parallel,
+    reference_context_block,
+    reference_translations_for_index,
+    run_paragraphs,
 )
+from .convergence import ConvergencePolicy, ConvergenceTracker, mean_score
+from .events import Event, log_event
+from .feedback import FeedbackOrchestrator, PendingFeedback
+from .ranking import RankingContext, RankingEngine, rank_iterations
+from .results import ResultSpill
 
-from .common import reference_context_block, reference_translations_for_index
+FEEDBACK_MODES = ("blocking", "async")
 
 
 def distilled_judgment_guidance(previous_judgment: dict[str, Any]) -> str:
@@ -63,6 +73,7 @@ def sequential_translate_prompt(
     iteration: int,
     previous_translation: str | None,
     previous_judgment: dict[str, Any] | None,
+    previous_feedback: str | None = None,
 ) -> tuple[str, str]:
     system = (
         "You are a single translation agent iterating on one Ancient Greek paragraph. "
@@ -81,6 +92,12 @@ def sequential_translate_prompt(
             "\nCarry-forward guidance from previous judgment:\n"
             f"{distilled}\n"
         )
+    if previous_feedback:
+        previous_judgment_block += (
+            "\nAutomatic feedback on the previous translation "
+            "(secondary signal only; never let it override faithfulness or source logic):\n"
+            f"{previous_feedback}\n"
+        )
     user = f"""
 Paragraph {paragraph_index} Greek:
 {greek}
@@ -134,6 +151,7 @@ def sequential_judge_prompt(
     goals_guidance: str,
     iteration: int,
     external_feedback_summary: str | None,
+    external_feedback_heading: str = "perplexity feedback",
 ) -> tuple[str, str]:
     system = (
         "You are a strict self-critic for a translation iteration. "
@@ -143,7 +161,7 @@ def sequential_judge_prompt(
     external_feedback_block = ""
     if external_feedback_summary:
         external_feedback_block = f"""
-Optional perplexity feedback (secondary signal only):
+Optional {external_feedback_heading} (secondary signal only):
 {external_feedback_summary}
 """
     user = f"""
@@ -175,7 +193,7 @@ Also judge with these priorities:
 10) Give concrete rewrite proposals, not generic feedback.
 11) Penalize constructions that explain abstract relations indirectly when a direct plain-language outcome would be clearer.
 12) Penalize lexical/style borrowing from reference translations when fresh plain wording would preserve meaning.
-13) Treat perplexity feedback as weak and local; never let it override faithfulness or source logic.
+13) Treat {external_feedback_heading} as weak and local; never let it override faithfulness or source logic.
 
 Return strict JSON with exactly these keys:
 {{
@@ -330,27 +348,39 @@ def run_sequential_pipeline(
     goals_guidance: str,
     dryden_paragraphs: list[str],
     perrin_paragraphs: list[str],
-    feedback_model: str | None = None,
-    compute_feedback_fn: Callable[..., dict[str, Any]] = compute_smoothness_feedback_from_perplexity,
-    format_feedback_fn: Callable[[dict[str, Any]], str] = format_smoothness_feedback_for_prompt,
+    feedback: FeedbackOrchestrator | None = None,
+    convergence: ConvergencePolicy | None = None,
+    paragraph_workers: int = 1,
+    paragraph_numbers: list[int] | None = None,
+    on_paragraph_done: Callable[[dict[str, Any]], None] | None = None,
+    result_spill: ResultSpill | None = None,
+    candidates: int = 1,
+    judge_top_k: int = 1,
+    selection: str = "prompt",
+    feedback_mode: str = "blocking",
 ) -> dict[str, Any]:
-    paragraphs: list[dict[str, Any]] = []
+    if feedback_mode not in FEEDBACK_MODES:
+        raise ValueError(f"Unsupported feedback mode: {feedback_mode}")
+    background_feedback = feedback is not None and feedback_mode == "async"
     color_enabled = should_use_color_fn(color_mode)
     normalized_preference = normalize_user_preference_fn(user_preference)
 
-    def vprint(
-        message: str,
-        agent_key: str | None = None,
-        stage: str | None = None,
-    ) -> None:
-        if not verbose:
-            return
-        color: str | None = None
-        if agent_key:
-            color = agent_colors.get(agent_key)
-        elif stage:
-            color = stage_colors.get(stage)
-        print(colorize_fn(message, color, color_enabled), file=sys.stderr)
+    def make_paragraph_vprint(emit: Callable[[Event], None]) -> Callable[..., None]:
+        def vprint(
+            message: str,
+            agent_key: str | None = None,
+            stage: str | None = None,
+        ) -> None:
+            if not verbose:
+                return
+            color: str | None = None
+            if agent_key:
+                color = agent_colors.get(agent_key)
+            elif stage:
+                color = stage_colors.get(stage)
+            emit(log_event(message, color, color_enabled=color_enabled, colorize_fn=colorize_fn))
+
+        return vprint
 
     def score_line(scores: Any) -> str:
         if not isinstance(scores, dict):
@@ -360,7 +390,9 @@ def run_sequential_pipeline(
         m = scores.get("modernity", "n/a")
         return f"faithfulness={f}, readability={r}, modernity={m}"
 
-    for idx, greek in enumerate(greek_paragraphs, start=1):
+    def run_paragraph(idx: int, greek: str, emit: Callable[[Event], None]) -> dict[str, Any]:
+        started_at = time.perf_counter()
+        vprint = make_paragraph_vprint(emit)
         vprint(f"[paragraph {idx}] sequential iteration pipeline...", stage="iteration")
         vprint(
             f"[paragraph {idx}] user preference prompt: {normalized_preference}",
@@ -387,8 +419,57 @@ def run_sequential_pipeline(
         current_translation = ""
         current_judgment: dict[str, Any] | None = None
         iteration_logs: list[dict[str, Any]] = []
+        tracker = ConvergenceTracker(convergence, iterations)
+        ranking: RankingEngine | None = None
+        champion: dict[str, Any] | None = None
+        # Feedback bookkeeping: seconds the loop blocked on it, and for each
+        # iteration which prompt each mechanism's result reached (None = late).
+        feedback_waits: list[float] = []
+        feedback_used: dict[int, dict[str, str | None]] = {}
+        pending_feedback: dict[int, PendingFeedback] = {}
+
+        def fold_feedback(row: dict[str, Any], used_in: str | None) -> str:
+            """Attach whatever background feedback has finished for an iteration.
+
+            With `used_in=None` the results are only recorded on the log; no
+            prompt sees them, so they still count as late.
+            """
+            assert feedback is not None
+            report = feedback.gather(pending_feedback[row["iteration"]], wait=False)
+            used = feedback_used.setdefault(row["iteration"], dict.fromkeys(feedback.names))
+            for name in used:
+                if used_in is not None and used[name] is None and name not in report["late"]:
+                    used[name] = used_in
+            step = row["translation_step"]
+            step["external_feedback"] = report["results"]
+            step["external_feedback_summary"] = report["summary"]
+            vprint(
+                f"[paragraph {idx}] [iter {row['iteration']}] [sequential] {feedback.heading} "
+                f"(for {used_in or 'the log only'}; late: {', '.join(report['late']) or 'none'}): "
+                f"{report['summary']}",
+                stage="reference",
+            )
+            return report["summary"]
+
+        if selection == "ranking":
+            ranking = RankingEngine(
+                lambda system, user, temperature: call_json_fn(
+                    client, model, system, user, temperature=temperature
+                ),
+                RankingContext(
+                    greek=greek,
+                    paragraph_index=idx,
+                    reference_translations=reference_translations,
+                    user_preference=normalized_preference,
+                    goals_guidance=goals_guidance,
+                ),
+            )
 
         for it in range(1, iterations + 1):
+            update_scope(iteration=it)
+            previous_feedback = ""
+            if background_feedback and iteration_logs:
+                previous_feedback = fold_feedback(iteration_logs[-1], "translate")
             vprint(f"[paragraph {idx}] [iter {it}] translate...", stage="iteration")
             system, user = sequential_translate_prompt(
                 greek=greek,
@@ -399,26 +480,134 @@ def run_sequential_pipeline(
                 iteration=it,
                 previous_translation=current_translation or None,
                 previous_judgment=current_judgment,
+                previous_feedback=previous_feedback or None,
             )
-            translation_result = call_json_fn(client, model, system, user, temperature=0.45)
-            current_translation = str(translation_result.get("translation", "")).strip()
-            observations = str(translation_result.get("observations", "")).strip()
-            external_feedback_summary = ""
 
-            if feedback_model and current_translation:
-                feedback_payload = compute_feedback_fn(
-                    client=client,
-                    model=feedback_model,
-                    text=current_translation,
+            def translate(temperature: float) -> dict[str, Any]:
+                update_scope(stage="translate")
+                return call_json_fn(client, model, system, user, temperature=temperature)
+
+            def judge(candidate: dict[str, Any]) -> dict[str, Any]:
+                text = candidate["translation"]
+                step = candidate["translation_step"]
+                external_feedback_summary = ""
+                if background_feedback and text:
+                    # Scored while the judge runs; folded into a later prompt.
+                    feedback.start(greek=greek, translation=text)
+                elif feedback is not None and text:
+                    waited = time.perf_counter()
+                    report = feedback.collect(greek=greek, translation=text)
+                    feedback_waits.append(time.perf_counter() - waited)
+                    external_feedback_summary = report["summary"]
+                    step["external_feedback"] = report["results"]
+                    step["external_feedback_summary"] = external_feedback_summary
+                    step["external_feedback_late"] = report["late"]
+                system, user = sequential_judge_prompt(
+                    greek=greek,
+                    paragraph_index=idx,
+                    translation=text,
+                    reference_translations=reference_translations,
+                    user_preference=normalized_preference,
+                    goals_guidance=goals_guidance,
+                    iteration=it,
+                    external_feedback_summary=external_feedback_summary or None,
+                    external_feedback_heading=feedback.heading if feedback is not None else "perplexity feedback",
                 )
-                external_feedback_summary = format_feedback_fn(feedback_payload).strip()
-                translation_result["external_feedback"] = feedback_payload
-                translation_result["external_feedback_summary"] = external_feedback_summary
+                update_scope(stage="judge")
+                return call_json_fn(client, model, system, user, temperature=0.3)
+
+            candidate_records: list[dict[str, Any]] = []
+            if candidates > 1:
+                temperatures = candidate_temperatures(candidates)
+                drafts = map_parallel(translate, temperatures)
+                perplexities: dict[str, dict[str, Any]] | None = None
+                if feedback is not None and "perplexity" in feedback.names:
+                    # Every candidate is scored at once; the judge reuses the cached results.
+                    texts = {str(draft.get("translation", "")).strip() for draft in drafts} - {""}
+                    perplexities = feedback.score("perplexity", greek=greek, translations=sorted(texts))
+                candidate_records = prerank_candidates(
+                    drafts,
+                    temperatures,
+                    reference_translations,
+                    perplexities=perplexities,
+                    user_preference=normalized_preference,
+                )
+                shortlist = [r for r in candidate_records if r["duplicate_of"] is None][:judge_top_k]
+                for record in candidate_records:
+                    status = (
+                        f"duplicate of {record['duplicate_of']}"
+                        if record["duplicate_of"] is not None
+                        else ("shortlisted" if any(record is s for s in shortlist) else "dropped")
+                    )
+                    vprint(
+                        f"[paragraph {idx}] [iter {it}] candidate {record['candidate']} "
+                        f"(temperature={record['temperature']}): local_score={record['local_score']}, "
+                        f"signals={record['signals']}, {status}",
+                        stage="reference",
+                    )
+            else:
+                draft = translate(0.45)
+                shortlist = [
+                    {
+                        "translation": str(draft.get("translation", "")).strip(),
+                        "translation_step": draft,
+                    }
+                ]
+
+            ranking_log: dict[str, Any] | None = None
+            if ranking is not None:
+                # The best result so far competes with this iteration's drafts, so
+                # one listwise call replaces per-candidate judging and the running
+                # champion is already known when final selection comes around.
+                pool = ([champion] if champion is not None else []) + shortlist
+                vprint(f"[paragraph {idx}] [iter {it}] rank candidates...", stage="iteration")
+                ranked = ranking.rank([r["translation"] for r in pool])
+                chosen = pool[ranked["winner"]]
+                if ranked["feedback"]:
+                    current_judgment = ranked["feedback"]
+                elif chosen is not champion:
+                    current_judgment = None
+                ranking_log = {
+                    "method": ranked["method"],
+                    "calls": ranked["calls"],
+                    "pool_size": len(pool),
+                    "kept_previous_best": champion is not None and chosen is champion,
+                    "rationale": ranked["rationale"],
+                }
+                # The best of this iteration's own drafts, for the stability check.
+                challenger = next(
+                    (pool[at] for at in ranked["order"] if pool[at] is not champion),
+                    shortlist[0],
+                )
+                champion = chosen
                 vprint(
-                    f"[paragraph {idx}] [iter {it}] [sequential] perplexity feedback: "
-                    f"{external_feedback_summary}",
-                    stage="reference",
+                    f"[paragraph {idx}] [iter {it}] ranking: method={ranked['method']}, "
+                    f"calls={ranked['calls']}, "
+                    + ("kept previous best" if ranking_log["kept_previous_best"] else "new best"),
+                    stage="iteration",
+                )
+            elif candidates > 1:
+                vprint(f"[paragraph {idx}] [iter {it}] self-judge shortlist...", stage="iteration")
+                judgments = map_parallel(judge, shortlist)
+                for record, judgment in zip(shortlist, judgments):
+                    record["judge_scores"] = judgment.get("scores", {})
+                best_at = max(
+                    range(len(shortlist)),
+                    key=lambda at: mean_score(judgments[at].get("scores")) or 0.0,
+                )
+                chosen = shortlist[best_at]
+                current_judgment = judgments[best_at]
+                vprint(
+                    f"[paragraph {idx}] [iter {it}] chose candidate {chosen['candidate']}",
+                    stage="iteration",
                 )
+            else:
+                chosen = shortlist[0]
+                current_judgment = None
+
+            translation_result = chosen["translation_step"]
+            current_translation = chosen["translation"]
+            observations = str(translation_result.get("observations", "")).strip()
 
             vprint(
                 f"[paragraph {idx}] [iter {it}] [sequential] observations: {observations}",
@@ -432,18 +621,21 @@ def run_sequential_pipeline(
                 agent_key="modern",
             )
 
-            vprint(f"[paragraph {idx}] [iter {it}] self-judge...", stage="iteration")
-            system, user = sequential_judge_prompt(
-                greek=greek,
-                paragraph_index=idx,
-                translation=current_translation,
-                reference_translations=reference_translations,
-                user_preference=normalized_preference,
-                goals_guidance=goals_guidance,
-                iteration=it,
-                external_feedback_summary=external_feedback_summary or None,
-            )
-            current_judgment = call_json_fn(client, model, system, user, temperature=0.3)
+            if background_feedback and current_translation:
+                # Starts (or joins) the chosen text's mechanisms before its judge call.
+                pending_feedback[it] = feedback.start(greek=greek, translation=current_translation)
+            if current_judgment is None:
+                vprint(f"[paragraph {idx}] [iter {it}] self-judge...", stage="iteration")
+                current_judgment = judge(chosen)
+            if feedback is not None and not background_feedback and "external_feedback" in translation_result:
+                late = translation_result.get("external_feedback_late", [])
+                feedback_used[it] = {name: None if name in late else "judge" for name in feedback.names}
+            if translation_result.get("external_feedback_summary"):
+                vprint(
+                    f"[paragraph {idx}] [iter {it}] [sequential] {feedback.heading if feedback else 'feedback'}: "
+                    f"{translation_result['external_feedback_summary']}",
+                    stage="reference",
+                )
             vprint(
                 f"[paragraph {idx}] [iter {it}] [sequential] judgment: "
                 f"{current_judgment.get('overall_judgment', '')}",
@@ -470,42 +662,88 @@ def run_sequential_pipeline(
                 agent_key="faithful",
             )
 
-            iteration_logs.append(
-                {
-                    "iteration": it,
-                    "translation_step": translation_result,
-                    "judgment_step": current_judgment,
-                    "translation": current_translation,
-                }
+            iteration_log: dict[str, Any] = {
+                "iteration": it,
+                "translation_step": translation_result,
+                "judgment_step": current_judgment,
+                "translation": current_translation,
+            }
+            if ranking_log is not None:
+                iteration_log["ranking"] = ranking_log
+            if candidate_records:
+                iteration_log["candidates"] = [
+                    {key: value for key, value in record.items() if key != "translation_step"}
+                    for record in candidate_records
+                ]
+            iteration_logs.append(iteration_log)
+            observed = current_translation
+            if ranking_log is not None and ranking_log["kept_previous_best"]:
+                # The carried-forward text is last iteration's, so measure
+                # stability on this iteration's best draft instead.
+                observed = challenger["translation"]
+            stop_reason = tracker.observe(
+                observed,
+                mean_score(current_judgment.get("scores")),
             )
+            if stop_reason:
+                vprint(f"[paragraph {idx}] [iter {it}] converged: {stop_reason}", stage="iteration")
+                break
 
+        iterations_run = len(iteration_logs)
         final_judgment = current_judgment or {}
         final_translation = current_translation
-        selected_iteration = iterations
-        system, user = sequential_selection_prompt(
-            greek=greek,
-            paragraph_index=idx,
-            reference_translations=reference_translations,
-            user_preference=normalized_preference,
-            iteration_logs=iteration_logs,
-        )
-        selection_result = call_json_fn(client, model, system, user, temperature=0.25)
-        selected_value = selection_result.get("selected_iteration", iterations)
-        try:
-            selected_iteration = int(selected_value)
-        except (TypeError, ValueError):
-            selected_iteration = iterations
-        if not (1 <= selected_iteration <= len(iteration_logs)):
-            selected_iteration = iterations
-        selected_text = str(selection_result.get("final_translation", "")).strip()
-        if selected_text:
-            final_translation = selected_text
-        selected_scores = selection_result.get("balance_scores")
-        if isinstance(selected_scores, dict):
-            final_judgment = {
-                "overall_judgment": str(selection_result.get("justification", "")).strip(),
-                "scores": selected_scores,
-            }
+        selected_iteration = iterations_run
+        unused_feedback = [
+            row
+            for row in iteration_logs
+            if row["iteration"] in pending_feedback
+            and (
+                row["iteration"] not in feedback_used
+                or None in feedback_used[row["iteration"]].values()
+            )
+        ]
+        if ranking is not None:
+            # The ranking prompts carry no feedback, so anything not folded
+            # into a translate prompt is recorded and stays marked late.
+            for row in unused_feedback:
+                fold_feedback(row, None)
+            ranked = rank_iterations(ranking, iteration_logs)
+            selected_iteration = ranked["selected_iteration"]
+            selected_log = iteration_logs[ranked["winner"]]
+            final_translation = selected_log["translation"]
+            final_judgment = selected_log.get("judgment_step") or {}
+            vprint(
+                f"[paragraph {idx}] final ranking: method={ranked['method']}, calls={ranked['calls']}",
+                stage="final",
+            )
+        else:
+            for row in unused_feedback:
+                fold_feedback(row, "select")
+            system, user = sequential_selection_prompt(
+                greek=greek,
+                paragraph_index=idx,
+                reference_translations=reference_translations,
+                user_preference=normalized_preference,
+                iteration_logs=iteration_logs,
+            )
+            update_scope(stage="select")
+            selection_result = call_json_fn(client, model, system, user, temperature=0.25)
+            selected_value = selection_result.get("selected_iteration", iterations_run)
+            try:
+                selected_iteration = int(selected_value)
+            except (TypeError, ValueError):
+                selected_iteration = iterations_run
+            if not (1 <= selected_iteration <= iterations_run):
+                selected_iteration = iterations_run
+            selected_text = str(selection_result.get("final_translation", "")).strip()
+            if selected_text:
+                final_translation = selected_text
+            selected_scores = selection_result.get("balance_scores")
+            if isinstance(selected_scores, dict):
+                final_judgment = {
+                    "overall_judgment": str(selection_result.get("justification", "")).strip(),
+                    "scores": selected_scores,
+                }
         system, user = sequential_polish_prompt(
             greek=greek,
             paragraph_index=idx,
@@ -513,6 +751,7 @@ def run_sequential_pipeline(
             user_preference=normalized_preference,
             selected_translation=final_translation,
         )
+        update_scope(stage="polish")
         polish_result = call_json_fn(client, model, system, user, temperature=0.55)
         polished_text = str(polish_result.get("polished_translation", "")).strip()
         if polished_text:
@@ -545,26 +784,46 @@ def run_sequential_pipeline(
             stage="final",
         )
 
-        paragraphs.append(
-            {
-                "paragraph_index": idx,
-                "greek": greek,
-                "reference_translations": reference_translations,
-                "sequential_iterations": iteration_logs,
-                "final_agent_versions": {"sequential": final_translation},
-                "final_synthesis": {
-                    "final_translation": final_translation,
-                    "justification": str(final_judgment.get("overall_judgment", "")).strip(),
-                    "balance_scores": final_judgment.get("scores", {}),
-                    "selected_iteration": selected_iteration,
-                    "polish": {
-                        "notes": str(polish_result.get("polish_notes", "")).strip(),
-                        "scores": polish_result.get("balance_scores", {}),
-                    },
+        paragraph: dict[str, Any] = {
+            "paragraph_index": idx,
+            "greek": greek,
+            "reference_translations": reference_translations,
+            "sequential_iterations": iteration_logs,
+            "convergence": tracker.summary(),
+            "final_agent_versions": {"sequential": final_translation},
+            "final_synthesis": {
+                "final_translation": final_translation,
+                "justification": str(final_judgment.get("overall_judgment", "")).strip(),
+                "balance_scores": final_judgment.get("scores", {}),
+                "selected_iteration": selected_iteration,
+                "polish": {
+                    "notes": str(polish_result.get("polish_notes", "")).strip(),
+                    "scores": polish_result.get("balance_scores", {}),
                 },
+            },
+        }
+        if ranking is not None:
+            paragraph["ranking"] = ranking.stats()
+        if feedback is not None:
+            for it in pending_feedback:
+                # Started in the background but never reached a prompt.
+                feedback_used.setdefault(it, dict.fromkeys(feedback.names))
+            paragraph["feedback_timing"] = {
+                "mode": feedback_mode,
+                "wall_seconds": round(time.perf_counter() - started_at, 3),
+                "blocked_seconds": round(sum(feedback_waits), 3),
+                "arrivals": [{"iteration": it, "used_in": feedback_used[it]} for it in sorted(feedback_used)],
             }
-        )
-
+        return paragraph
+
+    paragraphs = run_paragraphs(
+        greek_paragraphs,
+        run_paragraph,
+        workers=paragraph_workers,
+        paragraph_numbers=paragraph_numbers,
+        on_paragraph_done=on_paragraph_done,
+        result_spill=result_spill,
+    )
     full_translation = "\n\n".join(
         p["final_synthesis"].get("final_translation", "").strip() for p in paragraphs
     ).strip()
@@ -583,7 +842,7 @@ def run_sequential_pipeline(
                 "priority": "balanced",
             }
         ],
-        "paragraph_count": len(greek_paragraphs),
+        "paragraph_count": len(paragraphs),
         "paragraphs": paragraphs,
         "final_translation": full_translation,
     }
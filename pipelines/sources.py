@@ -0,0 +1,97 @@
+"""Lazy paragraph sources for translating whole works.
+
+`ParagraphFile` makes a large UTF-8 text or JSONL file look like a read-only
+list of paragraphs. Opening the file scans it once and keeps only a
+byte-offset index, two integers per paragraph. Indexing seeks to a paragraph
+and reads just that one, so pipelines can index it like the built-in lists
+without loading the work into memory.
+
+- Plain text: paragraphs are separated by one or more blank lines.
+- JSONL (`.jsonl`): one paragraph per non-empty line. A line is either a JSON
+  string or an object, and `field` picks the value. Reference files use
+  objects with `dryden_clough` and `perrin` keys; `column()` gives a view of
+  one key that shares the same index.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+import json
+from pathlib import Path
+from typing import overload
+
+
+class ParagraphFile(Sequence[str]):
+    def __init__(self, path: Path, field: str = "greek", *, _index: tuple[array, array] | None = None) -> None:
+        self.path = path
+        self.field = field
+        self.jsonl = path.suffix.lower() == ".jsonl"
+        self._starts, self._ends = _index if _index is not None else self._build_index()
+
+    def _build_index(self) -> tuple[array, array]:
+        starts, ends = array("q"), array("q")
+        offset = 0
+        in_paragraph = False
+        with self.path.open("rb") as handle:
+            for line in handle:
+                blank = not line.strip()
+                if self.jsonl:
+                    if not blank:
+                        starts.append(offset)
+                        ends.append(offset + len(line))
+                elif blank and in_paragraph:
+                    ends.append(offset)
+                    in_paragraph = False
+                elif not blank and not in_paragraph:
+                    starts.append(offset)
+                    in_paragraph = True
+                offset += len(line)
+        if in_paragraph:
+            ends.append(offset)
+        return starts, ends
+
+    def column(self, field: str) -> ParagraphFile:
+        return ParagraphFile(self.path, field, _index=(self._starts, self._ends))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @overload
+    def __getitem__(self, at: int) -> str: ...
+
+    @overload
+    def __getitem__(self, at: slice) -> list[str]: ...
+
+    def __getitem__(self, at: int | slice) -> str | list[str]:
+        if isinstance(at, slice):
+            return [self[i] for i in range(*at.indices(len(self)))]
+        start, end = self._starts[at], self._ends[at]
+        # Each read opens the file itself, so paragraph workers never share a handle.
+        with self.path.open("rb") as handle:
+            handle.seek(start)
+            raw = handle.read(end - start).decode("utf-8")
+        if not self.jsonl:
+            return raw.strip()
+        entry = json.loads(raw)
+        if isinstance(entry, dict):
+            return str(entry.get(self.field) or "").strip()
+        return str(entry).strip()
+
+
+class ReplacedParagraph(Sequence[str]):
+    """`paragraphs` with entry `index` (1-based) read as `text`, without copying."""
+
+    def __init__(self, paragraphs: Sequence[str], index: int, text: str) -> None:
+        self._paragraphs = paragraphs
+        self._at = index - 1
+        self._text = text
+
+    def __len__(self) -> int:
+        return len(self._paragraphs)
+
+    def __getitem__(self, at):  # type: ignore[override]
+        if isinstance(at, slice):
+            return [self[i] for i in range(*at.indices(len(self)))]
+        if at == self._at or (at < 0 and at + len(self) == self._at):
+            return self._text
+        return self._paragraphs[at]
@@ -0,0 +1,295 @@
+"""Lightweight span tracing with Chrome trace and HTML timeline export.
+
+`span(name, cat, **args)` times a block of code. With no active `Tracer` it
+does nothing, so the spans can stay in the code permanently. `main.py --trace`
+starts a tracer and, at the end of the run, writes:
+- `runs/traces/<run_id>.trace.json`, in Chrome trace-event format, for
+  chrome://tracing or https://ui.perfetto.dev;
+- `runs/traces/<run_id>.html`, a self-contained timeline with one lane per
+  thread, the critical path, peak concurrency per category and the time spent
+  in each category.
+
+Each span records its parent, so nesting works across threads: pool tasks
+started with `submit_in_context` inherit the caller's current span.
+
+Categories: `paragraph`, `stage` (one pipeline call, named after its scope
+stage), `http` (one provider or llama.cpp request attempt), `retry` (the sleep
+before a retry), `wait` (a thread-pool barrier or a feedback deadline) and
+`feedback` (one external feedback mechanism, such as perplexity).
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import contextvars
+from dataclasses import dataclass
+import html
+import itertools
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Iterator
+
+from .checkpoint import current_scope
+
+TRACE_DIR = Path("runs/traces")
+
+CATEGORY_COLORS = {
+    "paragraph": "#c7d2fe",
+    "stage": "#60a5fa",
+    "http": "#34d399",
+    "retry": "#f87171",
+    "wait": "#fbbf24",
+    "feedback": "#a78bfa",
+}
+
+_SPAN: contextvars.ContextVar[int | None] = contextvars.ContextVar("trace_span", default=None)
+_ACTIVE: Tracer | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    span_id: int
+    parent_id: int | None
+    name: str
+    cat: str
+    start_ns: int
+    end_ns: int
+    thread: int
+    thread_name: str
+    args: dict[str, Any]
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+@contextmanager
+def span(name: str, cat: str = "stage", **args: Any) -> Iterator[None]:
+    tracer = _ACTIVE
+    if tracer is None:
+        yield
+        return
+    span_id = next(tracer._ids)
+    parent_id = _SPAN.get()
+    token = _SPAN.set(span_id)
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    except BaseException as exc:
+        args["error"] = type(exc).__name__
+        raise
+    finally:
+        end_ns = time.perf_counter_ns()
+        _SPAN.reset(token)
+        thread = threading.current_thread()
+        tracer._spans.append(
+            Span(span_id, parent_id, name, cat, start_ns, end_ns, thread.ident or 0, thread.name, args)
+        )
+
+
+class Tracer:
+    def __init__(self, run_id: str, directory: Path = TRACE_DIR) -> None:
+        self.run_id = run_id
+        self.trace_path = directory / f"{run_id}.trace.json"
+        self.html_path = directory / f"{run_id}.html"
+        # list.append is atomic, so spans from any thread need no lock.
+        self._spans: list[Span] = []
+        self._ids = itertools.count(1)
+
+    def start(self) -> Tracer:
+        global _ACTIVE
+        _ACTIVE = self
+        return self
+
+    def close(self) -> None:
+        global _ACTIVE
+        if _ACTIVE is self:
+            _ACTIVE = None
+
+    @property
+    def spans(self) -> list[Span]:
+        return sorted(self._spans, key=lambda item: item.start_ns)
+
+    def wrap(self, call_json_fn: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+        """Drop-in `call_json_fn` with one `stage` span per call."""
+
+        def call(
+            client: Any,
+            model: str,
+            system_prompt: str,
+            user_prompt: str,
+            **kwargs: Any,
+        ) -> dict[str, Any]:
+            scope = current_scope()
+            with span(str(scope.get("stage") or "call"), "stage", **scope):
+                return call_json_fn(client, model, system_prompt, user_prompt, **kwargs)
+
+        return call
+
+    def write(self) -> None:
+        """Write the Chrome trace and the HTML timeline."""
+        spans = self.spans
+        self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+        self.trace_path.write_text(
+            json.dumps(chrome_trace(spans), ensure_ascii=False, default=str, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        self.html_path.write_text(render_timeline_html(spans, title=f"Run {self.run_id}"), encoding="utf-8")
+
+
+def chrome_trace(spans: list[Span]) -> dict[str, Any]:
+    origin = min((item.start_ns for item in spans), default=0)
+    events: list[dict[str, Any]] = []
+    # Thread idents are reused once a pool shuts down, so each (ident, name) gets its own tid.
+    tids: dict[tuple[int, str], int] = {}
+    for item in spans:
+        key = (item.thread, item.thread_name)
+        if key not in tids:
+            tids[key] = len(tids) + 1
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tids[key], "args": {"name": key[1]}})
+    for item in spans:
+        events.append(
+            {
+                "name": item.name,
+                "cat": item.cat,
+                "ph": "X",
+                "pid": 1,
+                "tid": tids[(item.thread, item.thread_name)],
+                "ts": (item.start_ns - origin) / 1000,
+                "dur": (item.end_ns - item.start_ns) / 1000,
+                "args": {**item.args, "span_id": item.span_id, "parent_id": item.parent_id},
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def critical_path(spans: list[Span]) -> list[Span]:
+    """The chain of spans that ends the run: the last finisher, then back in time.
+
+    From the span that ends last, step back to the latest-ending span that
+    finished before it started, and so on. Only leaf work counts (`stage`,
+    `http`, `retry`, `feedback`), so a long wait is a gap between links.
+    """
+    work = sorted(
+        (item for item in spans if item.cat in ("stage", "http", "retry", "feedback")),
+        key=lambda item: item.end_ns,
+    )
+    # Within a stage, its http and retry children carry the detail.
+    parents = {item.parent_id for item in work}
+    work = [item for item in work if item.span_id not in parents]
+    path: list[Span] = []
+    cursor = None
+    for item in reversed(work):
+        if cursor is None or item.end_ns <= cursor.start_ns:
+            path.append(item)
+            cursor = item
+    return list(reversed(path))
+
+
+def peak_concurrency(spans: list[Span], cat: str) -> int:
+    edges = sorted(
+        [(item.start_ns, 1) for item in spans if item.cat == cat]
+        + [(item.end_ns, -1) for item in spans if item.cat == cat]
+    )
+    running = peak = 0
+    for _, step in edges:
+        running += step
+        peak = max(peak, running)
+    return peak
+
+
+def render_timeline_html(spans: list[Span], *, title: str) -> str:
+    if not spans:
+        return f"<!doctype html><meta charset='utf-8'><title>{html.escape(title)}</title><p>No spans recorded.</p>"
+    origin = min(item.start_ns for item in spans)
+    total = max(item.end_ns for item in spans) - origin or 1
+    width = 1400
+    lane_height = 14
+    label_width = 160
+    scale = (width - label_width) / total
+    on_path = {item.span_id for item in critical_path(spans)}
+
+    by_id = {item.span_id: item for item in spans}
+    threads: dict[tuple[int, str], list[Span]] = {}
+    for item in spans:
+        threads.setdefault((item.thread, item.thread_name), []).append(item)
+
+    def depth(item: Span) -> int:
+        level = 0
+        parent = by_id.get(item.parent_id) if item.parent_id else None
+        while parent is not None and (parent.thread, parent.thread_name) == (item.thread, item.thread_name):
+            level += 1
+            parent = by_id.get(parent.parent_id) if parent.parent_id else None
+        return level
+
+    rows: list[str] = []
+    y = 24
+    for thread, items in sorted(threads.items(), key=lambda entry: min(item.start_ns for item in entry[1])):
+        depths = {item.span_id: depth(item) for item in items}
+        lanes = max(depths.values()) + 1
+        rows.append(
+            f"<text x='4' y='{y + 11}' class='label'>{html.escape(items[0].thread_name)}</text>"
+            f"<line x1='0' x2='{width}' y1='{y - 2}' y2='{y - 2}' class='sep'/>"
+        )
+        for item in items:
+            x = label_width + (item.start_ns - origin) * scale
+            bar = max(1.0, (item.end_ns - item.start_ns) * scale)
+            tip = f"{item.cat}: {item.name} — {item.seconds * 1000:.1f} ms"
+            details = ", ".join(f"{key}={value}" for key, value in item.args.items())
+            if details:
+                tip += f"\n{details}"
+            stroke = " class='critical'" if item.span_id in on_path else ""
+            rows.append(
+                f"<rect x='{x:.1f}' y='{y + depths[item.span_id] * lane_height}' width='{bar:.1f}' "
+                f"height='{lane_height - 2}' fill='{CATEGORY_COLORS.get(item.cat, '#9ca3af')}'{stroke}>"
+                f"<title>{html.escape(tip)}</title></rect>"
+            )
+        y += lanes * lane_height + 6
+
+    totals: dict[str, float] = {}
+    for item in spans:
+        totals[item.cat] = totals.get(item.cat, 0.0) + item.seconds
+    summary = "".join(
+        f"<tr><td><span class='swatch' style='background:{CATEGORY_COLORS.get(cat, '#9ca3af')}'></span>{cat}</td>"
+        f"<td>{sum(1 for item in spans if item.cat == cat)}</td><td>{seconds:.2f}</td>"
+        f"<td>{peak_concurrency(spans, cat)}</td></tr>"
+        for cat, seconds in sorted(totals.items(), key=lambda entry: -entry[1])
+    )
+
+    def describe(item: Span) -> str:
+        # An http or retry span is named after the request; its stage says what it was for.
+        parent = by_id.get(item.parent_id) if item.parent_id else None
+        if parent is None or parent.cat != "stage":
+            return item.name
+        where = ", ".join(f"{key} {parent.args[key]}" for key in ("paragraph", "iteration", "agent") if key in parent.args)
+        return f"{parent.name} ({where}): {item.name}" if where else f"{parent.name}: {item.name}"
+
+    path = critical_path(spans)
+    path_rows = "".join(
+        f"<tr><td>{(item.start_ns - origin) / 1e9:.2f}</td><td>{item.cat}</td><td>{html.escape(describe(item))}</td>"
+        f"<td>{item.seconds:.2f}</td><td>{html.escape(item.thread_name)}</td></tr>"
+        for item in path
+    )
+    busy = sum(item.seconds for item in path)
+    return f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>
+body {{ font: 13px system-ui, sans-serif; margin: 16px; }}
+.label {{ font: 11px monospace; }}
+.sep {{ stroke: #e5e7eb; }}
+.critical {{ stroke: #111827; stroke-width: 1.5; }}
+table {{ border-collapse: collapse; margin: 8px 0 16px; }}
+td, th {{ border: 1px solid #e5e7eb; padding: 2px 8px; text-align: left; }}
+.swatch {{ display: inline-block; width: 10px; height: 10px; margin-right: 6px; }}
+</style></head><body>
+<h1>{html.escape(title)}</h1>
+<p>Wall time {total / 1e9:.2f}s, {len(spans)} spans on {len(threads)} threads.
+Critical path: {len(path)} spans, {busy:.2f}s of work; the rest of the wall time is waiting between them.
+Outlined bars are on the critical path. Hover a bar for its details.</p>
+<table><tr><th>Category</th><th>Spans</th><th>Total seconds</th><th>Peak concurrent</th></tr>{summary}</table>
+<svg width="{width}" height="{y + 10}" xmlns="http://www.w3.org/2000/svg">{"".join(rows)}</svg>
+<h2>Critical path</h2>
+<table><tr><th>Start (s)</th><th>Category</th><th>Name</th><th>Seconds</th><th>Thread</th></tr>{path_rows}</table>
+</body></html>
+"""
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from pipelines.catalog import CATALOG_PATH
+
+GROUPS = {
+    "none": None,
+    "run": "r.run_id",
+    "script": "r.script",
+    "pipeline": "r.pipeline",
+    "model": "r.model",
+    "preference": "r.user_preference",
+    "stage": "s.stage",
+    "iteration": "s.iteration",
+    "paragraph": "s.paragraph",
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query the run catalog (runs/catalog.sqlite).")
+    parser.add_argument("--catalog", default=str(CATALOG_PATH), help="Catalog database path.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def with_filters(command: argparse.ArgumentParser) -> argparse.ArgumentParser:
+        command.add_argument("--script", default="", help="Only runs of this script (main, theseus_paragraph3, ...).")
+        command.add_argument("--pipeline", default="", help="Only runs of this pipeline.")
+        command.add_argument("--model", default="", help="Only runs with this model.")
+        command.add_argument(
+            "--preference",
+            default="",
+            help="Only runs whose user preference contains this text (case-insensitive).",
+        )
+        command.add_argument("--since", default="", help="Only runs started on or after this ISO date.")
+        return command
+
+    runs = with_filters(commands.add_parser("runs", help="List recent runs."))
+    runs.add_argument("--limit", type=int, default=20)
+
+    scores = with_filters(commands.add_parser("scores", help="Average a score metric across runs."))
+    scores.add_argument("--metric", required=True, help="e.g. readability, faithfulness, modernity, score.")
+    scores.add_argument("--stage", default="", help="Only scores from this stage (judge, translate, compare, ...).")
+    scores.add_argument(
+        "--kind",
+        default="",
+        help="Only this score field (scores, self_scores, balance_scores, score).",
+    )
+    scores.add_argument("--group-by", choices=sorted(GROUPS), default="none")
+
+    costs = with_filters(commands.add_parser("costs", help="Calls, estimated tokens and wall time per group."))
+    costs.add_argument("--group-by", choices=["script", "pipeline", "model", "preference", "run"], default="pipeline")
+    costs.add_argument("--price-prompt", type=float, default=0.0, help="USD per million prompt tokens.")
+    costs.add_argument("--price-completion", type=float, default=0.0, help="USD per million completion tokens.")
+
+    passages = with_filters(commands.add_parser("passages", help="Odyssey comparison scores per translator."))
+    passages.add_argument("--translator", default="")
+
+    sql = commands.add_parser("sql", help="Run a read-only SQL query.")
+    sql.add_argument("query")
+    return parser.parse_args()
+
+
+def run_filters(args: argparse.Namespace) -> tuple[list[str], list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    for column, value in (("r.script", args.script), ("r.pipeline", args.pipeline), ("r.model", args.model)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if args.preference:
+        clauses.append("r.user_preference LIKE ?")
+        params.append(f"%{args.preference}%")
+    if args.since:
+        clauses.append("r.started_at_utc >= ?")
+        params.append(args.since)
+    return clauses, params
+
+
+def build_query(args: argparse.Namespace) -> tuple[str, list[Any]]:
+    if args.command == "sql":
+        return args.query, []
+    clauses, params = run_filters(args)
+    if args.command == "runs":
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return (
+            "SELECT r.run_id, r.script, r.pipeline, r.model, r.iterations, r.wall_seconds, r.calls, "
+            f"substr(r.user_preference, 1, 40) AS preference FROM runs r {where} "
+            "ORDER BY r.started_at_utc DESC LIMIT ?",
+            params + [args.limit],
+        )
+    if args.command == "scores":
+        clauses.insert(0, "s.metric = ?")
+        params.insert(0, args.metric)
+        if args.stage:
+            clauses.append("s.stage = ?")
+            params.append(args.stage)
+        if args.kind:
+            clauses.append("s.kind = ?")
+            params.append(args.kind)
+        group = GROUPS[args.group_by]
+        select = f"{group} AS {args.group_by}, " if group else ""
+        return (
+            f"SELECT {select}COUNT(DISTINCT s.run_id) AS runs, COUNT(*) AS n, ROUND(AVG(s.value), 2) AS avg, "
+            "MIN(s.value) AS min, MAX(s.value) AS max "
+            f"FROM scores s JOIN runs r ON r.run_id = s.run_id WHERE {' AND '.join(clauses)}"
+            + (f" GROUP BY {group} ORDER BY {group}" if group else ""),
+            params,
+        )
+    if args.command == "costs":
+        group = GROUPS[args.group_by]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return (
+            f"SELECT {group} AS {args.group_by}, COUNT(*) AS runs, SUM(r.calls) AS calls, "
+            "SUM(r.prompt_tokens_est) AS prompt_tokens_est, SUM(r.completion_tokens_est) AS completion_tokens_est, "
+            "ROUND(SUM(r.prompt_tokens_est) / 1e6 * ? + SUM(r.completion_tokens_est) / 1e6 * ?, 4) AS cost_usd_est, "
+            "ROUND(AVG(r.wall_seconds), 1) AS avg_wall_seconds "
+            f"FROM runs r {where} GROUP BY {group} ORDER BY {group}",
+            [args.price_prompt, args.price_completion] + params,
+        )
+    if args.translator:
+        clauses.append("p.translator = ?")
+        params.append(args.translator)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return (
+        "SELECT p.translator, COUNT(DISTINCT p.run_id) AS runs, COUNT(*) AS n, ROUND(AVG(p.score), 2) AS avg, "
+        "MIN(p.score) AS min, MAX(p.score) AS max "
+        f"FROM passages p JOIN runs r ON r.run_id = p.run_id {where} GROUP BY p.translator ORDER BY p.translator",
+        params,
+    )
+
+
+def render_table(columns: list[str], rows: list[tuple[Any, ...]]) -> str:
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "---|" * len(columns),
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join("" if value is None else str(value) for value in row) + " |")
+    return "\n".join(lines)
+
+
+def run_cli() -> int:
+    args = parse_args()
+    path = Path(args.catalog)
+    if not path.exists():
+        print(f"No catalog at {path}; it is created when a run finishes.", file=sys.stderr)
+        return 2
+    query, params = build_query(args)
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        started = time.perf_counter()
+        cursor = connection.execute(query, params)
+        rows = cursor.fetchall()
+        columns = [column[0] for column in cursor.description or []]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    except sqlite3.Error as exc:
+        print(f"Query failed: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        connection.close()
+    print(render_table(columns, rows))
+    print(f"({len(rows)} rows in {elapsed_ms:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_cli())
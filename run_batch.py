@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from openai import OpenAI
+import main
+from pipelines.batch import (
+    DEFAULT_JOB_WORKERS,
+    DEFAULT_MAX_CONCURRENT_CALLS,
+    BatchJob,
+    expand_manifest,
+    render_summary_markdown,
+    run_batch,
+)
+from pipelines.checkpoint import new_run_id
+from translation_feedback_mechanisms import compute_smoothness_feedback_from_perplexity
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run every combination in a JSON experiment manifest on one shared worker pool, "
+            "rate limiter and response cache."
+        )
+    )
+    parser.add_argument("manifest", help="Path to the JSON manifest.")
+    parser.add_argument(
+        "--output-dir",
+        default="",
+        help="Directory for per-job reports and the summary. Default: manifest output_dir or runs/batch_<run_id>.",
+    )
+    parser.add_argument(
+        "--job-workers",
+        type=int,
+        default=None,
+        help=f"Jobs run concurrently (default: manifest job_workers or {DEFAULT_JOB_WORKERS}).",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=None,
+        help="Cap on LLM request starts per minute across all jobs (default: manifest value or none).",
+    )
+    parser.add_argument(
+        "--max-concurrent-calls",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT_CALLS,
+        help=f"Upper bound on in-flight LLM calls across all jobs (default: {DEFAULT_MAX_CONCURRENT_CALLS}).",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print per-paragraph progress from every job (interleaved).",
+    )
+    return parser.parse_args()
+
+
+def run_cli() -> int:
+    args = parse_args()
+    try:
+        manifest = json.loads(Path(args.manifest).read_text(encoding="utf-8"))
+        jobs = expand_manifest(manifest, default_model=main.DEFAULT_MODEL)
+    except (OSError, ValueError) as exc:
+        print(f"Invalid manifest: {exc}", file=sys.stderr)
+        return 2
+    job_workers = args.job_workers or int(manifest.get("job_workers", DEFAULT_JOB_WORKERS))
+    requests_per_minute = args.requests_per_minute or manifest.get("requests_per_minute")
+    if job_workers < 1 or args.max_concurrent_calls < 1:
+        print("--job-workers and --max-concurrent-calls must be >= 1", file=sys.stderr)
+        return 2
+
+    api_key = main.get_api_key(Path(".env"))
+    if not api_key:
+        print("Missing OPENROUTER_API_KEY (or OPENAI_API_KEY) in environment/.env.", file=sys.stderr)
+        return 2
+
+    client = OpenAI(api_key=api_key, base_url=main.OPENROUTER_BASE_URL)
+    output_dir = Path(args.output_dir or manifest.get("output_dir") or f"runs/batch_{new_run_id()}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def run_job(job: BatchJob, job_call_json_fn: Callable[..., dict[str, Any]]) -> str:
+        options = dict(job.options)
+        feedback_model = str(options.pop("sequential_feedback_model", "") or "").strip() or None
+        result = main.run_pipeline(
+            client=client,
+            model=job.model,
+            greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS,
+            iterations=job.iterations or main.default_iterations(job.pipeline),
+            verbose=args.verbose,
+            color_mode="never",
+            user_preference=job.preference,
+            sequential_feedback_model=feedback_model,
+            pipeline=job.pipeline,
+            call_json_fn=job_call_json_fn,
+            compute_feedback_fn=compute_smoothness_feedback_from_perplexity,
+            paragraph_numbers=list(job.paragraphs) if job.paragraphs else None,
+            **options,
+        )
+        md_path = output_dir / f"{job.job_id}.md"
+        md_path.write_text(main.render_markdown_report(result), encoding="utf-8")
+        return str(md_path)
+
+    def report(row: dict[str, Any]) -> None:
+        print(
+            f"[batch] {row['job_id']}: {row['status']} in {row['wall_seconds']}s, "
+            f"calls={row['usage']['calls']} (cache hits {row['usage']['cache_hits']})",
+            file=sys.stderr,
+        )
+
+    print(f"[batch] {len(jobs)} jobs, {job_workers} at a time -> {output_dir}", file=sys.stderr)
+    started = time.perf_counter()
+    try:
+        rows = run_batch(
+            jobs,
+            run_job,
+            main.call_json,
+            job_workers=job_workers,
+            requests_per_minute=requests_per_minute,
+            max_concurrent_calls=args.max_concurrent_calls,
+            prices=manifest.get("prices"),
+            on_job_done=report,
+        )
+    except KeyboardInterrupt:
+        print("Batch cancelled.", file=sys.stderr)
+        return 130
+    wall_seconds = time.perf_counter() - started
+
+    summary_md = output_dir / "summary.md"
+    summary_json = output_dir / "summary.json"
+    summary_md.write_text(render_summary_markdown(rows, wall_seconds), encoding="utf-8")
+    summary_json.write_text(
+        json.dumps({"wall_seconds": round(wall_seconds, 3), "jobs": rows}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    print(f"Wrote {summary_md}")
+    return 0 if all(row["status"] == "ok" for row in rows) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_cli())
@@ -2,11 +2,16 @@
 from __future__ import annotations
 
 import argparse
+import sqlite3
 import sys
+import time
 from pathlib import Path
 
 from openai import OpenAI
 import main
+from pipelines.artifacts import StageArtifacts
+from pipelines.catalog import record_run
+from pipelines.memo import ParagraphMemo
 
 DEFAULT_PREFERENCE = (
     "This should be readable by a 7 year old. "
@@ -61,26 +66,30 @@ def run_cli() -> int:
         return 2
 
     client = OpenAI(api_key=api_key, base_url=main.OPENROUTER_BASE_URL)
+    artifacts = StageArtifacts.create()
+    run_id = artifacts.run_id
 
-    # Keep reference alignment with the selected Greek paragraph.
-    main.DEFAULT_DRYDEN_CLOUGH_PARAGRAPHS = [main.DEFAULT_DRYDEN_CLOUGH_PARAGRAPHS[2]]
-    main.DEFAULT_PERRIN_PARAGRAPHS = [main.DEFAULT_PERRIN_PARAGRAPHS[2]]
-
+    started = time.time()
     try:
         result = main.run_pipeline(
             client=client,
             model=args.model,
-            greek_paragraphs=[main.DEFAULT_GREEK_PARAGRAPHS[2]],
+            greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS,
             iterations=args.iterations,
             verbose=not args.quiet,
             color_mode=args.color,
             user_preference=args.preference,
             sequential_feedback_model=None,
             pipeline="sequential",
+            paragraph_numbers=[3],
+            paragraph_memo=ParagraphMemo(),
+            call_json_fn=artifacts.wrap(main.call_json),
         )
     except ValueError as exc:
         print(str(exc), file=sys.stderr)
         return 2
+    finally:
+        artifacts.flush()
 
     prefix = Path(args.output_prefix)
     prefix.parent.mkdir(parents=True, exist_ok=True)
@@ -89,6 +98,22 @@ def run_cli() -> int:
     print(result["final_translation"])
     print()
     print(f"Wrote {md_path}")
+    try:
+        record_run(
+            run_id=run_id,
+            script="theseus_paragraph3",
+            pipeline="sequential",
+            model=args.model,
+            user_preference=main.normalize_user_preference(args.preference),
+            iterations=args.iterations,
+            started=started,
+            wall_seconds=time.time() - started,
+            report_path=md_path,
+            artifacts_path=artifacts.path,
+            paragraphs=result["paragraphs"],
+        )
+    except sqlite3.Error as exc:
+        print(f"[catalog] run not recorded: {exc}", file=sys.stderr)
     return 0
 
 
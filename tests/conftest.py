@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import random
+import threading
+from typing import Any, Callable
+
+import pytest
+
+from pipelines.checkpoint import current_scope
+from pipelines.fake_server import canned_stage_json
+
+
+class StubCaller:
+    """A `call_json_fn` that answers every stage offline.
+
+    Each call returns the fake server's canned stage JSON, updated with
+    whatever `respond(scope, user_prompt)` returns for the call's scope, and
+    is recorded in `calls` with its scope and prompts.
+    """
+
+    def __init__(self, respond: Callable[[dict[str, Any], str], dict[str, Any] | None] | None = None) -> None:
+        self.respond = respond
+        self.calls: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __call__(
+        self,
+        client: Any,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.5,
+        **_: Any,
+    ) -> dict[str, Any]:
+        scope = current_scope()
+        with self._lock:
+            self.calls.append({"scope": scope, "system": system_prompt, "user": user_prompt})
+            rng = random.Random(len(self.calls))
+        result = canned_stage_json(user_prompt, rng)
+        if self.respond is not None:
+            result.update(self.respond(scope, user_prompt) or {})
+        return result
+
+    def stages(self) -> list[str]:
+        return [call["scope"].get("stage", "") for call in self.calls]
+
+
+@pytest.fixture
+def stub_caller() -> type[StubCaller]:
+    return StubCaller
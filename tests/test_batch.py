@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from pipelines.batch import ResponseCache, expand_manifest, render_summary_markdown, run_batch
+
+
+def test_expand_manifest_crosses_every_list() -> None:
+    jobs = expand_manifest(
+        {
+            "pipelines": ["debate", "sequential"],
+            "preferences": ["plain", "formal"],
+            "iterations": [2],
+            "paragraphs": "1,3",
+            "options": {"feedback": "grade_level", "feedback_timeouts": "grade_level=2"},
+        },
+        default_model="vendor/model-x",
+    )
+
+    assert len(jobs) == 4
+    assert jobs[0].job_id == "001_debate_model-x_it2_p1-3_pref1"
+    assert jobs[0].paragraphs == (1, 3)
+    assert jobs[0].options == {"feedback": ["grade_level"], "feedback_timeouts": {"grade_level": 2.0}}
+
+
+def test_expand_manifest_rejects_unknown_options() -> None:
+    with pytest.raises(ValueError, match="Unknown manifest options: colour"):
+        expand_manifest({"options": {"colour": "red"}}, default_model="m")
+
+
+def test_concurrent_duplicates_share_one_live_call() -> None:
+    cache = ResponseCache()
+    release = threading.Event()
+    live_calls: list[int] = []
+
+    def call() -> dict:
+        live_calls.append(1)
+        release.wait(timeout=5)
+        return {"translation": "x"}
+
+    results: list[tuple[dict, bool]] = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_call("k", call))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(live_calls) == 1
+    assert sorted(hit for _response, hit in results) == [False, True, True]
+
+
+def test_run_batch_meters_cache_hits_and_records_failures(stub_caller) -> None:
+    jobs = expand_manifest({"preferences": ["a", "b", "c"]}, default_model="m")
+
+    def run_job(job, call_json_fn):
+        if job.preference == "c":
+            raise RuntimeError("boom")
+        # Both jobs send the same request, so the second is a cache hit.
+        return call_json_fn(None, job.model, "system", "user", temperature=0.2)["translation"]
+
+    rows = run_batch(jobs, run_job, stub_caller(), job_workers=1)
+
+    assert [row["status"] for row in rows] == ["ok", "ok", "failed: boom"]
+    assert rows[0]["usage"]["cache_hits"] == 0
+    assert rows[1]["usage"]["cache_hits"] == 1
+    assert rows[1]["output"] == rows[0]["output"]
+    assert "(shared cache hits: `1`)" in render_summary_markdown(rows, 1.0)
+
+
+def test_max_concurrent_calls_caps_live_calls_across_jobs() -> None:
+    jobs = expand_manifest({"preferences": ["a", "b", "c"]}, default_model="m")
+    lock = threading.Lock()
+    running: list[int] = [0]
+    peak: list[int] = [0]
+
+    def call_json(client, model, system_prompt, user_prompt, **kwargs) -> dict:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        threading.Event().wait(0.05)
+        with lock:
+            running[0] -= 1
+        return {"translation": user_prompt}
+
+    def run_job(job, call_json_fn):
+        return call_json_fn(None, job.model, "system", job.preference)["translation"]
+
+    rows = run_batch(jobs, run_job, call_json, job_workers=3, max_concurrent_calls=1)
+
+    assert [row["status"] for row in rows] == ["ok", "ok", "ok"]
+    assert peak[0] == 1
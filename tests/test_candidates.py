@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pipelines.candidates import candidate_temperatures, grade_direction, prerank_candidates
+
+REFS = {"dryden_clough": "Let us hope that myth will yield to reason here.", "perrin": ""}
+PLAIN = "Let us hope the old story gives way to reason now."
+ORNATE = "May the fabulous, chastened by intellect, assume historical verisimilitude henceforth."
+
+
+def draft(text: str, score: int = 8) -> dict:
+    return {"translation": text, "self_scores": {"faithfulness": score, "readability": score}}
+
+
+def test_grade_direction_follows_the_preference() -> None:
+    assert grade_direction("Make it simple enough for middle school students") == -1
+    assert grade_direction("A formal, literary register") == 1
+    assert grade_direction("Keep Plutarch's voice") == 0
+
+
+def test_candidate_temperatures_span_the_range() -> None:
+    assert candidate_temperatures(1) == [0.45]
+    assert candidate_temperatures(3) == [0.3, 0.6, 0.9]
+
+
+def test_grade_only_matters_when_the_preference_asks_for_it() -> None:
+    drafts = [draft(ORNATE), draft(PLAIN)]
+    neutral = prerank_candidates(drafts, [0.3, 0.9], REFS)
+    simpler = prerank_candidates(drafts, [0.3, 0.9], REFS, user_preference="simple, for children")
+    elevated = prerank_candidates(drafts, [0.3, 0.9], REFS, user_preference="elevated literary prose")
+
+    def gap(records: list[dict]) -> float:
+        by_text = {r["translation"]: r["local_score"] for r in records}
+        return by_text[PLAIN] - by_text[ORNATE]
+
+    assert gap(simpler) > gap(neutral) > gap(elevated)
+
+
+def test_perplexity_penalizes_the_less_fluent_candidate() -> None:
+    drafts = [draft(PLAIN), draft("Let us hope that the myth gives way to reason now.")]
+    perplexities = {
+        PLAIN: {"available": True, "perplexity": 400.0},
+        drafts[1]["translation"]: {"available": True, "perplexity": 20.0},
+    }
+    records = prerank_candidates(drafts, [0.3, 0.9], REFS, perplexities=perplexities)
+
+    assert records[0]["candidate"] == 2
+    assert records[1]["signals"]["perplexity"] == 400.0
+
+
+def test_near_duplicates_sort_last_and_point_at_the_kept_draft() -> None:
+    records = prerank_candidates(
+        [draft(PLAIN, 9), draft(PLAIN + " ", 6), draft(ORNATE, 7), draft("")],
+        [0.3, 0.5, 0.7, 0.9],
+        REFS,
+    )
+
+    assert [r["candidate"] for r in records[:2]] == [1, 3]
+    assert records[-1]["duplicate_of"] == 1
+    assert any(r["translation"] == "" and r["duplicate_of"] is None for r in records)
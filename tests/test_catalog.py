@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+import main
+import query_runs
+from pipelines.artifacts import StageArtifacts
+from pipelines.catalog import flatten_scores, open_catalog, record_run
+
+
+def test_flatten_scores_reads_nested_and_bare_numbers() -> None:
+    scores = {"scores": {"readability": 8, "note": "x", "flag": True}, "score": 7}
+    assert list(flatten_scores(scores)) == [("scores", "readability", 8.0), ("score", "score", 7.0)]
+
+
+def record_stub_run(tmp_path: Path, stub_caller, run_id: str, preference: str) -> tuple[Path, dict]:
+    artifacts = StageArtifacts(run_id, tmp_path / "artifacts")
+    result = main.run_pipeline(
+        client=None,
+        model="test-model",
+        greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:2],
+        iterations=2,
+        verbose=False,
+        color_mode="never",
+        user_preference=preference,
+        sequential_feedback_model=None,
+        pipeline="sequential",
+        call_json_fn=artifacts.wrap(stub_caller()),
+    )
+    artifacts.flush()
+    catalog = tmp_path / "catalog.sqlite"
+    record_run(
+        run_id=run_id,
+        script="main",
+        pipeline="sequential",
+        model="test-model",
+        user_preference=preference,
+        iterations=2,
+        started=time.time(),
+        wall_seconds=1.0,
+        artifacts_path=artifacts.path,
+        paragraphs=result["paragraphs"],
+        path=catalog,
+    )
+    return catalog, result
+
+
+def test_recorded_run_has_its_paragraphs_calls_and_scores(tmp_path: Path, stub_caller) -> None:
+    caller = stub_caller()
+    catalog, result = record_stub_run(tmp_path, lambda: caller, "run-a", "for a child")
+
+    connection = open_catalog(catalog)
+    try:
+        run = connection.execute("SELECT * FROM runs WHERE run_id = 'run-a'").fetchone()
+        assert run["calls"] == len(caller.calls)
+        assert run["prompt_tokens_est"] > 0
+        translations = [row[0] for row in connection.execute("SELECT final_translation FROM paragraphs ORDER BY paragraph")]
+        assert translations == [p["final_synthesis"]["final_translation"].strip() for p in result["paragraphs"]]
+        stages = [row[0] for row in connection.execute("SELECT stage FROM stage_calls ORDER BY seq")]
+        assert stages == caller.stages()
+        judged = connection.execute("SELECT COUNT(*) FROM scores WHERE stage = 'judge'").fetchone()[0]
+        assert judged > 0
+        per_iteration = connection.execute("SELECT SUM(calls) FROM iterations WHERE run_id = 'run-a'").fetchone()[0]
+        assert 0 < per_iteration <= run["calls"]
+    finally:
+        connection.close()
+
+
+def test_recording_a_run_again_replaces_its_rows(tmp_path: Path, stub_caller) -> None:
+    catalog, _ = record_stub_run(tmp_path, stub_caller, "run-a", "")
+    with sqlite3.connect(catalog) as connection:
+        first = connection.execute("SELECT COUNT(*) FROM stage_calls").fetchone()[0]
+    record_stub_run(tmp_path, stub_caller, "run-a", "")
+    with sqlite3.connect(catalog) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+        assert connection.execute("SELECT COUNT(*) FROM stage_calls").fetchone()[0] == first
+
+
+def test_score_query_averages_across_runs_per_preference(tmp_path: Path, stub_caller) -> None:
+    catalog, _ = record_stub_run(tmp_path, stub_caller, "run-a", "for a child")
+    record_stub_run(tmp_path, stub_caller, "run-b", "for a scholar")
+    args = argparse.Namespace(
+        command="scores",
+        script="main",
+        pipeline="",
+        model="",
+        preference="child",
+        since="",
+        metric="readability",
+        stage="judge",
+        kind="",
+        group_by="preference",
+    )
+
+    query, params = query_runs.build_query(args)
+    with sqlite3.connect(catalog) as connection:
+        rows = connection.execute(query, params).fetchall()
+    assert [(row[0], row[1]) for row in rows] == [("for a child", 1)]
+    assert rows[0][2] > 0
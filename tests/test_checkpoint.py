@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pipelines.artifacts import StageArtifacts, load_stage_calls
+from pipelines.checkpoint import CheckpointStore, allocate_run_id, update_scope
+
+
+def test_allocate_run_id_never_hands_out_a_claimed_id(tmp_path) -> None:
+    ids = [allocate_run_id(lambda run_id: tmp_path / f"{run_id}.log") for _ in range(3)]
+
+    assert len(set(ids)) == 3
+    assert all((tmp_path / f"{run_id}.log").exists() for run_id in ids)
+
+
+def test_artifact_writers_created_in_the_same_second_do_not_share_a_file(tmp_path) -> None:
+    first = StageArtifacts.create(tmp_path)
+    second = StageArtifacts.create(tmp_path)
+
+    assert first.run_id != second.run_id
+    assert first.path != second.path
+
+
+def test_checkpoint_replays_recorded_calls_in_order(tmp_path) -> None:
+    calls: list[str] = []
+
+    def call_json(client, model, system_prompt, user_prompt, temperature=0.5):
+        calls.append(user_prompt)
+        return {"translation": f"live {len(calls)}"}
+
+    store = CheckpointStore.create(["--pipeline", "debate"], tmp_path)
+    wrapped = store.wrap(call_json)
+    update_scope(paragraph=1, stage="translate")
+    first = [wrapped(None, "m", "s", "u"), wrapped(None, "m", "s", "u")]
+
+    resumed = CheckpointStore(store.run_id, tmp_path)
+    replay = resumed.wrap(call_json)
+    again = [replay(None, "m", "s", "u"), replay(None, "m", "s", "u"), replay(None, "m", "s", "u")]
+
+    assert resumed.argv == ["--pipeline", "debate"]
+    assert again[:2] == first
+    assert again[2] == {"translation": "live 3"}
+    assert resumed.replayed == 2
+
+
+def test_artifacts_record_calls_and_filter_by_stage_and_paragraph(tmp_path) -> None:
+    artifacts = StageArtifacts.create(tmp_path)
+    wrapped = artifacts.wrap(lambda client, model, system, user, **kwargs: {"score": 7})
+    for paragraph, stage in [(1, "translate"), (1, "judge"), (2, "judge")]:
+        update_scope(paragraph=paragraph, stage=stage)
+        wrapped(None, "m", "s", f"{stage} {paragraph}", temperature=0.2)
+    artifacts.flush()
+
+    rows = list(load_stage_calls(artifacts.path, stage="judge", paragraph=2))
+    assert [row["input"]["user"] for row in rows] == ["judge 2"]
+    assert rows[0]["scores"] == {"score": 7}
+    assert len(list(load_stage_calls(artifacts.path))) == 3
+
+
+def test_resumed_artifacts_keep_old_records_and_skip_replayed_calls(tmp_path) -> None:
+    def call_json(client, model, system_prompt, user_prompt, temperature=0.5):
+        return {"translation": f"live {user_prompt}"}
+
+    store = CheckpointStore.create(["--pipeline", "sequential"], tmp_path / "checkpoints")
+    artifacts = StageArtifacts(store.run_id, tmp_path, block_records=None)
+    wrapped = artifacts.wrap(store.wrap(call_json))
+    update_scope(paragraph=1, stage="translate")
+    wrapped(None, "m", "s", "one")
+    wrapped(None, "m", "s", "two")
+    artifacts.flush()
+    # Checkpointed, but its record is cut off with the interruption.
+    wrapped(None, "m", "s", "three")
+
+    resumed = CheckpointStore(store.run_id, tmp_path / "checkpoints")
+    artifacts = StageArtifacts(store.run_id, tmp_path, block_records=None, append=True)
+    wrapped = artifacts.wrap(resumed.wrap(call_json))
+    for prompt in ("one", "two", "three", "four"):
+        wrapped(None, "m", "s", prompt)
+    artifacts.flush()
+
+    rows = list(load_stage_calls(artifacts.path))
+    assert [row["input"]["user"] for row in rows] == ["one", "two", "three", "four"]
+    assert [row["seq"] for row in rows] == [1, 2, 3, 4]
+    assert rows[2]["timing"]["replayed"] is True and rows[2]["timing"]["seconds"] is None
+    assert "replayed" not in rows[3]["timing"] and rows[3]["timing"]["seconds"] is not None
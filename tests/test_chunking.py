@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import main
+from pipelines.chunking import (
+    ELISION_MARK,
+    chunk_greek,
+    normalize_greek,
+    run_chunked,
+    split_greek_sentences,
+    stitch_translations,
+)
+
+
+def test_normalize_unifies_greek_question_mark_ano_teleia_and_elision() -> None:
+    text = "τί φῄς; ἀλλ’ οὐ· δ'  ἔφη"
+    normalized = normalize_greek(text)
+    assert ";" in normalized and ";" not in normalized
+    assert "·" in normalized and "·" not in normalized
+    assert f"ἀλλ{ELISION_MARK}" in normalized and f"δ{ELISION_MARK}" in normalized
+    assert "  " not in normalized
+
+
+def test_sentences_split_on_full_stops_and_question_marks_only() -> None:
+    text = "πρῶτον μὲν ἦλθεν· εἶτα ἀπῆλθεν. τί φῄς; «οὐδὲν λέγω.» ἀλλ' ἔφη"
+    assert split_greek_sentences(text) == [
+        "πρῶτον μὲν ἦλθεν· εἶτα ἀπῆλθεν.",
+        "τί φῄς;",
+        "«οὐδὲν λέγω.»",
+        f"ἀλλ{ELISION_MARK} ἔφη",
+    ]
+
+
+def test_chunks_pack_whole_sentences_with_neighbouring_context() -> None:
+    sentences = ["ἄλφα μέν.", "βῆτα δέ.", "γάμμα τε.", "δέλτα γε."]
+    chunks = chunk_greek(" ".join(sentences), max_chars=20, overlap=1)
+
+    assert [chunk.greek for chunk in chunks] == ["ἄλφα μέν. βῆτα δέ.", "γάμμα τε. δέλτα γε."]
+    assert all(chunk.count == 2 for chunk in chunks)
+    assert chunks[0].context_before == "" and chunks[0].context_after == "γάμμα τε."
+    assert chunks[1].context_before == "βῆτα δέ." and chunks[1].context_after == ""
+
+    no_overlap = chunk_greek(" ".join(sentences), max_chars=20, overlap=0)
+    assert all(not chunk.context_before and not chunk.context_after for chunk in no_overlap)
+
+
+def test_overlong_sentence_falls_back_to_clause_breaks() -> None:
+    text = "ἄλφα βῆτα γάμμα· δέλτα ἔψιλον ζῆτα: ἦτα θῆτα."
+    chunks = chunk_greek(text, max_chars=20, overlap=0)
+    assert [chunk.greek for chunk in chunks] == ["ἄλφα βῆτα γάμμα·", "δέλτα ἔψιλον ζῆτα:", "ἦτα θῆτα."]
+
+
+def test_run_chunked_keeps_paragraph_order_and_threads_previous_translation() -> None:
+    seen: dict[int, list[str]] = {}
+    lock = threading.Lock()
+
+    def run_chunk(idx: int, greek: str) -> dict:
+        # The first paragraph is slowest, so it finishes last on the pool.
+        time.sleep(0.05 if idx == 1 else 0.0)
+        with lock:
+            seen.setdefault(idx, []).append(greek)
+        return {"paragraph_index": idx, "final_synthesis": {"final_translation": f"[{greek}]"}}
+
+    paragraphs = ["ἄλφα μέν. βῆτα δέ.", "γάμμα τε. δέλτα γε."]
+    done: list[tuple[int, int]] = []
+    results = run_chunked(
+        paragraphs,
+        [1, 2],
+        run_chunk,
+        max_chars=10,
+        workers=2,
+        on_paragraph_done=lambda p: done.append((p["paragraph_index"], p["chunk"]["number"])),
+    )
+
+    assert [(p["paragraph_index"], p["chunk"]["number"]) for p in results] == [(1, 1), (1, 2), (2, 1), (2, 2)]
+    assert seen == {1: ["ἄλφα μέν.", "βῆτα δέ."], 2: ["γάμμα τε.", "δέλτα γε."]}
+    assert sorted(done) == [(1, 1), (1, 2), (2, 1), (2, 2)]
+    assert stitch_translations(results) == "[ἄλφα μέν.] [βῆτα δέ.]\n\n[γάμμα τε.] [δέλτα γε.]"
+
+
+def test_run_chunked_reads_each_paragraph_only_when_it_starts() -> None:
+    class RecordingParagraphs(list):
+        def __init__(self, items: list[str]) -> None:
+            super().__init__(items)
+            self.read: list[int] = []
+
+        def __getitem__(self, at):
+            self.read.append(at + 1)
+            return super().__getitem__(at)
+
+    paragraphs = RecordingParagraphs([f"ἄλφα {n} μέν. βῆτα {n} δέ." for n in range(1, 11)])
+    reads_ahead: list[int] = []
+    lock = threading.Lock()
+
+    def run_chunk(idx: int, greek: str) -> dict:
+        with lock:
+            reads_ahead.append(max(paragraphs.read) - idx)
+        return {"paragraph_index": idx, "final_synthesis": {"final_translation": greek}}
+
+    results = run_chunked(paragraphs, list(range(1, 11)), run_chunk, max_chars=12, workers=2)
+
+    assert sorted(paragraphs.read) == list(range(1, 11))
+    # At most 2 * workers paragraphs are running or waiting at once.
+    assert max(reads_ahead) < 4
+    assert [p["paragraph_index"] for p in results] == [n for n in range(1, 11) for _ in range(2)]
+
+
+def test_chunked_pipeline_shows_previous_chunk_translation(stub_caller) -> None:
+    def respond(scope, user_prompt):
+        return {"final_translation": f"chunk {scope.get('chunk')} done"}
+
+    caller = stub_caller(respond)
+    greek = main.DEFAULT_GREEK_PARAGRAPHS[0]
+    chunks = chunk_greek(greek, max_chars=200)
+    assert len(chunks) > 1
+
+    result = main.run_pipeline(
+        client=None,
+        model="test-model",
+        greek_paragraphs=[greek],
+        iterations=1,
+        verbose=False,
+        color_mode="never",
+        user_preference="",
+        sequential_feedback_model=None,
+        pipeline="sequential",
+        call_json_fn=caller,
+        chunk_chars=200,
+    )
+
+    parts = result["paragraphs"]
+    assert [part["chunk"]["number"] for part in parts] == list(range(1, len(chunks) + 1))
+    second = [call["user"] for call in caller.calls if call["scope"].get("chunk") == 2]
+    assert second
+    assert any(f"part 2 of {len(chunks)}" in prompt for prompt in second)
+    first_translation = parts[0]["final_synthesis"]["final_translation"]
+    assert any(f"Final translation of the previous part: {first_translation}" in prompt for prompt in second)
+
+
+def test_one_chunk_paragraph_prompts_match_the_unchunked_run(stub_caller) -> None:
+    greek = main.DEFAULT_GREEK_PARAGRAPHS[0]
+
+    def run(chunk_chars: int):
+        caller = stub_caller()
+        result = main.run_pipeline(
+            client=None,
+            model="test-model",
+            greek_paragraphs=[greek],
+            iterations=1,
+            verbose=False,
+            color_mode="never",
+            user_preference="",
+            sequential_feedback_model=None,
+            pipeline="sequential",
+            call_json_fn=caller,
+            chunk_chars=chunk_chars,
+        )
+        return caller, result
+
+    plain, _ = run(0)
+    chunked, result = run(len(greek) + 100)
+
+    assert [(call["scope"], call["user"]) for call in chunked.calls] == [
+        (call["scope"], call["user"]) for call in plain.calls
+    ]
+    assert all("part 1 of 1" not in call["user"] for call in chunked.calls)
+    assert "chunk" not in result["paragraphs"][0]
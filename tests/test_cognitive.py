@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import main
+
+PHRASES = [
+    {"source_phrase": "εἴη μὲν οὖν ἡμῖν", "context_note": "the wish"},
+    {"source_phrase": "ἐκκαθαιρόμενον λόγῳ τὸ μυθῶδες", "context_note": "myth purified by reason"},
+    {"source_phrase": "ἱστορίας ὄψιν", "context_note": "the look of history"},
+]
+
+
+def run_cognitive(pipeline, call_json_fn, **options):
+    return main.run_pipeline(
+        client=None,
+        model="test-model",
+        greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:1],
+        iterations=2,
+        verbose=False,
+        color_mode="never",
+        user_preference="",
+        sequential_feedback_model=None,
+        pipeline=pipeline,
+        call_json_fn=call_json_fn,
+        **options,
+    )["paragraphs"][0]
+
+
+def test_decomposed_mode_segments_once_and_analyses_each_phrase(stub_caller) -> None:
+    def respond(scope, user_prompt):
+        if scope.get("stage") == "segment":
+            return {"phrases": PHRASES}
+        if scope.get("stage") == "analyze":
+            return {"chosen_phrase": f"phrase {scope['phrase']} it{scope['iteration']}"}
+        return None
+
+    caller = stub_caller(respond)
+    paragraph = run_cognitive("cognitive_user", caller, phrase_mode="decomposed")
+
+    stages = caller.stages()
+    assert stages.count("segment") == 1
+    assert stages.count("analyze") == 6
+    assert stages.count("compose") == 2
+    composes = [call["user"] for call in caller.calls if call["scope"].get("stage") == "compose"]
+    assert all(f"phrase {n} it1" in composes[0] for n in (1, 2, 3))
+    assert paragraph["phrase_timing"]["mode"] == "decomposed"
+
+
+def test_frozen_analysis_reuses_the_first_iterations_meaning_loop(stub_caller) -> None:
+    def respond(scope, user_prompt):
+        if scope.get("iteration") == 1:
+            return {"scene_model": "A biographer asks for indulgence."}
+        return {"scene_model": "A different scene."}
+
+    caller = stub_caller(respond)
+    paragraph = run_cognitive("cognitive_dualloop", caller, analysis_mode="frozen")
+
+    assert caller.stages() == ["translate", "translate", "select"]
+    assert "A biographer asks for indulgence." in caller.calls[1]["user"]
+    steps = [log["translation_step"] for log in paragraph["cognitive_iterations"]]
+    assert steps[1]["analysis_frozen"] is True
+
+
+def test_fresh_single_mode_translates_every_iteration(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_cognitive("cognitive_dualloop", caller)
+
+    assert caller.stages() == ["translate", "translate", "select"]
+    assert all("analysis_frozen" not in log["translation_step"] for log in paragraph["cognitive_iterations"])
+
+
+def test_parallel_drafts_run_each_variant_then_merge(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_cognitive("cognitive_dualloop", caller, draft_mode="parallel")
+
+    stages = caller.stages()
+    assert stages.count("analyze") == 2
+    assert stages.count("draft") == 6
+    assert stages.count("merge") == 2
+    variants = {call["scope"]["variant"] for call in caller.calls if call["scope"].get("stage") == "draft"}
+    assert variants == {"source_close", "plain_natural", "balanced"}
+    assert len(paragraph["dualloop_usage"]["output_tokens_est"]) == 2
+
+
+def test_frozen_parallel_drafts_analyse_only_once(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_cognitive("cognitive_dualloop", caller, analysis_mode="frozen", draft_mode="parallel")
+
+    assert caller.stages().count("analyze") == 1
+    assert paragraph["cognitive_iterations"][1]["translation_step"]["analysis_frozen"] is True
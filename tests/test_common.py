@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from pipelines.common import cancelling_pool, map_parallel, run_paragraphs
+
+
+def test_map_parallel_keeps_input_order() -> None:
+    assert map_parallel(lambda n: n * n, [3, 1, 2]) == [9, 1, 4]
+
+
+def test_cancelling_pool_drops_queued_tasks_when_the_body_raises() -> None:
+    started: list[int] = []
+    release = threading.Event()
+
+    def task(n: int) -> None:
+        started.append(n)
+        release.wait(timeout=5)
+
+    with pytest.raises(KeyboardInterrupt):
+        with cancelling_pool(1) as pool:
+            futures = [pool.submit(task, n) for n in range(5)]
+            release.set()
+            raise KeyboardInterrupt
+
+    assert len(started) < 5
+    assert any(future.cancelled() for future in futures)
+
+
+def test_run_paragraphs_reports_each_paragraph_and_keeps_order() -> None:
+    done: list[int] = []
+
+    def paragraph_fn(idx, greek, emit):
+        return {"paragraph_index": idx, "greek": greek}
+
+    results = run_paragraphs(
+        ["a", "b", "c"],
+        paragraph_fn,
+        workers=2,
+        paragraph_numbers=[1, 3],
+        on_paragraph_done=lambda paragraph: done.append(paragraph["paragraph_index"]),
+    )
+
+    assert [p["paragraph_index"] for p in results] == [1, 3]
+    assert [p["greek"] for p in results] == ["a", "c"]
+    assert sorted(done) == [1, 3]
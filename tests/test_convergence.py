@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pipelines.convergence import ConvergencePolicy, ConvergenceTracker, mean_score, normalized_edit_distance
+
+
+def test_normalized_edit_distance_counts_words() -> None:
+    assert normalized_edit_distance("The man sailed home.", "the man sailed home.") == 0.0
+    assert normalized_edit_distance("a b c d", "a b c e") == 0.25
+    assert normalized_edit_distance("", "word") == 1.0
+
+
+def test_mean_score_ignores_non_numbers() -> None:
+    assert mean_score({"faithfulness": 8, "readability": 6, "note": "ok"}) == 7.0
+    assert mean_score("8") is None
+
+
+def test_stable_translation_stops_after_min_iterations() -> None:
+    tracker = ConvergenceTracker(ConvergencePolicy(edit_threshold=0.1, min_iterations=2), iterations=5)
+
+    assert tracker.observe("So may myth yield to reason.") == ""
+    assert tracker.observe("So may myth yield to reason.") == "translation_stable (distance 0.000)"
+    assert tracker.summary() == {
+        "iterations_run": 2,
+        "iterations_saved": 3,
+        "stop_reason": "translation_stable (distance 0.000)",
+    }
+
+
+def test_agents_converge_on_the_largest_pairwise_distance() -> None:
+    tracker = ConvergenceTracker(ConvergencePolicy(edit_threshold=0.3), iterations=3)
+
+    assert tracker.observe({"a": "one two three four", "b": "one two three five", "c": "x y z w"}) == ""
+    assert tracker.observe({"a": "one two three four", "b": "one two three five"}).startswith("agents_converged")
+
+
+def test_patience_and_target_score() -> None:
+    plateau = ConvergenceTracker(ConvergencePolicy(patience=2), iterations=6)
+    assert [plateau.observe("t", score) for score in (7, 6, 7)][-1].startswith("scores_plateaued")
+
+    target = ConvergenceTracker(ConvergencePolicy(target_score=8.5), iterations=6)
+    assert target.observe("t", 8.0) == ""
+    assert target.observe("t", 9.0) == "target_score_reached (9.00)"
+
+
+def test_last_iteration_never_reports_a_stop() -> None:
+    tracker = ConvergenceTracker(ConvergencePolicy(edit_threshold=0.5), iterations=2)
+    tracker.observe("same")
+    assert tracker.observe("same") == ""
+    assert tracker.summary()["iterations_saved"] == 0
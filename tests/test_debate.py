@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections import Counter
+import random
+import threading
+
+import main
+from pipelines.convergence import ConvergencePolicy
+from pipelines.debate import critique_assignments, select_agents
+
+
+def run_debate(call_json_fn, **options):
+    return main.run_pipeline(
+        client=None,
+        model="test-model",
+        greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:1],
+        iterations=options.pop("iterations", 3),
+        verbose=False,
+        color_mode="never",
+        user_preference="",
+        sequential_feedback_model=None,
+        pipeline="debate",
+        call_json_fn=call_json_fn,
+        **options,
+    )
+
+
+def test_ring_assignments_give_every_agent_one_reviewer() -> None:
+    agents = select_agents(3)
+    assignments = critique_assignments(agents, "ring")
+    assert assignments == {"faithful": ["readable"], "readable": ["modern"], "modern": ["faithful"]}
+
+
+def test_barrier_free_revision_waits_for_the_agents_previous_round(stub_caller) -> None:
+    # faithful reviews readable under ring. faithful's round-2 critique of
+    # readable lands while readable's round-1 revision is still running, so
+    # readable's round-2 revision must wait for its round-1 result.
+    round_two_critique = threading.Event()
+
+    def respond(scope, user_prompt):
+        stage, agent, it = scope.get("stage"), scope.get("agent"), scope.get("iteration")
+        if stage == "debate" and agent == "faithful" and it == 2:
+            round_two_critique.set()
+        if stage == "revise":
+            if agent == "readable" and it == 1:
+                round_two_critique.wait(timeout=5)
+                threading.Event().wait(0.2)
+            return {"translation": f"{agent} revise it{it}"}
+        return None
+
+    caller = stub_caller(respond)
+    paragraph = run_debate(caller, topology="ring", debate_schedule="barrier_free")["paragraphs"][0]
+
+    assert round_two_critique.is_set()
+    assert paragraph["final_agent_versions"] == {
+        key: f"{key} revise it3" for key in ("faithful", "readable", "modern")
+    }
+    revisions = [e for e in paragraph["debate_exchanges"] if e["kind"] == "revision"]
+    assert all(e["to_version"] == e["from_version"] + 1 for e in revisions)
+    for key in ("faithful", "readable", "modern"):
+        rounds = [e["round"] for e in revisions if e["agent"] == key]
+        assert rounds == [1, 2, 3]
+    assert [summary["iteration"] for summary in paragraph["debate_round_summaries"]] == [1, 2, 3]
+
+
+def test_barrier_free_revision_waits_for_the_agents_own_critique(stub_caller) -> None:
+    # Under ring, faithful's critique of readable lands first while readable's
+    # own critique is slow; readable's revision must still see its own plan.
+    def respond(scope, user_prompt):
+        stage, agent, it = scope.get("stage"), scope.get("agent"), scope.get("iteration")
+        if stage == "debate":
+            if agent == "readable":
+                threading.Event().wait(0.2)
+            return {"self_revision_plan": f"{agent} plan it{it}"}
+        return None
+
+    caller = stub_caller(respond)
+    run_debate(caller, topology="ring", debate_schedule="barrier_free", iterations=2)
+
+    revisions = [call for call in caller.calls if call["scope"].get("stage") == "revise"]
+    assert len(revisions) == 6
+    for call in revisions:
+        scope = call["scope"]
+        assert f"{scope['agent']} plan it{scope['iteration']}" in call["user"]
+
+
+def test_barrier_free_stop_keeps_the_converged_rounds_versions(stub_caller) -> None:
+    # modern's round-1 revision is slow, so readable revises for round 2
+    # before round 1 closes as converged. That later revision is logged but
+    # the final versions and the synthesis come from round 1.
+    readable_round_two = threading.Event()
+
+    def respond(scope, user_prompt):
+        stage, agent, it = scope.get("stage"), scope.get("agent"), scope.get("iteration")
+        if stage != "revise":
+            return None
+        if agent == "readable" and it == 2:
+            readable_round_two.set()
+            return {"translation": "readable drifted in round two"}
+        if agent == "modern" and it == 1:
+            readable_round_two.wait(timeout=5)
+            threading.Event().wait(0.2)
+        return {"translation": "the same agreed sentence"}
+
+    caller = stub_caller(respond)
+    paragraph = run_debate(
+        caller,
+        topology="ring",
+        debate_schedule="barrier_free",
+        convergence=ConvergencePolicy(edit_threshold=0.1),
+    )["paragraphs"][0]
+
+    assert readable_round_two.is_set()
+    assert paragraph["convergence"]["iterations_run"] == 1
+    assert set(paragraph["final_agent_versions"].values()) == {"the same agreed sentence"}
+    assert all(len(log["revisions"]) == 1 for log in paragraph["agents"].values())
+    later = [e for e in paragraph["debate_exchanges"] if e["round"] > 1]
+    assert any(e["kind"] == "revision" and e["agent"] == "readable" for e in later)
+    synthesis = [call for call in caller.calls if call["scope"].get("stage") == "synthesis"]
+    assert "readable drifted in round two" not in synthesis[0]["user"]
+
+
+def test_rounds_schedule_runs_every_stage_per_round(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_debate(caller, iterations=2)["paragraphs"][0]
+
+    stages = caller.stages()
+    assert stages.count("translate") == 3
+    assert stages.count("debate") == 6
+    assert stages.count("revise") == 6
+    assert stages.count("synthesis") == 1
+    assert len(paragraph["debate_round_summaries"]) == 2
+
+
+def test_synthesis_prompt_gets_round_summaries_without_bookkeeping(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_debate(caller, iterations=2)["paragraphs"][0]
+
+    synthesis = [call for call in caller.calls if call["scope"].get("stage") == "synthesis"]
+    assert len(synthesis) == 1
+    assert "Agents agree on the first clause." in synthesis[0]["user"]
+    assert "critique_assignments" not in synthesis[0]["user"]
+    assert "revision_usage" not in synthesis[0]["user"]
+    assert '"usage"' not in synthesis[0]["user"]
+    assert "critique_assignments" in paragraph["debate_round_summaries"][0]
+    assert "usage" in paragraph["debate_round_summaries"][0]
+
+
+def test_barrier_free_compact_state_revisions_use_the_compact_view(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_debate(
+        caller, topology="ring", debate_schedule="barrier_free", debate_state="compact"
+    )["paragraphs"][0]
+
+    revisions = [call for call in caller.calls if call["scope"].get("stage") == "revise"]
+    assert len(revisions) == 9
+    assert all("latest_scores_of_your_translation" in call["user"] for call in revisions)
+    assert "synthesis_prompt_size" in paragraph
+
+
+def test_random_k_and_critic_topologies_balance_the_load() -> None:
+    agents = select_agents(5)
+    random_k = critique_assignments(agents, "random_k", peers=2, rng=random.Random(1))
+    assert all(len(targets) == 2 and key not in targets for key, targets in random_k.items())
+    assert set(Counter(t for targets in random_k.values() for t in targets).values()) == {2}
+    assert critique_assignments(agents, "critic") == {"critic": [agent.key for agent in agents]}
+
+
+def test_quorum_beyond_the_pool_repeats_priorities_under_numbered_keys() -> None:
+    keys = [agent.key for agent in select_agents(10)]
+    assert keys[:3] == ["faithful", "readable", "modern"]
+    assert keys[8:] == ["faithful_2", "readable_2"]
+
+
+def test_critic_topology_makes_one_critique_call_per_round(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_debate(caller, iterations=2, quorum_size=4, topology="critic")["paragraphs"][0]
+
+    assert caller.stages().count("debate") == 2
+    assert caller.stages().count("revise") == 8
+    assert len(paragraph["critic"]) == 2
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from pipelines.debate_state import DebateState
+
+
+def critique(reviewer: str, concerns: str, score: int) -> dict:
+    return {"from": reviewer, "concerns": concerns, "scores": {"faithfulness": score}}
+
+
+def test_record_round_keeps_latest_scores_and_unique_concerns() -> None:
+    state = DebateState(section_budget=200)
+    state.record_round({"readable": [critique("faithful", "Loses a contrast.", 6)]}, {}, {"readable": "Fix it."})
+    state.record_round({"readable": [critique("faithful", "Loses a contrast.", 8)]}, {}, {})
+
+    view = state.revision_view("readable")
+    assert view["latest_scores_of_your_translation"] == {"faithful": {"faithfulness": 8}}
+    assert view["open_concerns"] == ["Loses a contrast."]
+    assert view["your_revision_plan"] == "Fix it."
+
+
+def test_revision_view_is_a_snapshot() -> None:
+    state = DebateState(section_budget=200)
+    state.record_round({"readable": [critique("faithful", "Too stiff.", 6)]}, {}, {})
+    view = state.revision_view("readable")
+
+    state.record_round({"readable": [critique("modern", "Dated diction.", 5)]}, {}, {})
+
+    assert view["latest_scores_of_your_translation"] == {"faithful": {"faithfulness": 6}}
+    assert view["open_concerns"] == ["Too stiff."]
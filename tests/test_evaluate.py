@@ -0,0 +1,52 @@
+from odyssey_eval.compare import compare
+from odyssey_eval.evaluate import write_markdown
+
+
+def test_write_markdown_renders_summary_and_passages() -> None:
+    passage = {
+        "passage_label": "Od. 1.1-10",
+        "greek": "ἄνδρα μοι ἔννεπε, μοῦσα",
+        "known_translation": "Tell me, O Muse, of the man",
+        "pipeline_output": "Muse, tell me about the man",
+        "comparison": {"rationale": "close", "key_gaps": ["epithet"], "key_matches": ["muse"]},
+        "score": 7,
+    }
+    result = {
+        "translator_name": "Samuel Butler",
+        "avg_score": 7.0,
+        "scores": [7],
+        "best_passage": "Od. 1.1-10",
+        "worst_passage": "Od. 1.1-10",
+        "passages": [passage],
+    }
+
+    markdown = write_markdown([result], run_id="run-1", model="test-model", pipeline_iterations=2)
+
+    assert markdown.startswith("# Odyssey Evaluation Run: run-1")
+    assert "Generated: " in markdown
+    assert "| Samuel Butler | 7.0/10 | Od. 1.1-10 (7/10) | Od. 1.1-10 (7/10) |" in markdown
+    assert "**Key gaps:** epithet" in markdown
+
+
+def test_compare_goes_through_call_json_fn_and_clamps_score() -> None:
+    calls = []
+
+    def call_json_fn(client, model, system, user, **kwargs):
+        calls.append((model, user, kwargs))
+        return {"score": 14, "rationale": "very close"}
+
+    result = compare(
+        client=None,
+        values_profile="Plain prose.",
+        known_passage="Tell me, O Muse",
+        pipeline_output="Muse, tell me",
+        model="test-model",
+        call_json_fn=call_json_fn,
+    )
+
+    assert result["score"] == 10
+    assert len(calls) == 1
+    model, user, kwargs = calls[0]
+    assert model == "test-model"
+    assert "Muse, tell me" in user
+    assert kwargs == {"temperature": 0.2, "retries": 1}
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import io
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+import main
+from pipelines.checkpoint import update_scope
+from pipelines.events import Event, EventBus, log_event, publish
+
+
+def read_events(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_without_a_bus_log_events_print_straight_to_stderr(capsys) -> None:
+    publish(Event("log", "plain line"))
+    publish(Event("score", data={"scores": {"score": 1}}))
+    assert capsys.readouterr().err == "plain line\n"
+
+
+def test_bus_renders_logs_and_writes_every_event_as_jsonl(tmp_path: Path) -> None:
+    stderr = io.StringIO()
+    path = tmp_path / "events.jsonl"
+    colorize = lambda text, color, enabled: f"<{color}>{text}</{color}>"
+
+    with EventBus(stderr=stderr, jsonl_path=path):
+        update_scope(paragraph=3, stage="judge")
+        publish(log_event("colored", "green", color_enabled=True, colorize_fn=colorize))
+        publish(log_event("plain", "green", color_enabled=False, colorize_fn=colorize))
+        publish(Event("score", data={"scores": {"score": 7}}))
+    publish(Event("log", "after close", scope={}))
+
+    assert stderr.getvalue() == "<green>colored</green>\nplain\n"
+    rows = read_events(path)
+    assert [row["kind"] for row in rows] == ["log", "log", "score"]
+    assert rows[0]["message"] == "colored"
+    assert rows[2]["scope"] == {"paragraph": 3, "stage": "judge"}
+    assert rows[2]["data"] == {"scores": {"score": 7}}
+
+
+def test_wrapped_calls_emit_stage_translation_score_and_error_events(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+
+    def call_json(client, model, system, user, **kwargs):
+        if user == "fail":
+            raise RuntimeError("boom")
+        return {"translation": f"T {user}", "scores": {"readability": 8}}
+
+    with EventBus(stderr=io.StringIO(), jsonl_path=path) as bus:
+        wrapped = bus.wrap(call_json)
+        update_scope(paragraph=1, stage="translate")
+        assert wrapped(None, "m", "s", "ok") == {"translation": "T ok", "scores": {"readability": 8}}
+        with pytest.raises(RuntimeError):
+            wrapped(None, "m", "s", "fail")
+
+    rows = read_events(path)
+    assert [row["kind"] for row in rows] == ["stage_start", "stage_end", "translation", "score", "stage_start", "stage_end"]
+    assert rows[2]["data"] == {"stage": "translate", "text": "T ok"}
+    assert rows[3]["data"]["scores"] == {"scores": {"readability": 8}}
+    assert "error" not in rows[1]["data"] and rows[5]["data"]["error"] == "boom"
+
+
+def test_verbose_run_emits_its_progress_through_the_bus(tmp_path: Path, stub_caller) -> None:
+    stderr = io.StringIO()
+    path = tmp_path / "events.jsonl"
+    caller = stub_caller()
+
+    with EventBus(stderr=stderr, jsonl_path=path) as bus:
+        main.run_pipeline(
+            client=None,
+            model="test-model",
+            greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:2],
+            iterations=1,
+            verbose=True,
+            color_mode="never",
+            user_preference="",
+            sequential_feedback_model=None,
+            pipeline="sequential",
+            call_json_fn=bus.wrap(caller),
+            paragraph_workers=2,
+        )
+
+    rows = read_events(path)
+    kinds = Counter(row["kind"] for row in rows)
+    assert kinds["stage_start"] == kinds["stage_end"] == len(caller.calls)
+    assert kinds["log"] == stderr.getvalue().count("\n") > 0
+    assert {row["scope"].get("paragraph") for row in rows if row["kind"] == "stage_end"} == {1, 2}
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import urllib.error
+import urllib.request
+
+from pipelines.fake_server import BOS_ID, EMBEDDING_DIM, ERROR_CODES, FakeConfig, FakeServer, canned_stage_json
+
+
+def post(server: FakeServer, path: str, body: dict | None = None) -> tuple[int, dict]:
+    request = urllib.request.Request(
+        server.url + path,
+        data=json.dumps(body or {}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_canned_ranking_uses_the_prompts_candidate_labels() -> None:
+    result = canned_stage_json("C1:\nfirst\n\nC2:\nsecond\n\nC3:\nthird", random.Random(0))
+    assert sorted(result["ranking"]) == ["C1", "C2", "C3"]
+    assert canned_stage_json("no labels", random.Random(0))["ranking"] in (["C1", "C2"], ["C2", "C1"])
+
+
+def test_chat_completion_carries_stage_json_and_counts_requests() -> None:
+    with FakeServer() as server:
+        status, body = post(server, "/v1/chat/completions", {"model": "m", "messages": [{"role": "user", "content": "u"}]})
+        assert status == 200
+        content = json.loads(body["choices"][0]["message"]["content"])
+        assert {"translation", "scores", "final_translation"} <= set(content)
+        assert body["usage"]["total_tokens"] == body["usage"]["prompt_tokens"] + body["usage"]["completion_tokens"]
+
+        assert post(server, "/nowhere")[0] == 404
+        _, stats = post(server, "/fake/stats")
+        assert stats == {"requests": {"/v1/chat/completions": 1}, "errors": 0}
+        post(server, "/fake/reset")
+        assert post(server, "/fake/stats")[1] == {"requests": {}, "errors": 0}
+
+
+def test_embeddings_are_unit_length_and_deterministic() -> None:
+    with FakeServer() as server:
+        _, first = post(server, "/v1/embeddings", {"input": ["alpha", "beta"]})
+        _, again = post(server, "/v1/embeddings", {"input": "alpha"})
+    vectors = [item["embedding"] for item in first["data"]]
+    assert [len(vector) for vector in vectors] == [EMBEDDING_DIM, EMBEDDING_DIM]
+    assert all(math.isclose(sum(value * value for value in vector), 1.0) for vector in vectors)
+    assert again["data"][0]["embedding"] == vectors[0]
+    assert vectors[0] != vectors[1]
+
+
+def test_error_rate_returns_retryable_errors() -> None:
+    with FakeServer(FakeConfig(error_rate=1.0)) as server:
+        codes = [post(server, "/v1/chat/completions", {"messages": []})[0] for _ in range(5)]
+        assert set(codes) <= set(ERROR_CODES)
+        assert post(server, "/props")[0] == 200
+        assert post(server, "/fake/stats")[1]["errors"] == 5
+
+
+def test_llamacpp_completion_ranks_a_tokenized_next_token() -> None:
+    with FakeServer() as server:
+        _, tokenized = post(server, "/tokenize", {"content": "ἄνδρα μοι ἔννεπε"})
+        tokens = tokenized["tokens"]
+        assert post(server, "/tokenize", {"content": "<s>"})[1] == {"tokens": [BOS_ID]}
+        _, completion = post(server, "/completion", {"prompt": [BOS_ID, tokens[0]], "n_probs": 400})
+
+    top = completion["completion_probabilities"][0]["top_logprobs"]
+    assert len(top) == 400
+    assert tokens[1] in [entry["id"] for entry in top]
+    assert [entry["logprob"] for entry in top] == sorted((entry["logprob"] for entry in top), reverse=True)
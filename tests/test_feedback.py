@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from pipelines import feedback as feedback_module
+from pipelines.feedback import (
+    FeedbackMechanism,
+    FeedbackOrchestrator,
+    merge_feedback_summaries,
+    parse_feedback_names,
+    parse_feedback_timeouts,
+    unavailable,
+)
+
+
+def test_feedback_names_are_checked_and_deduplicated() -> None:
+    assert parse_feedback_names(" grade_level, entity_check,grade_level ,") == ["grade_level", "entity_check"]
+    with pytest.raises(ValueError, match="Unknown feedback mechanism"):
+        parse_feedback_names("grade_level,nonsense")
+
+
+def test_feedback_timeouts_parse_name_seconds_pairs() -> None:
+    assert parse_feedback_timeouts("perplexity=30, back_translation=2.5") == {"perplexity": 30.0, "back_translation": 2.5}
+    with pytest.raises(ValueError, match="NAME=SECONDS"):
+        parse_feedback_timeouts("perplexity=soon")
+    with pytest.raises(ValueError, match="Unknown"):
+        parse_feedback_timeouts("nonsense=3")
+
+
+def test_merged_summary_keeps_short_lines_and_trims_long_ones() -> None:
+    short = "Grade 6."
+    long = "word " * 40
+    merged = merge_feedback_summaries([("a", short), ("b", long), ("c", "  ")], budget_chars=60)
+
+    lines = merged.splitlines()
+    assert lines[0] == f"- {short}"
+    assert lines[1].startswith("- word") and lines[1].endswith("…")
+    assert len(merged) <= 60
+    assert merge_feedback_summaries([("a", short)], 60) == short
+    assert merge_feedback_summaries([("a", " ")], 60) == ""
+
+
+@pytest.fixture
+def mechanisms(monkeypatch):
+    """Register fast and slow test mechanisms that count their calls."""
+    calls: list[tuple[str, str]] = []
+    release = threading.Event()
+
+    def fast(request):
+        calls.append(("fast", request.translation))
+        return {"available": True, "text": request.translation}
+
+    def slow(request):
+        calls.append(("slow", request.translation))
+        release.wait(5)
+        return {"available": True, "text": "slow"}
+
+    def broken(request):
+        raise RuntimeError("no model")
+
+    for mechanism in (
+        FeedbackMechanism("fast", fast, lambda payload: f"fast saw {payload.get('text', '')}", timeout=5.0),
+        FeedbackMechanism("slow", slow, lambda payload: "slow done" if payload.get("available") else "", timeout=5.0),
+        FeedbackMechanism("broken", broken, lambda payload: "", timeout=5.0),
+    ):
+        monkeypatch.setitem(feedback_module.FEEDBACK_MECHANISMS, mechanism.name, mechanism)
+    yield calls, release
+    release.set()
+
+
+def test_a_late_mechanism_times_out_and_its_result_is_cached_later(mechanisms) -> None:
+    calls, release = mechanisms
+    with FeedbackOrchestrator(["fast", "slow"], client=None, model="m", timeouts={"slow": 0.1}) as orchestrator:
+        report = orchestrator.collect(greek="γ", translation="T")
+        assert report["late"] == ["slow"]
+        assert report["available"] == ["fast"]
+        assert report["results"]["slow"] == unavailable("slow", "timeout after 0.1s")
+        assert report["summary"] == "fast saw T"
+
+        release.set()
+        pending = orchestrator.start(greek="γ", translation="T")
+        for future in pending.futures.values():
+            future.result(timeout=5)
+        again = orchestrator.gather(pending)
+        assert again["late"] == []
+        assert again["summary"] == "- fast saw T\n- slow done"
+    assert calls.count(("slow", "T")) == 1
+    assert calls.count(("fast", "T")) == 1
+
+
+def test_failures_are_reported_unavailable_and_unfinished_work_is_not_awaited(mechanisms) -> None:
+    calls, release = mechanisms
+    with FeedbackOrchestrator(["broken", "slow"], client=None, model="m") as orchestrator:
+        report = orchestrator.gather(orchestrator.start(greek="γ", translation="T"), wait=False)
+        assert report["results"]["slow"]["reason"] == "still running"
+        assert report["late"] == ["slow"]
+        release.set()
+        failed = orchestrator.collect(greek="γ", translation="T")["results"]["broken"]
+        assert failed == unavailable("broken", "failed: no model")
+
+
+def test_score_runs_one_mechanism_over_candidates_and_shares_the_cache(mechanisms) -> None:
+    calls, _ = mechanisms
+    with FeedbackOrchestrator(["fast"], client=None, model="m") as orchestrator:
+        scored = orchestrator.score("fast", greek="γ", translations=["A", "B"])
+        assert {text: result["text"] for text, result in scored.items()} == {"A": "A", "B": "B"}
+        many = orchestrator.collect_many(greek="γ", translations={"C1": "A", "C2": "B", "C3": ""})
+        assert sorted(many) == ["C1", "C2"]
+    assert sorted(calls) == [("fast", "A"), ("fast", "B")]
+
+
+def test_entity_extraction_runs_once_per_paragraph(monkeypatch) -> None:
+    extractions: list[str] = []
+
+    def extract(*, client, model, greek):
+        extractions.append(greek)
+        return {"entities": ["Theseus"], "relations": [], "contrasts": []}
+
+    monkeypatch.setattr(feedback_module, "extract_entities_and_relations", extract)
+    with FeedbackOrchestrator(["entity_check"], client=None, model="m") as orchestrator:
+        orchestrator.collect_many(greek="γ", translations={"C1": "Theseus went.", "C2": "He went."})
+        orchestrator.collect(greek="γ", translation="Theseus came.")
+    assert extractions == ["γ"]
+
+
+def test_grade_level_heading_and_default_deadlines() -> None:
+    with FeedbackOrchestrator(["grade_level"], client=None, model="m", timeouts={"perplexity": 1}) as orchestrator:
+        assert orchestrator.heading == "automatic feedback"
+        assert orchestrator.timeouts == {"grade_level": 5.0}
+        report = orchestrator.collect(greek="γ", translation="The ship sailed home. The men were glad.")
+    assert report["available"] == ["grade_level"]
+    assert report["summary"]
+    perplexity = FeedbackOrchestrator(["perplexity"], client=None, model="m")
+    perplexity.close()
+    assert perplexity.heading == "perplexity feedback"
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import main
+from pipelines.memo import ParagraphMemo, prompt_template_digest
+
+
+def run_sequential(call_json_fn, memo, **options):
+    return main.run_pipeline(
+        client=None,
+        model="test-model",
+        greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:2],
+        iterations=1,
+        verbose=False,
+        color_mode="never",
+        user_preference="",
+        sequential_feedback_model=None,
+        pipeline="sequential",
+        call_json_fn=call_json_fn,
+        paragraph_memo=memo,
+        **options,
+    )
+
+
+def test_memo_key_covers_the_prompt_sources() -> None:
+    memo = ParagraphMemo()
+    key = memo.key(
+        greek="εἴη",
+        reference_translations={},
+        user_preference="",
+        pipeline="debate",
+        model="m",
+        iterations=1,
+        settings={},
+    )
+    assert len(prompt_template_digest()) == 64
+    assert key != memo.key(
+        greek="εἴη",
+        reference_translations={},
+        user_preference="",
+        pipeline="debate",
+        model="m",
+        iterations=2,
+        settings={},
+    )
+
+
+def test_unchanged_paragraphs_are_reused_without_calls(stub_caller, tmp_path) -> None:
+    memo = ParagraphMemo(tmp_path)
+    first = run_sequential(stub_caller(), memo)
+    assert first["reused_paragraphs"] == []
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+    caller = stub_caller()
+    second = run_sequential(caller, memo)
+    assert second["reused_paragraphs"] == [1, 2]
+    assert caller.calls == []
+    assert second["final_translation"] == first["final_translation"]
+
+
+def test_feedback_budget_and_timeouts_are_part_of_the_key(stub_caller, tmp_path) -> None:
+    memo = ParagraphMemo(tmp_path)
+    run_sequential(stub_caller(), memo, feedback=["grade_level"], feedback_budget=1200)
+
+    assert run_sequential(stub_caller(), memo, feedback=["grade_level"], feedback_budget=300)["reused_paragraphs"] == []
+    assert run_sequential(stub_caller(), memo, feedback=["grade_level"], feedback_budget=300)["reused_paragraphs"] == [1, 2]
+    changed_timeout = run_sequential(
+        stub_caller(), memo, feedback=["grade_level"], feedback_budget=300, feedback_timeouts={"grade_level": 1.0}
+    )
+    assert changed_timeout["reused_paragraphs"] == []
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import re
+
+from pipelines.ranking import RankingContext, RankingEngine, rank_iterations
+
+CONTEXT = RankingContext(
+    greek="εἴη μὲν οὖν ἡμῖν",
+    paragraph_index=1,
+    reference_translations={},
+    user_preference="",
+    goals_guidance="Be faithful.",
+)
+
+
+def judge_by_quality(system: str, user: str, temperature: float) -> dict:
+    """Ranks candidates by the number after 'quality' in their text, best first."""
+    listing = user.split("Candidates:", 1)[1]
+    candidates = re.findall(r"^C(\d+):\n(.*)$", listing, flags=re.MULTILINE)
+    ranked = sorted(candidates, key=lambda item: -int(re.search(r"quality (\d+)", item[1]).group(1)))
+    return {
+        "ranking": [f"C{number}" for number, _text in ranked],
+        "rationale": "higher quality",
+        "best_candidate_feedback": {"scores": {"faithfulness": 9}},
+    }
+
+
+def texts(*qualities: int) -> list[str]:
+    return [f"draft quality {quality}" for quality in qualities]
+
+
+def test_small_sets_are_ranked_in_one_listwise_call() -> None:
+    engine = RankingEngine(judge_by_quality, CONTEXT)
+    result = engine.rank(texts(3, 9, 5))
+
+    assert result["method"] == "listwise"
+    assert result["order"] == [1, 2, 0]
+    assert result["calls"] == 1
+    assert result["feedback"] == {"scores": {"faithfulness": 9}}
+
+
+def test_orders_implied_by_earlier_rankings_cost_no_call() -> None:
+    engine = RankingEngine(judge_by_quality, CONTEXT)
+    engine.rank(texts(3, 9, 5))
+    again = engine.rank(texts(5, 3))
+
+    assert again["method"] == "cached"
+    assert again["calls"] == 0
+    assert again["order"] == [0, 1]
+    assert engine.stats() == {"calls": 1, "cached_comparisons": 1}
+    # Only the overall winner has a verdict to reuse.
+    assert again["feedback"] == {}
+    best = engine.rank(texts(9, 3))
+    assert best["method"] == "cached"
+    assert best["feedback"] == {"scores": {"faithfulness": 9}}
+    assert best["rationale"] == "higher quality"
+
+
+def test_large_sets_run_a_tournament_of_pods() -> None:
+    engine = RankingEngine(judge_by_quality, CONTEXT, listwise_max=3)
+    qualities = [4, 8, 1, 7, 2, 9, 6]
+    result = engine.rank(texts(*qualities))
+
+    assert result["method"] == "tournament"
+    assert qualities[result["winner"]] == 9
+    assert sorted(result["order"]) == list(range(len(qualities)))
+    assert result["calls"] < len(qualities) - 1
+
+
+def test_rank_iterations_reports_the_winning_iteration() -> None:
+    engine = RankingEngine(judge_by_quality, CONTEXT)
+    logs = [{"iteration": it, "translation": text} for it, text in enumerate(texts(2, 7, 7, 1), start=1)]
+    result = rank_iterations(engine, logs)
+
+    assert result["selected_iteration"] == 2
+    assert result["order"][:2] == [1, 2]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import main
+from pipelines.report_stream import ReportSink
+
+
+def paragraph(number: int, text: str, chunk: tuple[int, int] | None = None) -> dict:
+    entry = {"paragraph_index": number, "final_synthesis": {"final_translation": text}}
+    if chunk:
+        entry["chunk"] = {"number": chunk[0], "count": chunk[1]}
+    return entry
+
+
+def open_sink(path: Path, numbers: list[int], echoed: list[str], **options) -> ReportSink:
+    return ReportSink(
+        path,
+        "# Report\n",
+        numbers,
+        lambda part: f"- {part['final_synthesis']['final_translation']}\n",
+        echo_fn=echoed.append,
+        **options,
+    )
+
+
+def test_out_of_order_paragraphs_wait_for_their_predecessors(tmp_path: Path) -> None:
+    path = tmp_path / "report.md"
+    echoed: list[str] = []
+    sink = open_sink(path, [1, 2, 3], echoed)
+
+    assert path.read_text() == "# Report\n"
+    sink.add(paragraph(3, "three"))
+    sink.add(paragraph(2, "two"))
+    assert path.read_text() == "# Report\n"
+    assert echoed == []
+
+    sink.add(paragraph(1, "one"))
+    assert path.read_text() == "# Report\n- one\n- two\n- three\n"
+    assert echoed == ["one\n", "two\n", "three\n"]
+
+
+def test_chunks_are_written_as_they_arrive_and_complete_on_the_last(tmp_path: Path) -> None:
+    path = tmp_path / "report.md"
+    echoed: list[str] = []
+    sink = open_sink(path, [1, 2], echoed)
+
+    sink.add(paragraph(2, "2a", (1, 1)))
+    sink.add(paragraph(1, "1a", (1, 2)))
+    assert path.read_text() == "# Report\n- 1a\n"
+    sink.add(paragraph(1, "1b", (2, 2)))
+    assert path.read_text() == "# Report\n- 1a\n- 1b\n- 2a\n"
+
+
+def test_each_released_section_is_on_disk_at_once(tmp_path: Path) -> None:
+    path = tmp_path / "report.md"
+    sink = open_sink(path, [1, 2], [])
+
+    sink.add(paragraph(1, "one"))
+    assert path.read_text() == "# Report\n- one\n"
+    sink.add(paragraph(2, "two"))
+    assert path.read_text() == "# Report\n- one\n- two\n"
+    sink.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["report.md"]
+
+
+def test_opt_in_interval_holds_sections_until_close(tmp_path: Path) -> None:
+    path = tmp_path / "report.md"
+    sink = open_sink(path, [1, 2], [], publish_interval=3600.0)
+
+    sink.add(paragraph(1, "one"))
+    assert path.read_text() == "# Report\n"
+
+    sink.close()
+    assert path.read_text() == "# Report\n- one\n"
+    sink.close()
+
+
+def test_finish_replaces_the_stream_with_the_full_report(tmp_path: Path) -> None:
+    path = tmp_path / "report.md"
+    sink = open_sink(path, [1], [])
+    sink.add(paragraph(1, "one"))
+
+    sink.finish("# Full report\n")
+    assert path.read_text() == "# Full report\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["report.md"]
+
+
+def test_parallel_run_streams_sections_in_paragraph_order(tmp_path: Path, stub_caller) -> None:
+    def respond(scope, user_prompt):
+        # Later paragraphs answer first, so they finish first.
+        time.sleep(0.02 * (3 - scope["paragraph"]))
+        return None
+
+    path = tmp_path / "report.md"
+    echoed: list[str] = []
+    sink = open_sink(path, [1, 2, 3], echoed)
+    finished: list[int] = []
+
+    def on_done(part: dict) -> None:
+        finished.append(part["paragraph_index"])
+        sink.add(part)
+
+    result = main.run_pipeline(
+        client=None,
+        model="test-model",
+        greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:3],
+        iterations=1,
+        verbose=False,
+        color_mode="never",
+        user_preference="",
+        sequential_feedback_model=None,
+        pipeline="sequential",
+        call_json_fn=stub_caller(respond),
+        paragraph_workers=3,
+        on_paragraph_done=on_done,
+    )
+    sink.close()
+
+    assert sorted(finished) == [1, 2, 3]
+    translations = [part["final_synthesis"]["final_translation"] for part in result["paragraphs"]]
+    assert [part["paragraph_index"] for part in result["paragraphs"]] == [1, 2, 3]
+    assert echoed == [f"{text.strip()}\n" for text in translations]
+    assert path.read_text() == "# Report\n" + "".join(f"- {text}\n" for text in translations)
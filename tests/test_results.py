@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import main
+from pipelines.results import ParagraphResult, ResultSpill, as_dict
+
+
+def finished_paragraph() -> dict:
+    return {
+        "paragraph_index": 2,
+        "greek": "ἄλφα.",
+        "final_synthesis": {"final_translation": " Alpha. "},
+        "final_agent_versions": {"faithful": "Alpha."},
+        "convergence": {"stopped": True},
+        "sequential_iterations": [{"iteration": 1, "raw": "x" * 1000}],
+        "reference_translations": {"perrin": "Alpha (P)"},
+    }
+
+
+def test_compact_spills_heavy_fields_and_reads_like_the_dict(tmp_path: Path) -> None:
+    spill = ResultSpill("run", tmp_path)
+    original = finished_paragraph()
+    result = spill.compact(dict(original))
+
+    assert isinstance(result, ParagraphResult)
+    assert spill.path == tmp_path / "run.jsonl"
+    assert result.spilled is not None
+    assert set(result.spilled.names) == {"sequential_iterations", "reference_translations"}
+    assert "sequential_iterations" not in result.summary
+    assert result.final_translation == "Alpha."
+    assert result["convergence"] == {"stopped": True}
+    assert result["sequential_iterations"] == original["sequential_iterations"]
+    assert "reference_translations" in result and "missing" not in result
+    assert set(result) == set(original) and len(result) == len(original)
+    assert result.get("missing") is None
+    assert as_dict(result) == original
+    assert spill.compact(result) is result
+
+
+def test_offsets_address_each_paragraph_in_one_spill_file(tmp_path: Path) -> None:
+    spill = ResultSpill("run", tmp_path)
+    first = spill.compact(finished_paragraph())
+    second_paragraph = finished_paragraph() | {"paragraph_index": 3, "agents": {"faithful": []}}
+    second = spill.compact(second_paragraph)
+
+    assert len(spill.path.read_text(encoding="utf-8").splitlines()) == 2
+    assert second.spilled.offset == first.spilled.offset + first.spilled.length
+    assert second["agents"] == {"faithful": []}
+    assert "agents" not in first
+
+
+def test_light_paragraph_is_not_spilled_and_writes_go_to_the_summary(tmp_path: Path) -> None:
+    spill = ResultSpill("run", tmp_path)
+    result = spill.compact({"paragraph_index": 1, "greek": "β."})
+
+    assert result.spilled is None
+    assert not spill.path.exists()
+    result["chunk"] = {"number": 1, "count": 1}
+    result["greek"] = "γ."
+    assert result.summary == {"chunk": {"number": 1, "count": 1}}
+    assert result.greek == "γ."
+    del result["chunk"]
+    assert as_dict(result) == {"paragraph_index": 1, "greek": "γ.", "final_synthesis": {}, "final_agent_versions": {}}
+
+
+def test_spilled_run_renders_the_same_report(tmp_path: Path, stub_caller) -> None:
+    def run(**options):
+        return main.run_pipeline(
+            client=None,
+            model="test-model",
+            greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:2],
+            iterations=2,
+            verbose=False,
+            color_mode="never",
+            user_preference="",
+            sequential_feedback_model=None,
+            pipeline="sequential",
+            call_json_fn=stub_caller(),
+            **options,
+        )
+
+    plain = run()
+    spilled = run(result_spill=ResultSpill("run", tmp_path))
+    spilled["created_at_utc"] = plain["created_at_utc"]
+
+    assert all(isinstance(paragraph, ParagraphResult) for paragraph in spilled["paragraphs"])
+    assert all("sequential_iterations" not in paragraph.summary for paragraph in spilled["paragraphs"])
+    assert [as_dict(paragraph) for paragraph in spilled["paragraphs"]] == plain["paragraphs"]
+    assert main.render_markdown_report(spilled) == main.render_markdown_report(plain)
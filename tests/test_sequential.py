@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import itertools
+import threading
+
+import main
+from pipelines.convergence import ConvergencePolicy
+
+DRAFTS = {
+    1: "So may the mythical element yield to reason and take the look of history.",
+    2: "Let legend, purified by reason, submit and wear the aspect of history.",
+    3: "May fable bow before argument and assume a historical face.",
+}
+
+
+def run_sequential(call_json_fn, **options):
+    return main.run_pipeline(
+        client=None,
+        model="test-model",
+        greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:1],
+        iterations=options.pop("iterations", 2),
+        verbose=False,
+        color_mode="never",
+        user_preference=options.pop("user_preference", ""),
+        sequential_feedback_model=None,
+        pipeline="sequential",
+        call_json_fn=call_json_fn,
+        **options,
+    )
+
+
+def test_each_iteration_translates_and_judges_then_selects_and_polishes(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_sequential(caller)["paragraphs"][0]
+
+    assert caller.stages() == ["translate", "judge", "translate", "judge", "select", "polish"]
+    assert len(paragraph["sequential_iterations"]) == 2
+
+def test_best_of_n_records_preranked_candidates(stub_caller) -> None:
+    drafts = iter(DRAFTS.values())
+
+    def respond(scope, user_prompt):
+        if scope.get("stage") == "translate":
+            return {"translation": next(drafts)}
+        return None
+
+    caller = stub_caller(respond)
+    paragraph = run_sequential(caller, iterations=1, candidates=3, judge_top_k=2)["paragraphs"][0]
+
+    assert caller.stages().count("translate") == 3
+    assert caller.stages().count("judge") == 2
+    candidates = paragraph["sequential_iterations"][0]["candidates"]
+    assert sorted(record["candidate"] for record in candidates) == [1, 2, 3]
+    assert all("local_score" in record for record in candidates)
+
+def test_kept_champion_does_not_count_as_a_stable_translation(stub_caller) -> None:
+    def respond(scope, user_prompt):
+        if scope.get("stage") == "translate":
+            return {"translation": DRAFTS[scope["iteration"]]}
+        if "Candidates:" in user_prompt:
+            # The running champion is always C1; the judge keeps it.
+            return {"ranking": ["C1", "C2"]}
+        return None
+
+    paragraph = run_sequential(
+        stub_caller(respond),
+        iterations=3,
+        selection="ranking",
+        convergence=ConvergencePolicy(edit_threshold=0.2),
+    )["paragraphs"][0]
+
+    logs = paragraph["sequential_iterations"]
+    assert [log["ranking"]["kept_previous_best"] for log in logs] == [False, True, True]
+    assert paragraph["convergence"]["stop_reason"] == ""
+    assert paragraph["final_synthesis"]["selected_iteration"] == 1
+
+def test_tournament_ranking_issues_no_judge_calls(stub_caller) -> None:
+    drafts = itertools.count(1)
+    lock = threading.Lock()
+
+    def respond(scope, user_prompt):
+        if scope.get("stage") == "translate":
+            with lock:
+                number = next(drafts)
+            return {"translation": f"Draft {number}: the fable yields to reason."}
+        return None
+
+    caller = stub_caller(respond)
+    paragraph = run_sequential(
+        caller, iterations=3, candidates=8, judge_top_k=8, selection="ranking"
+    )["paragraphs"][0]
+
+    logs = paragraph["sequential_iterations"]
+    assert all(log["ranking"]["method"] == "tournament" for log in logs)
+    assert all(log["judgment_step"].get("scores") for log in logs)
+    assert caller.stages().count("judge") == 0
+
+def test_blocking_feedback_reaches_the_judge_prompt(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_sequential(caller, iterations=1, feedback=["grade_level"])["paragraphs"][0]
+
+    judge = next(call for call in caller.calls if call["scope"].get("stage") == "judge")
+    summary = paragraph["sequential_iterations"][0]["translation_step"]["external_feedback_summary"]
+    assert summary
+    assert summary in judge["user"]
+
+def test_async_feedback_keeps_scoring_off_the_judge_call(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_sequential(caller, feedback=["grade_level"], feedback_mode="async")["paragraphs"][0]
+
+    # Iteration 1's scores arrive after its judge call and feed iteration 2's translation.
+    summary = paragraph["sequential_iterations"][0]["translation_step"]["external_feedback_summary"]
+    judges = [call for call in caller.calls if call["scope"].get("stage") == "judge"]
+    translates = [call for call in caller.calls if call["scope"].get("stage") == "translate"]
+    assert summary not in judges[0]["user"]
+    assert summary in translates[1]["user"]
+    assert "feedback_timing" in paragraph
+
+def test_ranking_records_unfolded_async_feedback_as_late(stub_caller) -> None:
+    caller = stub_caller()
+    paragraph = run_sequential(
+        caller, feedback=["grade_level"], feedback_mode="async", selection="ranking"
+    )["paragraphs"][0]
+
+    # Iteration 2's scores reach no prompt, but are still recorded on its log.
+    last_step = paragraph["sequential_iterations"][-1]["translation_step"]
+    assert "external_feedback" in last_step
+    arrivals = paragraph["feedback_timing"]["arrivals"]
+    assert arrivals[-1] == {"iteration": 2, "used_in": {"grade_level": None}}
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import main
+from pipelines.sources import ParagraphFile, ReplacedParagraph
+
+
+def test_text_file_paragraphs_are_split_on_blank_lines(tmp_path: Path) -> None:
+    path = tmp_path / "work.txt"
+    path.write_text("\n\nπρῶτον μέν\nἔτι\n\n\n   \nδεύτερον δέ\n\nτρίτον", encoding="utf-8")
+
+    paragraphs = ParagraphFile(path)
+
+    assert len(paragraphs) == 3
+    assert paragraphs[0] == "πρῶτον μέν\nἔτι"
+    assert paragraphs[-1] == "τρίτον"
+    assert paragraphs[1:] == ["δεύτερον δέ", "τρίτον"]
+    with pytest.raises(IndexError):
+        paragraphs[3]
+
+
+def test_jsonl_rows_and_columns_share_one_index(tmp_path: Path) -> None:
+    path = tmp_path / "refs.jsonl"
+    rows = [
+        {"greek": "ἄλφα", "dryden_clough": "Alpha (D)", "perrin": "Alpha (P)"},
+        "βῆτα",
+        {"greek": "γάμμα", "perrin": "Gamma (P)"},
+    ]
+    path.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in rows) + "\n\n", encoding="utf-8")
+
+    greek = ParagraphFile(path)
+    dryden = greek.column("dryden_clough")
+
+    assert list(greek) == ["ἄλφα", "βῆτα", "γάμμα"]
+    assert list(dryden) == ["Alpha (D)", "βῆτα", ""]
+    assert greek.column("perrin")[2] == "Gamma (P)"
+    assert dryden._starts is greek._starts
+
+
+def test_replaced_paragraph_overrides_one_entry_without_copying() -> None:
+    source = ["one", "two", "three"]
+    replaced = ReplacedParagraph(source, 2, "chunk")
+
+    assert len(replaced) == 3
+    assert list(replaced) == ["one", "chunk", "three"]
+    assert replaced[-2] == "chunk"
+    assert replaced[1:] == ["chunk", "three"]
+    assert source == ["one", "two", "three"]
+
+
+def test_pipeline_reads_only_the_selected_paragraph_files(tmp_path: Path, stub_caller) -> None:
+    greek_path = tmp_path / "work.txt"
+    greek_path.write_text("\n\n".join(main.DEFAULT_GREEK_PARAGRAPHS[:3]), encoding="utf-8")
+    greek = ParagraphFile(greek_path)
+    read: list[int] = []
+
+    class CountingFile(ParagraphFile):
+        def __getitem__(self, at):
+            if isinstance(at, int):
+                read.append(at)
+            return super().__getitem__(at)
+
+    counting = CountingFile(greek_path, _index=(greek._starts, greek._ends))
+    caller = stub_caller()
+    result = main.run_pipeline(
+        client=None,
+        model="test-model",
+        greek_paragraphs=counting,
+        iterations=1,
+        verbose=False,
+        color_mode="never",
+        user_preference="",
+        sequential_feedback_model=None,
+        pipeline="sequential",
+        call_json_fn=caller,
+        paragraph_numbers=[2],
+    )
+
+    assert [paragraph["paragraph_index"] for paragraph in result["paragraphs"]] == [2]
+    assert set(read) == {1}
+    assert any(main.DEFAULT_GREEK_PARAGRAPHS[1] in call["user"] for call in caller.calls)
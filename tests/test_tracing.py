@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import main
+from pipelines.checkpoint import submit_in_context
+from pipelines.tracing import Span, Tracer, critical_path, peak_concurrency, span
+
+
+def make_span(span_id: int, start: int, end: int, cat: str = "stage", parent: int | None = None) -> Span:
+    return Span(span_id, parent, f"s{span_id}", cat, start, end, 1, "main", {})
+
+
+def test_spans_nest_across_pool_threads_and_stop_after_close(tmp_path: Path) -> None:
+    def work(n: int) -> None:
+        with span(f"task {n}", "stage"):
+            pass
+
+    tracer = Tracer("run", tmp_path).start()
+    try:
+        with span("outer", "paragraph"):
+            with ThreadPoolExecutor(2) as pool:
+                for future in [submit_in_context(pool, work, n) for n in range(2)]:
+                    future.result()
+    finally:
+        tracer.close()
+    with span("after close"):
+        pass
+
+    by_name = {item.name: item for item in tracer.spans}
+    assert set(by_name) == {"outer", "task 0", "task 1"}
+    assert by_name["outer"].parent_id is None
+    assert by_name["task 0"].parent_id == by_name["task 1"].parent_id == by_name["outer"].span_id
+    assert by_name["task 0"].thread != by_name["outer"].thread
+
+
+def test_failed_span_records_the_error_type(tmp_path: Path) -> None:
+    tracer = Tracer("run", tmp_path).start()
+    try:
+        try:
+            with span("failing"):
+                raise ValueError("bad")
+        except ValueError:
+            pass
+    finally:
+        tracer.close()
+    assert tracer.spans[0].args == {"error": "ValueError"}
+
+
+def test_critical_path_walks_back_from_the_last_leaf() -> None:
+    spans = [
+        make_span(1, 0, 100, cat="paragraph"),
+        make_span(2, 0, 30),
+        make_span(3, 0, 10),
+        make_span(4, 35, 60),
+        make_span(5, 40, 50, cat="http", parent=4),
+        make_span(6, 60, 90, cat="wait"),
+        make_span(7, 70, 95),
+    ]
+    assert [item.span_id for item in critical_path(spans)] == [2, 5, 7]
+    assert peak_concurrency(spans, "stage") == 2
+    assert peak_concurrency(spans, "retry") == 0
+
+
+def test_traced_run_writes_stage_spans_under_paragraph_spans(tmp_path: Path, stub_caller) -> None:
+    caller = stub_caller()
+    tracer = Tracer("run", tmp_path).start()
+    try:
+        main.run_pipeline(
+            client=None,
+            model="test-model",
+            greek_paragraphs=main.DEFAULT_GREEK_PARAGRAPHS[:2],
+            iterations=1,
+            verbose=False,
+            color_mode="never",
+            user_preference="",
+            sequential_feedback_model=None,
+            pipeline="sequential",
+            call_json_fn=tracer.wrap(caller),
+            paragraph_workers=2,
+        )
+    finally:
+        tracer.close()
+    tracer.write()
+
+    spans = tracer.spans
+    paragraphs = {item.span_id: item.args["paragraph"] for item in spans if item.cat == "paragraph"}
+    stages = [item for item in spans if item.cat == "stage"]
+    assert sorted(paragraphs.values()) == [1, 2]
+    assert len(stages) == len(caller.calls)
+    assert all(paragraphs[item.parent_id] == item.args["paragraph"] for item in stages)
+
+    trace = json.loads(tracer.trace_path.read_text(encoding="utf-8"))
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(complete) == len(spans)
+    assert min(event["ts"] for event in complete) == 0
+    assert "<html" in tracer.html_path.read_text(encoding="utf-8").lower()
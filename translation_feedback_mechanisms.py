@@ -12,6 +12,8 @@ from urllib.request import Request, urlopen
 
 from openai import OpenAI
 
+from pipelines.tracing import span
+
 
 _LLAMACPP_INFO_CACHE: dict[str, dict[str, Any]] = {}
 LOCAL_MODEL_ALIAS = "local_model"
@@ -105,7 +107,7 @@ def _is_local_llamacpp_model(model: str) -> bool:
 def _http_get_json(base_url: str, path: str, timeout: int) -> dict[str, Any]:
     url = f"{base_url.rstrip('/')}{path}"
     req = Request(url, method="GET")
-    with urlopen(req, timeout=timeout) as resp:
+    with span(f"llama.cpp GET {path}", "http"), urlopen(req, timeout=timeout) as resp:
         return json.loads(resp.read().decode("utf-8"))
 
 
@@ -120,10 +122,10 @@ def _http_post_json(
     body = json.dumps(payload).encode("utf-8")
     headers = {"Content-Type": "application/json"}
     last_error: Exception | None = None
-    for _ in range(max(1, retries)):
+    for attempt in range(1, max(1, retries) + 1):
         try:
             req = Request(url, data=body, headers=headers, method="POST")
-            with urlopen(req, timeout=timeout) as resp:
+            with span(f"llama.cpp POST {path}", "http", attempt=attempt), urlopen(req, timeout=timeout) as resp:
                 return json.loads(resp.read().decode("utf-8"))
         except IncompleteRead as exc:
             last_error = exc
@@ -949,7 +951,7 @@ if __name__ == "__main__":
     if not api_key:
         sys.exit("Missing OPENROUTER_API_KEY")
 
-    client = OpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1")
+    client = OpenAI(api_key=api_key, base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"))
     MODEL = "x-ai/grok-4.1-fast"
 
     GREEK_P3 = (